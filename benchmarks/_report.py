@@ -0,0 +1,63 @@
+import json
+import platform
+import sys
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Any
+
+
+def print_table(headers: Sequence[str], rows: Sequence[Sequence[object]]) -> None:
+    """
+    Prints a Markdown table, so the output can be pasted into documents as is. The
+    first column is left-aligned, all others are right-aligned.
+    """
+    cells = [[str(cell) for cell in row] for row in rows]
+    widths = [
+        max([len(header), *(len(row[index]) for row in cells)])
+        for index, header in enumerate(headers)
+    ]
+
+    def _format(row: Sequence[str]) -> str:
+        formatted = [
+            cell.ljust(width) if index == 0 else cell.rjust(width)
+            for index, (cell, width) in enumerate(zip(row, widths, strict=True))
+        ]
+        return f"| {' | '.join(formatted)} |"
+
+    print(_format(headers))
+    separators = [
+        "-" * width if index == 0 else "-" * (width - 1) + ":"
+        for index, width in enumerate(widths)
+    ]
+    print(_format(separators))
+    for row in cells:
+        print(_format(row))
+
+
+def environment() -> dict[str, str]:
+    return {
+        "python": sys.version.split()[0],
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "system": platform.system(),
+    }
+
+
+def load_baseline(path: Path) -> dict[str, Any] | None:
+    if not path.is_file():
+        return None
+
+    with path.open() as f:
+        return json.load(f)  # type: ignore[no-any-return]
+
+
+def save_baseline(path: Path, results: dict[str, Any]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w") as f:
+        json.dump(
+            {"environment": environment(), "results": results},
+            f,
+            indent=2,
+            sort_keys=True,
+        )
+        f.write("\n")
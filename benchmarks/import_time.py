@@ -0,0 +1,99 @@
+"""
+Measures the time it takes to import bs_config using ``python -X importtime`` and
+fails if it exceeds a budget.
+
+Usage::
+
+    python benchmarks/import_time.py [--budget-us 2000] [--runs 20]
+
+The reported time is the cumulative import time of ``bs_config`` and everything it
+imports that wasn't already imported by the interpreter. The interpreter runs without
+``site``, so ``.pth`` files of the environment can't import modules (like ``typing``)
+up front and hide their cost. The minimum over several runs is used, since it is the
+least affected by noise.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+
+def _measure(statement: str) -> tuple[int, dict[str, int]]:
+    # Bytecode must be cached (like in any real deployment), otherwise compiling the
+    # source dominates the measurement
+    env = {k: v for k, v in os.environ.items() if k != "PYTHONDONTWRITEBYTECODE"}
+    env["PYTHONPATH"] = os.pathsep.join(sys.path)
+    result = subprocess.run(
+        [sys.executable, "-S", "-X", "importtime", "-c", statement],
+        check=True,
+        capture_output=True,
+        env=env,
+        text=True,
+    )
+
+    lines: list[tuple[int, int, int, str]] = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+
+        self_part, cumulative_part, name = line.removeprefix("import time:").split("|")
+        depth = len(name) - len(name.lstrip())
+        lines.append((depth, int(self_part), int(cumulative_part), name.strip()))
+
+    # Modules are reported after everything they imported, with deeper indentation
+    for index in range(len(lines) - 1, -1, -1):
+        depth, self_us, cumulative_us, module = lines[index]
+        if depth == 1 and module == "bs_config":
+            break
+    else:
+        raise RuntimeError("bs_config was not imported")
+
+    self_times = {module: self_us}
+    for depth, self_us, _, module in reversed(lines[:index]):
+        if depth == 1:
+            break
+
+        self_times[module] = self_us
+
+    return cumulative_us, self_times
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--budget-us", type=int, default=2000)
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument(
+        "--statement",
+        default="import bs_config",
+        help="the code to measure",
+    )
+    args = parser.parse_args()
+
+    # Warm-up, which also writes the bytecode cache
+    _measure(args.statement)
+
+    best: int | None = None
+    best_self_times: dict[str, int] = {}
+    for _ in range(args.runs):
+        total, self_times = _measure(args.statement)
+        if best is None or total < best:
+            best = total
+            best_self_times = self_times
+
+    assert best is not None
+    print(f"import bs_config: {best} us (budget {args.budget_us} us)")
+    print("slowest modules imported by bs_config (self time):")
+    slowest = sorted(best_self_times.items(), key=lambda item: item[1], reverse=True)
+    for module, self_us in slowest[:10]:
+        print(f"  {self_us:>8} us  {module}")
+
+    if best > args.budget_us:
+        print("Import time budget exceeded", file=sys.stderr)
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
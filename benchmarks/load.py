@@ -0,0 +1,289 @@
+"""
+Measures how ``Env.load`` scales with the size of its sources.
+
+Usage::
+
+    python benchmarks/load.py [--runs 5] [--filter REGEX] [--fixtures DIR]
+
+Synthetic fixtures are generated for each workload:
+
+- env-10k: 10,000 environment variables
+- toml-50: 50 TOML files with nesting depths from 1 to 5
+- toml-large: a single TOML file of several megabytes
+- dotenv-20: 20 dotenv files
+
+Each workload is loaded in different modes and reported as:
+
+- load ms: the median wall-clock time of ``Env.load``
+- peak MiB: the peak of memory allocated during ``Env.load`` (tracemalloc)
+- retained MiB: the memory still allocated by the loaded Env afterwards
+- first lookup us: the median time of the first lookup after loading, for a key that
+  is only present in the source with the lowest precedence
+
+The output is a Markdown table.
+"""
+
+import argparse
+import os
+import re
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import partial
+from pathlib import Path
+from typing import Any
+
+from _report import print_table
+
+from bs_config import Env, ParseCache
+
+
+@dataclass(frozen=True)
+class Workload:
+    name: str
+    mode: str
+    load: Callable[[], Env]
+    first_key: str
+
+
+def _write_toml(path: Path, depth: int, keys_per_table: int, tag: str) -> None:
+    lines: list[str] = []
+
+    def _table(prefix: str, level: int) -> None:
+        if prefix:
+            lines.append(f"[{prefix}]")
+
+        for index in range(keys_per_table):
+            lines.append(f'key-{index} = "{tag}-{prefix}-{index}"')
+            lines.append(f"int-{index} = {index}")
+
+        lines.append(f"list = [{', '.join(str(i) for i in range(10))}]")
+        if level < depth:
+            for index in range(3):
+                name = f"section-{index}"
+                _table(f"{prefix}.{name}" if prefix else name, level + 1)
+
+    _table("", 1)
+    path.write_text("\n".join(lines) + "\n")
+
+
+def _generate(root: Path) -> dict[str, list[Path]]:
+    fixtures: dict[str, list[Path]] = {}
+
+    tomls = root / "toml-50"
+    tomls.mkdir(exist_ok=True)
+    fixtures["toml-50"] = []
+    for index in range(50):
+        path = tomls / f"{index}.toml"
+        _write_toml(path, depth=1 + index % 5, keys_per_table=10, tag=f"file-{index}")
+        fixtures["toml-50"].append(path)
+
+    # Only the file with the lowest precedence contains this key
+    first = fixtures["toml-50"][0]
+    first.write_text(f'only-in-first = "value"\n{first.read_text()}')
+
+    large = root / "large.toml"
+    _write_toml(large, depth=6, keys_per_table=100, tag="large")
+    fixtures["toml-large"] = [large]
+
+    dotenvs = root / "dotenv-20"
+    dotenvs.mkdir(exist_ok=True)
+    fixtures["dotenv-20"] = []
+    for index in range(20):
+        path = dotenvs / f"{index}.env"
+        path.write_text(
+            "\n".join(
+                f'FILE_{index}_KEY_{key}="value {index} {key}"' for key in range(500)
+            )
+            + "\n"
+        )
+        fixtures["dotenv-20"].append(path)
+
+    return fixtures
+
+
+@contextmanager
+def _environ(count: int) -> Iterator[None]:
+    names = [f"BENCH_LOAD_VARIABLE_{index}" for index in range(count)]
+    os.environ.update({name: f"value-{index}" for index, name in enumerate(names)})
+    os.environ["APP_FIRST"] = "value"
+    try:
+        yield
+    finally:
+        for name in names:
+            del os.environ[name]
+        del os.environ["APP_FIRST"]
+
+
+def _workloads(fixtures: dict[str, list[Path]], cache_dir: Path) -> list[Workload]:
+    workloads: list[Workload] = []
+    # The first lookup is for a key in the source with the lowest precedence
+    workloads.append(Workload("env-10k", "snapshot", Env.load, "bench-load-variable-0"))
+    workloads.append(
+        Workload(
+            "env-10k",
+            "live",
+            partial(Env.load, env_mode="live"),
+            "bench-load-variable-0",
+        )
+    )
+    workloads.append(
+        Workload("env-10k", "prefix", partial(Env.load, env_prefix="APP_"), "first")
+    )
+    workloads.append(
+        Workload(
+            "env-10k",
+            "compiled",
+            partial(Env.load, compiled=True),
+            "bench-load-variable-0",
+        )
+    )
+
+    parse_cache = ParseCache(cache_dir)
+    for name, first_key in (("toml-50", "only-in-first"), ("toml-large", "key-0")):
+        tomls = fixtures[name]
+        modes: dict[str, dict[str, Any]] = {
+            "default": {},
+            "compiled": {"compiled": True},
+            "lazy": {"lazy": True},
+            "parse-cache": {"parse_cache": parse_cache},
+        }
+        for mode, kwargs in modes.items():
+            workloads.append(
+                Workload(
+                    name,
+                    mode,
+                    partial(
+                        Env.load,
+                        include_env=False,
+                        toml_configs=tomls,
+                        **kwargs,
+                    ),
+                    first_key,
+                )
+            )
+
+        artifact = tomls[0].with_name(f"{name}.bin")
+        Env.load(include_env=False, toml_configs=tomls).save_artifact(artifact)
+        workloads.append(
+            Workload(
+                name,
+                "artifact",
+                partial(Env.load, include_env=False, artifact=artifact),
+                first_key,
+            )
+        )
+
+    # additional_dotenvs takes the path without the .env suffix
+    dotenvs = [str(path.with_suffix("")) for path in fixtures["dotenv-20"]]
+    modes = {
+        "default": {},
+        "compiled": {"compiled": True},
+        "parse-cache": {"parse_cache": parse_cache},
+    }
+    for mode, kwargs in modes.items():
+        workloads.append(
+            Workload(
+                "dotenv-20",
+                mode,
+                partial(
+                    Env.load,
+                    include_env=False,
+                    additional_dotenvs=dotenvs,
+                    **kwargs,
+                ),
+                "file-0-key-0",
+            )
+        )
+
+    return workloads
+
+
+def _measure(workload: Workload, runs: int) -> list[object]:
+    # Warm-up, which also fills the parse cache
+    workload.load().get_string(workload.first_key)
+
+    load_times: list[float] = []
+    lookup_times: list[float] = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        env = workload.load()
+        loaded = time.perf_counter()
+        value = env.get_string(workload.first_key)
+        looked_up = time.perf_counter()
+        if value is None:
+            raise RuntimeError(f"{workload.first_key} not found in {workload.name}")
+
+        load_times.append(loaded - start)
+        lookup_times.append(looked_up - loaded)
+        del env
+
+    tracemalloc.start()
+    try:
+        env = workload.load()
+        retained, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del env
+
+    mib = 1024 * 1024
+    return [
+        workload.name,
+        workload.mode,
+        f"{statistics.median(load_times) * 1e3:.2f}",
+        f"{peak / mib:.2f}",
+        f"{retained / mib:.2f}",
+        f"{statistics.median(lookup_times) * 1e6:.1f}",
+    ]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--filter", help="only run workloads matching this regex")
+    parser.add_argument(
+        "--fixtures",
+        type=Path,
+        help="directory for the generated fixtures (a temporary directory if omitted)",
+    )
+    args = parser.parse_args()
+    pattern = re.compile(args.filter) if args.filter else None
+
+    with tempfile.TemporaryDirectory() as directory:
+        root: Path = args.fixtures or Path(directory)
+        root.mkdir(parents=True, exist_ok=True)
+        fixtures = _generate(root)
+        large_size = fixtures["toml-large"][0].stat().st_size
+        print(f"toml-large: {large_size / 1024 / 1024:.1f} MiB\n")
+
+        rows: list[list[object]] = []
+        with _environ(10_000):
+            for workload in _workloads(fixtures, Path(directory) / "cache"):
+                if pattern is not None and not pattern.search(
+                    f"{workload.name}/{workload.mode}"
+                ):
+                    continue
+
+                rows.append(_measure(workload, args.runs))
+
+    print_table(
+        [
+            "workload",
+            "mode",
+            "load ms",
+            "peak MiB",
+            "retained MiB",
+            "first lookup us",
+        ],
+        rows,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
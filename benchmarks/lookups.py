@@ -0,0 +1,509 @@
+"""
+Microbenchmarks for the lookup hot paths of all getters.
+
+Usage::
+
+    python benchmarks/lookups.py [--filter REGEX] [--save] [--check [--base REF]]
+
+Each benchmark is reported as:
+
+- ns/op: the minimum time per call over several repeats, minus the overhead of
+  calling an empty function
+- allocs/op: memory blocks that are still allocated after a call (e.g. the returned
+  value), measured with ``sys.getallocatedblocks()``
+- peak B/op: the peak of memory allocated during a single call (including temporary
+  objects that were already freed), measured with ``tracemalloc``
+
+Timings are only comparable on the same machine, so baselines are never committed.
+Results are compared with the local JSON baseline in ``baselines/lookups.json``, use
+``--save`` to replace it. ``--check`` also measures the merge base of ``HEAD`` and
+``--base`` (in a temporary git worktree, using its version of this script), taking
+turns with the current version, compares with that instead and fails on regressions.
+"""
+
+import argparse
+import gc
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import timeit
+import tracemalloc
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from datetime import UTC, date, datetime, time
+from functools import partial
+from pathlib import Path
+from typing import Any
+
+from _report import load_baseline, print_table, save_baseline
+
+from bs_config import Env, Resolution
+from bs_config._implementation.default import DefaultEnv
+from bs_config._implementation.scoped import ScopedEnv
+from bs_config._implementation.toml import TomlEnv
+
+BASELINE = Path(__file__).with_name("baselines") / "lookups.json"
+
+LARGE_LIST_SIZE = 1000
+
+type Benchmark = Callable[[], object]
+
+ACCESSORS: dict[str, Callable[[Env, str], object]] = {
+    "get_string": lambda env, key: env.get_string(key),
+    "get_bool": lambda env, key: env.get_bool(key, default=False),
+    "get_int": lambda env, key: env.get_int(key),
+    "get_string_list": lambda env, key: env.get_string_list(key),
+    "get_int_list": lambda env, key: env.get_int_list(key),
+    "get_datetime": lambda env, key: env.get_datetime(key),
+    "get_date": lambda env, key: env.get_date(key),
+    "get_time": lambda env, key: env.get_time(key),
+    "get_duration": lambda env, key: env.get_duration(key),
+}
+
+ACCESSOR_KEYS = {
+    "get_string": "string",
+    "get_bool": "bool",
+    "get_int": "int",
+    "get_string_list": "string-list",
+    "get_int_list": "int-list",
+    "get_datetime": "datetime",
+    "get_date": "date",
+    "get_time": "time",
+    "get_duration": "duration",
+}
+
+
+def _toml_values() -> dict[str, Any]:
+    return {
+        "string": "value",
+        "bool": True,
+        "int": 123,
+        "string-list": ["a", "b", "c"],
+        "int-list": [1, 2, 3],
+        "datetime": datetime(2020, 1, 1, tzinfo=UTC),
+        "date": date(2020, 1, 1),
+        "time": time(12, 30),
+        "duration": {"seconds": 30},
+        "large-string-list": [f"item-{i}" for i in range(LARGE_LIST_SIZE)],
+        "large-int-list": list(range(LARGE_LIST_SIZE)),
+    }
+
+
+def _env_values(prefix: str = "") -> dict[str, str]:
+    return {
+        f"{prefix}STRING": "value",
+        f"{prefix}BOOL": "true",
+        f"{prefix}INT": "123",
+        f"{prefix}STRING_LIST": "a,b,c",
+        f"{prefix}INT_LIST": "1,2,3",
+        f"{prefix}DATETIME": "2020-01-01T00:00:00+00:00",
+        f"{prefix}DATE": "2020-01-01",
+        f"{prefix}TIME": "12:30:00",
+        f"{prefix}DURATION__SECONDS": "30",
+        f"{prefix}LARGE_STRING_LIST": ",".join(
+            f"item-{i}" for i in range(LARGE_LIST_SIZE)
+        ),
+        f"{prefix}LARGE_INT_LIST": ",".join(str(i) for i in range(LARGE_LIST_SIZE)),
+    }
+
+
+def _toml_document(values: dict[str, Any]) -> str:
+    lines: list[str] = []
+    tables: list[str] = []
+    for key, value in values.items():
+        if isinstance(value, dict):
+            tables.append(f"[{key}]")
+            tables.extend(f"{name} = {item!r}" for name, item in value.items())
+        elif isinstance(value, bool):
+            lines.append(f"{key} = {str(value).lower()}")
+        elif isinstance(value, str):
+            lines.append(f'{key} = "{value}"')
+        elif isinstance(value, datetime | date | time):
+            lines.append(f"{key} = {value.isoformat()}")
+        else:
+            lines.append(f"{key} = {value!r}".replace("'", '"'))
+
+    return "\n".join([*lines, *tables]) + "\n"
+
+
+@contextmanager
+def _load_chain(**kwargs: Any) -> Iterator[tuple[Env, Env]]:
+    """
+    Loads two Env chains from generated files, each consisting of three TOML configs,
+    two dotenv files and the (prefixed) environment. In the first chain, all values
+    are in the environment (top layer), in the second one, they are only in the first
+    TOML config (bottom layer).
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        root = Path(directory)
+        tomls = [root / f"{index}.toml" for index in range(3)]
+        tomls[0].write_text(_toml_document(_toml_values()))
+        for index, toml in enumerate(tomls[1:]):
+            toml.write_text(f'unrelated-{index} = "value"\n')
+
+        dotenvs = [str(root / name) for name in ("first", "second")]
+        for index, dotenv in enumerate(dotenvs):
+            Path(f"{dotenv}.env").write_text(f"BENCH_UNRELATED_{index}=value\n")
+
+        top_values = _env_values("BENCH_TOP_")
+        os.environ.update(top_values)
+        try:
+            top = Env.load(
+                toml_configs=tomls,
+                additional_dotenvs=dotenvs,
+                env_prefix="BENCH_TOP_",
+                **kwargs,
+            )
+            bottom = Env.load(
+                toml_configs=tomls,
+                additional_dotenvs=dotenvs,
+                env_prefix="BENCH_BOTTOM_",
+                **kwargs,
+            )
+        finally:
+            for name in top_values:
+                del os.environ[name]
+
+        yield top, bottom
+
+
+def _benchmarks() -> Iterator[tuple[str, Benchmark]]:
+    direnv = Env.load_from_dict(dict(_env_values()))
+    toml = TomlEnv(DefaultEnv(), _toml_values())
+    scoped = ScopedEnv(Env.load_from_dict(dict(_env_values("SCOPE__"))), "scope")
+    layer_scope = Env.load_from_dict(dict(_env_values("SCOPE__"))) / "scope"
+
+    with (
+        _load_chain() as (chain_top, chain_bottom),
+        _load_chain(compiled=True) as (compiled_top, compiled_bottom),
+        chain_top.share() as shared,
+    ):
+        cached_top = chain_top.cached()
+        instrumented_top = chain_top.instrumented()
+        instrumented_compiled = compiled_top.instrumented()
+        sampled_top = chain_top.observe(_empty_observer, sample_rate=0.01)
+        envs = {
+            "direnv": direnv,
+            "toml": toml,
+            "scoped-env": scoped,
+            "layer-scope": layer_scope,
+            "chain/top": chain_top,
+            "chain/bottom": chain_bottom,
+            "compiled/top": compiled_top,
+            "compiled/bottom": compiled_bottom,
+            "frozen/top": chain_top.freeze(),
+            "frozen/bottom": chain_bottom.freeze(),
+            "shared/top": Env.attach(shared.name),
+            "cached/top": cached_top,
+            "instrumented/top": instrumented_top,
+            "instrumented/compiled": instrumented_compiled,
+            "observed-1%/top": sampled_top,
+        }
+
+        for env_name, env in envs.items():
+            for accessor_name, accessor in ACCESSORS.items():
+                key = Env.key(ACCESSOR_KEYS[accessor_name])
+                yield (
+                    f"{env_name}/{accessor_name}",
+                    partial(accessor, env, key),
+                )
+
+        for env_name in (
+            "direnv",
+            "toml",
+            "chain/bottom",
+            "compiled/bottom",
+            "frozen/bottom",
+        ):
+            env = envs[env_name]
+            yield f"{env_name}/miss", partial(env.get_string, "missing")
+            yield (
+                f"{env_name}/get_string/str-key",
+                partial(env.get_string, "string"),
+            )
+            yield (
+                f"{env_name}/get_string_list/large",
+                partial(env.get_string_list, "large-string-list"),
+            )
+            yield (
+                f"{env_name}/get_int_list/large",
+                partial(env.get_int_list, "large-int-list"),
+            )
+
+        nested_values = {"A__B__C__STRING": "value"}
+        nested_envs = {
+            "direnv": Env.load_from_dict(dict(nested_values)),
+            "toml": TomlEnv(DefaultEnv(), {"a": {"b": {"c": {"string": "value"}}}}),
+        }
+        for env_name, env in nested_envs.items():
+            yield (
+                f"{env_name}/nested/dotted-key",
+                partial(env.get_string, "a.b.c.string"),
+            )
+            nested = env / "a" / "b" / "c"
+            yield (
+                f"{env_name}/nested/scope",
+                partial(nested.get_string, "string"),
+            )
+            yield (
+                f"{env_name}/nested/scope-creation",
+                partial(_get_in_scope, env, ("a", "b", "c"), "string"),
+            )
+
+
+def _get_in_scope(env: Env, scopes: tuple[str, ...], key: str) -> str | None:
+    for scope in scopes:
+        env = env / scope
+
+    return env.get_string(key)
+
+
+def _empty() -> None:
+    pass
+
+
+def _empty_observer(resolution: Resolution) -> None:
+    pass
+
+
+def _time(benchmark: Benchmark, min_time: float, repeat: int) -> float:
+    timer = timeit.Timer(benchmark)
+    number = 1
+    while timer.timeit(number) < min_time:
+        number *= 2
+
+    return min(timer.repeat(repeat, number)) / number
+
+
+def _allocations(benchmark: Benchmark, calls: int = 1000) -> float:
+    results: list[object] = [None] * calls
+    gc.disable()
+    try:
+        before = sys.getallocatedblocks()
+        for index in range(calls):
+            results[index] = benchmark()
+        after = sys.getallocatedblocks()
+    finally:
+        gc.enable()
+
+    return (after - before) / calls
+
+
+def _peak_bytes(benchmark: Benchmark) -> int:
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        current, _ = tracemalloc.get_traced_memory()
+        benchmark()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return peak - current
+
+
+def _measure(
+    pattern: re.Pattern[str] | None,
+    min_time: float,
+    repeat: int,
+) -> dict[str, dict[str, float]]:
+    overhead = _time(_empty, min_time, repeat)
+    results: dict[str, dict[str, float]] = {}
+    for name, benchmark in _benchmarks():
+        if pattern is not None and not pattern.search(name):
+            continue
+
+        # Warm up caches that are filled on first access
+        benchmark()
+        seconds = _time(benchmark, min_time, repeat)
+        results[name] = {
+            "ns_per_op": round(max(seconds - overhead, 0) * 1e9, 1),
+            "allocs_per_op": round(_allocations(benchmark), 2),
+            "peak_bytes_per_op": _peak_bytes(benchmark),
+        }
+
+    return results
+
+
+@contextmanager
+def _base_revision(
+    ref: str,
+    forwarded_args: list[str],
+) -> Iterator[Callable[[], dict[str, dict[str, float]]]]:
+    """
+    Checks out the merge base of ``HEAD`` and a git ref in a temporary worktree, and
+    provides a function that measures its benchmarks on this machine, by running its
+    version of this script with ``--save``.
+    """
+    root = Path(__file__).resolve().parent.parent
+
+    def _git(*command: str) -> str:
+        result = subprocess.run(
+            ["git", *command],
+            check=True,
+            capture_output=True,
+            cwd=root,
+            text=True,
+        )
+        return result.stdout.strip()
+
+    commit = _git("merge-base", "HEAD", ref)
+    print(f"Comparing with {commit[:12]}", file=sys.stderr)
+    with tempfile.TemporaryDirectory() as directory:
+        worktree = Path(directory) / "base"
+        baseline_path = worktree / BASELINE.relative_to(root)
+
+        def _measure_base() -> dict[str, dict[str, float]]:
+            # Older revisions may have committed a baseline from another machine
+            baseline_path.unlink(missing_ok=True)
+            subprocess.run(
+                [
+                    sys.executable,
+                    str(worktree / "benchmarks" / "lookups.py"),
+                    "--save",
+                    *forwarded_args,
+                ],
+                check=True,
+                cwd=worktree,
+                env={**os.environ, "PYTHONPATH": str(worktree / "src")},
+                stdout=subprocess.DEVNULL,
+            )
+            baseline = load_baseline(baseline_path)
+            return {} if baseline is None else baseline["results"]
+
+        _git("worktree", "add", "--detach", str(worktree), commit)
+        try:
+            yield _measure_base
+        finally:
+            _git("worktree", "remove", "--force", str(worktree))
+
+
+def _keep_fastest(
+    into: dict[str, dict[str, float]],
+    results: dict[str, dict[str, float]],
+) -> None:
+    for name, result in results.items():
+        best = into.get(name)
+        if best is None or result["ns_per_op"] < best["ns_per_op"]:
+            into[name] = result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--filter", help="only run benchmarks matching this regex")
+    parser.add_argument("--min-time", type=float, default=0.05)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--save",
+        action="store_true",
+        help="save as new local baseline",
+    )
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="measure the baseline at --base as well, fail if a benchmark got slower "
+        "or allocates more than it",
+    )
+    parser.add_argument(
+        "--base",
+        default="HEAD",
+        help="the git ref to measure the baseline at for --check, its merge base "
+        "with HEAD is used",
+    )
+    parser.add_argument(
+        "--rounds",
+        type=int,
+        default=3,
+        help="for --check, how often the baseline and the current version are "
+        "measured in turns, the fastest result of each is compared",
+    )
+    parser.add_argument(
+        "--max-regression",
+        type=float,
+        default=0.25,
+        help="the tolerated relative slowdown for --check",
+    )
+    args = parser.parse_args()
+    pattern = re.compile(args.filter) if args.filter else None
+
+    results: dict[str, dict[str, float]]
+    baseline_results: dict[str, dict[str, float]]
+    if args.check:
+        forwarded_args = [
+            "--min-time",
+            str(args.min_time),
+            "--repeat",
+            str(args.repeat),
+        ]
+        if args.filter:
+            forwarded_args.extend(["--filter", args.filter])
+
+        results = {}
+        baseline_results = {}
+        with _base_revision(args.base, forwarded_args) as measure_base:
+            # Measuring in turns spreads changes in the load of the machine over both
+            for _ in range(args.rounds):
+                _keep_fastest(baseline_results, measure_base())
+                _keep_fastest(results, _measure(pattern, args.min_time, args.repeat))
+    else:
+        results = _measure(pattern, args.min_time, args.repeat)
+        baseline = load_baseline(BASELINE)
+        baseline_results = {} if baseline is None else baseline["results"]
+
+    rows: list[list[object]] = []
+    regressions: list[str] = []
+    for name, result in results.items():
+        base = baseline_results.get(name)
+        ns = result["ns_per_op"]
+        change = ""
+        if base is not None and base["ns_per_op"] > 0:
+            ratio = ns / base["ns_per_op"] - 1
+            change = f"{ratio:+.0%}"
+            if ratio > args.max_regression or (
+                result["allocs_per_op"] > base["allocs_per_op"]
+            ):
+                regressions.append(name)
+
+        rows.append(
+            [
+                name,
+                f"{ns:.0f}",
+                "" if base is None else f"{base['ns_per_op']:.0f}",
+                change,
+                f"{result['allocs_per_op']:g}",
+                "" if base is None else f"{base['allocs_per_op']:g}",
+                result["peak_bytes_per_op"],
+            ]
+        )
+
+    print_table(
+        [
+            "benchmark",
+            "ns/op",
+            "base ns/op",
+            "change",
+            "allocs/op",
+            "base",
+            "peak B/op",
+        ],
+        rows,
+    )
+
+    if args.save:
+        local = load_baseline(BASELINE)
+        merged = {**({} if local is None else local["results"]), **results}
+        save_baseline(BASELINE, merged)
+        print(f"Saved baseline to {BASELINE}")
+
+    if regressions:
+        print(f"\n{len(regressions)} regressions:", ", ".join(regressions))
+        if args.check:
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
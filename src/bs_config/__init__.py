@@ -1,5 +1,58 @@
+from __future__ import annotations
+
 from .env import Env
 
+# See bs_config.env, typing is not imported at runtime
+TYPE_CHECKING = False
+
+if TYPE_CHECKING:
+    from typing import Any
+
+    from .key import ConfigKey
+    from .memory import MemoryUsage
+    from .parse_cache import ParseCache, ParseCacheInfo
+    from .resolution import Observer, Resolution
+    from .schema import SchemaResolver, compile_schema
+    from .spec import KeySpec
+
 __all__ = [
+    "ConfigKey",
     "Env",
+    "KeySpec",
+    "MemoryUsage",
+    "Observer",
+    "ParseCache",
+    "ParseCacheInfo",
+    "Resolution",
+    "SchemaResolver",
+    "compile_schema",
 ]
+
+# Everything but Env is imported on first access to keep "import bs_config" cheap
+_LAZY_EXPORTS = {
+    "ConfigKey": ".key",
+    "KeySpec": ".spec",
+    "MemoryUsage": ".memory",
+    "ParseCache": ".parse_cache",
+    "ParseCacheInfo": ".parse_cache",
+    "Observer": ".resolution",
+    "Resolution": ".resolution",
+    "SchemaResolver": ".schema",
+    "compile_schema": ".schema",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    from importlib import import_module
+
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,55 @@
+import mmap
+import os
+import tempfile
+import weakref
+from pathlib import Path
+
+from bs_config import Env
+
+from .snapshot import SnapshotEnv, encode_snapshot
+
+
+def write_artifact(env: Env, path: Path, *, include_env: bool) -> None:
+    data = encode_snapshot(env, include_env=include_env)
+    # Write to a temporary file first, so processes starting concurrently never map
+    # a partially written artifact
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    tmp_path = Path(tmp_name)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        tmp_path.replace(path)
+    except BaseException:
+        tmp_path.unlink()
+        raise
+
+
+def _unmap(mapped: mmap.mmap, view: memoryview) -> None:
+    # The file can only be unmapped once no views of it exist anymore
+    view.release()
+    mapped.close()
+
+
+class _Mapping:
+    """
+    Keeps an artifact mapped as long as an Env reads from it.
+    """
+
+    def __init__(self, path: Path) -> None:
+        with path.open("rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                raise ValueError(f"{path} is not a config artifact")
+
+            # The mapping stays valid after the file is closed
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        self.view = memoryview(mapped)
+        weakref.finalize(self, _unmap, mapped, self.view)
+
+
+def open_artifact(path: Path, fallback: Env) -> Env:
+    mapping = _Mapping(path)
+    try:
+        return SnapshotEnv.open(mapping.view, fallback, owner=mapping)
+    except ValueError as e:
+        raise ValueError(f"{path} is not a supported config artifact") from e
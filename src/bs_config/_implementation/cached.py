@@ -0,0 +1,289 @@
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from datetime import date, datetime, time, timedelta
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from bs_config import Env
+
+from .default import DefaultEnv
+
+if TYPE_CHECKING:
+    from bs_config.memory import MemoryUsage
+
+    from .memory import Sizer
+
+_MISSING = object()
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class CachedEnv(Env):
+    """
+    Memoizes the converted results of getter calls in a bounded LRU cache. The cache
+    is cleared whenever any layer of the wrapped Env changes.
+
+    Results are cached without the default, which is applied on each call like the
+    ``DefaultEnv`` at the end of every chain would. Calls that only differ in their
+    default share an entry, and defaults don't need to be hashable.
+    """
+
+    def __init__(self, source: Env, maxsize: int) -> None:
+        if maxsize < 1:
+            raise ValueError("maxsize must be positive")
+
+        self.__source = source
+        self.__defaults = DefaultEnv()
+        self.__maxsize = maxsize
+        self.__cache: OrderedDict[Hashable, Any] = OrderedDict()
+        self.__lock = threading.Lock()
+        self.__generation = 0
+        self.__hits = 0
+        self.__misses = 0
+        source._subscribe(self.cache_clear)
+
+    def cache_info(self) -> CacheInfo:
+        with self.__lock:
+            return CacheInfo(
+                hits=self.__hits,
+                misses=self.__misses,
+                maxsize=self.__maxsize,
+                currsize=len(self.__cache),
+            )
+
+    def cache_clear(self) -> None:
+        with self.__lock:
+            self.__cache.clear()
+            self.__generation += 1
+
+    def _unwrap(self) -> Env:
+        return self.__source._unwrap()
+
+    def _subscribe(self, callback: Callable[[], None]) -> None:
+        self.__source._subscribe(callback)
+
+    def _source_name(self, key: str) -> str | None:
+        return self.__source._source_name(key)
+
+    def _memory_usage(self, sizer: "Sizer") -> list["MemoryUsage"]:
+        from bs_config.memory import MemoryUsage
+
+        usage = self.__source._memory_usage(sizer)
+        with self.__lock:
+            count = len(self.__cache)
+            retained_bytes = sizer.size(self.__cache)
+
+        return [
+            MemoryUsage("cache", "CachedEnv", None, count, count, retained_bytes),
+            *usage,
+        ]
+
+    def _get[R](
+        self,
+        cache_key: Hashable,
+        getter: Callable[[], R],
+    ) -> R:
+        lock = self.__lock
+        with lock:
+            result = self.__cache.get(cache_key, _MISSING)
+            if result is not _MISSING:
+                self.__cache.move_to_end(cache_key)
+                self.__hits += 1
+                return result  # type: ignore[no-any-return]
+
+            self.__misses += 1
+            generation = self.__generation
+
+        result = getter()
+
+        with lock:
+            # Don't store results that were computed before the cache was cleared
+            if generation == self.__generation:
+                self.__cache[cache_key] = result
+                if len(self.__cache) > self.__maxsize:
+                    self.__cache.popitem(last=False)
+
+        return result
+
+    @staticmethod
+    def _copy_list[T](values: list[T] | None) -> list[T] | None:
+        # Callers may modify returned lists, which must not affect the cached value
+        if values is None:
+            return None
+
+        return list(values)
+
+    def get_string[T = str](  # type: ignore[override]
+        self,
+        key: str,
+        *,
+        default: T | None = None,
+        required: bool = False,
+        transform: Callable[[str], T] | None = None,
+    ) -> T | None:
+        result = self._get(
+            ("get_string", key, transform),
+            lambda: self.__source.get_string(key, transform=transform),
+        )
+        if result is None:
+            return self.__defaults.get_string(
+                key,
+                default=default,
+                required=required,
+            )
+
+        return result
+
+    def get_bool(  # type: ignore[override]
+        self,
+        key: str,
+        *,
+        default: bool,
+    ) -> bool:
+        result = self._get(
+            ("get_bool", key),
+            # None is only returned if the value is missing
+            lambda: self.__source.get_bool(key, default=None),  # type: ignore[arg-type]
+        )
+        if result is None:
+            return default
+
+        return result
+
+    def get_int(  # type: ignore[override]
+        self,
+        key: str,
+        *,
+        default: int | None = None,
+        required: bool = False,
+    ) -> int | None:
+        result = self._get(("get_int", key), lambda: self.__source.get_int(key))
+        if result is None:
+            return self.__defaults.get_int(
+                key,
+                default=default,
+                required=required,
+            )
+
+        return result
+
+    def get_string_list[T = str](  # type: ignore[override]
+        self,
+        key: str,
+        *,
+        default: list[T] | None = None,
+        required: bool = False,
+        transform: Callable[[str], T] | None = None,
+    ) -> list[T] | None:
+        result = self._get(
+            ("get_string_list", key, transform),
+            lambda: self.__source.get_string_list(key, transform=transform),
+        )
+        if result is None:
+            return self.__defaults.get_string_list(
+                key,
+                default=default,
+                required=required,
+            )
+
+        return self._copy_list(result)
+
+    def get_int_list(  # type: ignore[override]
+        self,
+        key: str,
+        *,
+        default: list[int] | None = None,
+        required: bool = False,
+    ) -> list[int] | None:
+        result = self._get(
+            ("get_int_list", key),
+            lambda: self.__source.get_int_list(key),
+        )
+        if result is None:
+            return self.__defaults.get_int_list(
+                key,
+                default=default,
+                required=required,
+            )
+
+        return self._copy_list(result)
+
+    def get_datetime(  # type: ignore[override]
+        self,
+        key: str,
+        *,
+        default: datetime | None = None,
+        required: bool = False,
+        is_naive: bool = False,
+    ) -> datetime | None:
+        result = self._get(
+            ("get_datetime", key, is_naive),
+            lambda: self.__source.get_datetime(key, is_naive=is_naive),
+        )
+        if result is None:
+            return self.__defaults.get_datetime(
+                key,
+                default=default,
+                required=required,
+                is_naive=is_naive,
+            )
+
+        return result
+
+    def get_date(  # type: ignore[override]
+        self,
+        key: str,
+        *,
+        default: date | None = None,
+        required: bool = False,
+    ) -> date | None:
+        result = self._get(("get_date", key), lambda: self.__source.get_date(key))
+        if result is None:
+            return self.__defaults.get_date(
+                key,
+                default=default,
+                required=required,
+            )
+
+        return result
+
+    def get_time(  # type: ignore[override]
+        self,
+        key: str,
+        *,
+        default: time | None = None,
+        required: bool = False,
+    ) -> time | None:
+        result = self._get(("get_time", key), lambda: self.__source.get_time(key))
+        if result is None:
+            return self.__defaults.get_time(
+                key,
+                default=default,
+                required=required,
+            )
+
+        return result
+
+    def get_duration(  # type: ignore[override]
+        self,
+        key: str,
+        *,
+        default: timedelta | None = None,
+        required: bool = False,
+    ) -> timedelta | None:
+        result = self._get(
+            ("get_duration", key),
+            lambda: self.__source.get_duration(key),
+        )
+        if result is None:
+            if required and default is None:
+                raise ValueError(f"Missing duration under scope-key {key}")
+
+            return default
+
+        return result
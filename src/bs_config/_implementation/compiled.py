@@ -0,0 +1,341 @@
+import warnings
+from collections.abc import Callable, Iterable
+from datetime import date, datetime, time
+from typing import TYPE_CHECKING, Any
+
+from bs_config import Env
+
+from .layer import LayerEnv, split_chain
+
+if TYPE_CHECKING:
+    from bs_config.memory import MemoryUsage
+
+    from .memory import Sizer
+
+type _Entry = tuple[Any, LayerEnv] | None
+
+# The maximum number of stored resolutions of keys that aren't indexed (like missing
+# or non-canonical keys). Keys may be built from arbitrary input, so storing all of
+# them would grow without bounds.
+_MAX_UNINDEXED = 1024
+
+
+class CompiledEnv(Env):
+    """
+    Collapses the layers of an Env into a single index from key to the winning raw
+    value and the layer holding it. Lookups are a single dict probe, values are still
+    converted by the layer they originate from.
+
+    Volatile layers (like a live view of ``os.environ``) are not indexed. They are
+    checked on every lookup, as long as they take precedence over the indexed value.
+    """
+
+    def __init__(self, source: Env) -> None:
+        layers, fallback = split_chain(source)
+        self.__source = source
+        self.__layers = [layer for layer in layers if not layer.volatile]
+        self.__volatile = [
+            (position, layer) for position, layer in enumerate(layers) if layer.volatile
+        ]
+        self.__positions = {
+            id(layer): position for position, layer in enumerate(layers)
+        }
+        self.__fallback = fallback
+        # The index and the resolutions of keys that aren't in it, replaced together
+        self.__tables: tuple[dict[str, _Entry], dict[str, _Entry]] = (
+            self._build_index(self.__layers),
+            {},
+        )
+        source._subscribe(self._rebuild)
+
+    def _rebuild(self) -> None:
+        # The new index is swapped in at once, so readers never see a partial index
+        self.__tables = (self._build_index(self.__layers), {})
+
+    def _unwrap(self) -> Env:
+        return self.__source._unwrap()
+
+    def _subscribe(self, callback: Callable[[], None]) -> None:
+        self.__source._subscribe(callback)
+
+    def _memory_usage(self, sizer: "Sizer") -> list["MemoryUsage"]:
+        from bs_config.memory import MemoryUsage
+
+        # Measured first, so the raw values are attributed to the layers holding them
+        usage = self.__source._memory_usage(sizer)
+        tables = self.__tables
+        keys = 0
+        values = 0
+        for table in tables:
+            keys += len(table)
+            values += sum(1 for entry in table.values() if entry is not None)
+        return [
+            MemoryUsage(
+                "index",
+                "CompiledEnv",
+                None,
+                keys,
+                values,
+                sizer.size(tables),
+            ),
+            *usage,
+        ]
+
+    @staticmethod
+    def _walk(layers: list[LayerEnv], key: str) -> _Entry:
+        for layer in layers:
+            value = layer._lookup(key)
+            if value is not None:
+                return value, layer
+
+        return None
+
+    @classmethod
+    def _build_index(
+        cls,
+        layers: list[LayerEnv],
+        *,
+        complete: bool = False,
+    ) -> dict[str, _Entry]:
+        """
+        Args:
+            layers: the layers to index, by descending precedence
+            complete: whether to include keys that aren't lowercase (like TOML keys
+                with uppercase letters), for indexes that can't resolve keys on
+                demand. Their lookups would trigger warnings otherwise.
+        """
+        keys: set[str] = set()
+        for layer in layers:
+            keys.update(layer._keys())
+
+        index: dict[str, _Entry] = {}
+        for key in keys:
+            if not key:
+                continue
+
+            try:
+                if key == key.lower():
+                    index[key] = cls._walk(layers, key)
+                elif complete:
+                    with warnings.catch_warnings():
+                        warnings.simplefilter("ignore")
+                        index[key] = cls._walk(layers, key)
+            except ValueError:
+                # The error has to surface when the key is actually requested
+                continue
+
+        return index
+
+    def _resolve(self, key: str) -> _Entry:
+        entry = self._resolve_indexed(key)
+        if not self.__volatile:
+            return entry
+
+        limit = (
+            len(self.__positions) if entry is None else self.__positions[id(entry[1])]
+        )
+        for position, layer in self.__volatile:
+            if position > limit:
+                break
+
+            value = layer._lookup(key)
+            if value is not None:
+                return value, layer
+
+        return entry
+
+    def _resolve_indexed(self, key: str) -> _Entry:
+        index, unindexed = self.__tables
+        try:
+            return index[key]
+        except KeyError:
+            pass
+
+        try:
+            return unindexed[key]
+        except KeyError:
+            pass
+
+        # The key isn't present in any layer in its canonical form, but the layers
+        # might still be able to resolve it (e.g. underscores instead of dashes).
+        entry = self._walk(self.__layers, key)
+        if len(unindexed) >= _MAX_UNINDEXED:
+            # Cheaper than keeping track of the least recently used keys, frequently
+            # used keys are stored again right away
+            unindexed.clear()
+        # Stored with the index the lookup started with. If the index was rebuilt in
+        # the meantime, the entry might be outdated and is discarded with the old one.
+        unindexed[key] = entry
+        return entry
+
+    def compile(self) -> Env:
+        return self
+
+    def _resolve_many(
+        self,
+        keys: Iterable[str],
+    ) -> tuple[dict[str, tuple[Any, LayerEnv]], dict[str, ValueError], Env]:
+        resolved: dict[str, tuple[Any, LayerEnv]] = {}
+        failed: dict[str, ValueError] = {}
+        for key in keys:
+            try:
+                entry = self._resolve(key)
+            except ValueError as e:
+                failed[key] = e
+                continue
+
+            if entry is not None:
+                resolved[key] = entry
+
+        return resolved, failed, self.__fallback
+
+    def _scope(self, key: str) -> Env:
+        return CompiledEnv(self.__source / key)
+
+    def get_string[T = str](  # type: ignore[override]
+        self,
+        key: str,
+        *,
+        default: T | None = None,
+        required: bool = False,
+        transform: Callable[[str], T] | None = None,
+    ) -> T | None:
+        entry = self._resolve(key)
+        if entry is None:
+            return self.__fallback.get_string(
+                key,
+                default=default,
+                required=required,
+                transform=transform,
+            )
+
+        value, layer = entry
+        return layer._convert_string(layer._full_key(key), value, transform)
+
+    def get_bool(  # type: ignore[override]
+        self,
+        key: str,
+        *,
+        default: bool,
+    ) -> bool:
+        entry = self._resolve(key)
+        if entry is None:
+            return self.__fallback.get_bool(
+                key,
+                default=default,
+            )
+
+        value, layer = entry
+        return layer._convert_bool(layer._full_key(key), value)
+
+    def get_int(  # type: ignore[override]
+        self,
+        key: str,
+        *,
+        default: int | None = None,
+        required: bool = False,
+    ) -> int | None:
+        entry = self._resolve(key)
+        if entry is None:
+            return self.__fallback.get_int(
+                key,
+                default=default,  # type: ignore[arg-type]
+                required=required,
+            )
+
+        value, layer = entry
+        return layer._convert_int(layer._full_key(key), value)
+
+    def get_string_list[T = str](  # type: ignore[override]
+        self,
+        key: str,
+        *,
+        default: list[T] | None = None,
+        required: bool = False,
+        transform: Callable[[str], T] | None = None,
+    ) -> list[T] | None:
+        entry = self._resolve(key)
+        if entry is None:
+            return self.__fallback.get_string_list(
+                key,
+                default=default,  # type: ignore[arg-type]
+                required=required,
+                transform=transform,
+            )
+
+        value, layer = entry
+        return layer._convert_string_list(layer._full_key(key), value, transform)
+
+    def get_int_list(  # type: ignore[override]
+        self,
+        key: str,
+        *,
+        default: list[int] | None = None,
+        required: bool = False,
+    ) -> list[int] | None:
+        entry = self._resolve(key)
+        if entry is None:
+            return self.__fallback.get_int_list(
+                key,
+                default=default,  # type: ignore[arg-type]
+                required=required,
+            )
+
+        value, layer = entry
+        return layer._convert_int_list(layer._full_key(key), value)
+
+    def get_datetime(  # type: ignore[override]
+        self,
+        key: str,
+        *,
+        default: datetime | None = None,
+        required: bool = False,
+        is_naive: bool = False,
+    ) -> datetime | None:
+        entry = self._resolve(key)
+        if entry is None:
+            return self.__fallback.get_datetime(
+                key,
+                default=default,  # type: ignore[arg-type]
+                required=required,
+                is_naive=is_naive,
+            )
+
+        value, layer = entry
+        return layer._convert_datetime(layer._full_key(key), value, is_naive)
+
+    def get_date(  # type: ignore[override]
+        self,
+        key: str,
+        *,
+        default: date | None = None,
+        required: bool = False,
+    ) -> date | None:
+        entry = self._resolve(key)
+        if entry is None:
+            return self.__fallback.get_date(
+                key,
+                default=default,  # type: ignore[arg-type]
+                required=required,
+            )
+
+        value, layer = entry
+        return layer._convert_date(layer._full_key(key), value)
+
+    def get_time(  # type: ignore[override]
+        self,
+        key: str,
+        *,
+        default: time | None = None,
+        required: bool = False,
+    ) -> time | None:
+        entry = self._resolve(key)
+        if entry is None:
+            return self.__fallback.get_time(
+                key,
+                default=default,  # type: ignore[arg-type]
+                required=required,
+            )
+
+        value, layer = entry
+        return layer._convert_time(layer._full_key(key), value)
@@ -5,8 +5,20 @@ from bs_config import Env
 
 
 class DefaultEnv(Env):
-    def __init(self) -> None:
-        pass
+    def __init__(self, prefix: str | None = None) -> None:
+        self.__prefix = prefix
+
+    def _scope(self, key: str) -> Env:
+        return DefaultEnv(self._full_key(key))
+
+    def _source_name(self, key: str) -> str | None:
+        return "default"
+
+    def _full_key(self, key: str) -> str:
+        if self.__prefix is None:
+            return key
+
+        return f"{self.__prefix}.{key}"
 
     def get_string[T = str](  # type: ignore[override]
         self,
@@ -17,7 +29,7 @@ class DefaultEnv(Env):
         transform: Callable[[str], T] | None = None,
     ) -> T | None:
         if required and default is None:
-            raise ValueError(f"Missing config value for {key}")
+            raise ValueError(f"Missing config value for {self._full_key(key)}")
 
         return default
 
@@ -37,7 +49,7 @@ class DefaultEnv(Env):
         required: bool = False,
     ) -> int | None:
         if default is None and required:
-            raise ValueError(f"Missing config value for {key}")
+            raise ValueError(f"Missing config value for {self._full_key(key)}")
 
         return default
 
@@ -50,7 +62,7 @@ class DefaultEnv(Env):
         transform: Callable[[str], T] | None = None,
     ) -> list[T] | None:
         if default is None and required:
-            raise ValueError(f"Missing config value for {key}")
+            raise ValueError(f"Missing config value for {self._full_key(key)}")
 
         return default
 
@@ -62,7 +74,7 @@ class DefaultEnv(Env):
         required: bool = False,
     ) -> list[int] | None:
         if default is None and required:
-            raise ValueError(f"Missing config value for {key}")
+            raise ValueError(f"Missing config value for {self._full_key(key)}")
 
         return default
 
@@ -75,11 +87,12 @@ class DefaultEnv(Env):
         is_naive: bool = False,
     ) -> datetime | None:
         if default is None and required:
-            raise ValueError(f"Missing config value for {key}")
+            raise ValueError(f"Missing config value for {self._full_key(key)}")
 
         if default is not None and ((default.tzinfo is None) != is_naive):
             raise ValueError(
-                f"Default value timezone-awareness not as expected for key {key}"
+                "Default value timezone-awareness not as expected for key"
+                f" {self._full_key(key)}"
             )
 
         return default
@@ -92,7 +105,7 @@ class DefaultEnv(Env):
         required: bool = False,
     ) -> date | None:
         if default is None and required:
-            raise ValueError(f"Missing config value for {key}")
+            raise ValueError(f"Missing config value for {self._full_key(key)}")
 
         return default
 
@@ -104,9 +117,11 @@ class DefaultEnv(Env):
         required: bool = False,
     ) -> time | None:
         if default is None and required:
-            raise ValueError(f"Missing config value for {key}")
+            raise ValueError(f"Missing config value for {self._full_key(key)}")
 
         if default is not None and default.tzinfo is not None:
-            raise ValueError(f"Default value is timezone-aware for {key}")
+            raise ValueError(
+                f"Default value is timezone-aware for {self._full_key(key)}"
+            )
 
         return default
@@ -1,26 +1,166 @@
 import warnings
-from collections.abc import Callable
+from collections.abc import Callable, Iterable, Mapping
 from datetime import date, datetime, time
+from pathlib import Path
+from typing import TYPE_CHECKING, Self
 
 from bs_config import Env
+from bs_config.key import ConfigKey
 
+from .layer import LayerEnv
+from .prefixed import prefixed_view
 
-class DirenvEnv(Env):
-    def __init__(self, parent: Env, values: dict[str, str]) -> None:
-        self.__parent = parent
-        self.__values = values
+if TYPE_CHECKING:
+    from bs_config.parse_cache import ParseCache
+
+    from .memory import Sizer
+
+
+class DirenvEnv(LayerEnv):
+    def __init__(
+        self,
+        parent: Env,
+        values: Mapping[str, str],
+        *,
+        prefix: str | None = None,
+        path: Path | None = None,
+        live: bool = False,
+        env_prefix: str | None = None,
+        name: str | None = None,
+    ) -> None:
+        """
+        Args:
+            parent: the Env to fall back to
+            values: the variables of this layer
+            prefix: the scope key of this layer, if any
+            path: the file the values were loaded from, if any
+            live: whether ``values`` may change at any time (e.g. ``os.environ``). Live
+                values are never copied, and compiled Envs read them on every lookup.
+            env_prefix: if set, only variables starting with this prefix are kept,
+                and the prefix is removed from their names. Also applies to values
+                reloaded from ``path``.
+            name: describes where the values come from, defaults to the path
+        """
+        super().__init__(parent, prefix=prefix, path=path, name=name)
+        self.__live = live
+        self.__env_prefix = env_prefix
+        self.__values = self._strip_env_prefix(values)
+
+    @property
+    def volatile(self) -> bool:
+        return self.__live
+
+    @classmethod
+    def load_dotenv(cls, parent: Env, dotenv: Path) -> Self | None:
+        values = cls._read_source(dotenv)
+        if values is None:
+            return None
+
+        return cls._from_source(parent, values, dotenv)
+
+    @classmethod
+    def _from_source(
+        cls,
+        parent: Env,
+        values: dict[str, str],
+        path: Path,
+        *,
+        env_prefix: str | None = None,
+    ) -> Self:
+        return cls(parent, values, path=path, env_prefix=env_prefix)
+
+    @classmethod
+    def _read_source(
+        cls,
+        path: Path,
+        cache: "ParseCache | None" = None,
+    ) -> dict[str, str] | None:
+        return cls._read(path, cache) or None
+
+    @classmethod
+    def _parse(cls, path: Path, data: bytes) -> dict[str, str]:
+        from .dotenv import parse_dotenv
+
+        return parse_dotenv(data.decode("utf-8-sig"), path)
+
+    def _set_values(self, values: Mapping[str, str]) -> None:
+        self.__values = self._strip_env_prefix(values)
+
+    def _trimmed_values(self, keep: Callable[[str], bool]) -> dict[str, str] | None:
+        if self.__live:
+            return None
+
+        # The values are passed through _strip_env_prefix() again
+        env_prefix = self.__env_prefix or ""
+        result: dict[str, str] = {}
+        for name, value in self.__values.items():
+            key = self._to_key(name)
+            if self._to_variable_name(key) == name and keep(key):
+                result[f"{env_prefix}{name}"] = value
+
+        return result
+
+    def _measure_values(self, sizer: "Sizer") -> tuple[int, int, int]:
+        values = self.__values
+        if self.__live:
+            # Live values belong to the process environment, not to this layer
+            return len(values), len(values), 0
+
+        return len(values), len(values), sizer.size(values)
+
+    def _strip_env_prefix(self, values: Mapping[str, str]) -> Mapping[str, str]:
+        env_prefix = self.__env_prefix
+        if not env_prefix:
+            return values
+
+        if self.__live:
+            return prefixed_view(values, env_prefix)
+
+        prefix_length = len(env_prefix)
+        return {
+            name[prefix_length:]: value
+            for name, value in values.items()
+            if name.startswith(env_prefix)
+        }
 
     @staticmethod
     def _to_screaming_snake_case(s: str) -> str:
         return s.replace("-", "_").upper()
 
-    def _get_stripped_value(self, key: str) -> str | None:
-        if key != key.lower():
-            warnings.warn("Keys should use kebab-case")
+    @staticmethod
+    def _to_kebab_case(s: str) -> str:
+        return s.replace("_", "-").lower()
 
+    @classmethod
+    def _to_variable_name(cls, key: str) -> str:
         key_parts = key.split(".")
-        full_key = "__".join(self._to_screaming_snake_case(part) for part in key_parts)
-        value = self.__values.get(full_key)
+        return "__".join(cls._to_screaming_snake_case(part) for part in key_parts)
+
+    @classmethod
+    def _to_key(cls, name: str) -> str:
+        return ".".join(cls._to_kebab_case(part) for part in name.split("__"))
+
+    @classmethod
+    def _canonical_key(cls, key: str) -> str:
+        """
+        Returns the canonical form (lowercase, dashes) of a key, which resolves to the
+        same variable as the key itself.
+        """
+        if isinstance(key, ConfigKey):
+            return cls._to_key(key.variable_name)
+
+        return cls._to_key(cls._to_variable_name(key))
+
+    def _lookup(self, key: str) -> str | None:
+        if isinstance(key, ConfigKey):
+            name = key.variable_name
+        else:
+            if key != key.lower():
+                warnings.warn("Keys should use kebab-case")
+
+            name = self._to_variable_name(key)
+
+        value = self.__values.get(name)
 
         if value is None:
             return value
@@ -31,132 +171,83 @@ class DirenvEnv(Env):
 
         return value
 
-    def get_string[T = str](  # type: ignore[override]
+    def _create(
         self,
-        key: str,
-        *,
-        default: T | None = None,
-        required: bool = False,
-        transform: Callable[[str], T] | None = None,
-    ) -> T | None:
-        value = self._get_stripped_value(key)
-        if value is None:
-            return self.__parent.get_string(
-                key,
-                default=default,
-                required=required,
-                transform=transform,
-            )
+        parent: Env,
+        values: Mapping[str, str],
+        prefix: str,
+    ) -> LayerEnv:
+        return DirenvEnv(parent, values, prefix=prefix, live=self.__live)
+
+    def _scoped_values(self, key: str) -> Mapping[str, str]:
+        name_prefix = f"{ConfigKey(key).variable_name}__"
+        if self.__live:
+            return prefixed_view(self.__values, name_prefix)
+
+        prefix_length = len(name_prefix)
+        return {
+            name[prefix_length:]: value
+            for name, value in self.__values.items()
+            if name.startswith(name_prefix)
+        }
+
+    def _keys(self) -> Iterable[str]:
+        for name in self.__values:
+            key = self._to_key(name)
+            # Names that contain lowercase letters can't be looked up
+            if self._to_variable_name(key) == name:
+                yield key
 
+    @staticmethod
+    def _convert_string[T](
+        key: str,
+        value: str,
+        transform: Callable[[str], T] | None,
+    ) -> T:
         if transform is None:
             return value  # type: ignore[return-value]
 
         return transform(value)
 
-    def get_bool(  # type: ignore[override]
-        self,
-        key: str,
-        *,
-        default: bool,
-    ) -> bool:
-        value = self._get_stripped_value(key)
-        if value is None:
-            return self.__parent.get_bool(
-                key,
-                default=default,
-            )
-
+    @staticmethod
+    def _convert_bool(key: str, value: str) -> bool:
         return value in ("true", "True", "yes")
 
-    def get_int(  # type: ignore[override]
-        self,
-        key: str,
-        *,
-        default: int | None = None,
-        required: bool = False,
-    ) -> int | None:
-        value = self._get_stripped_value(key)
-        if value is None:
-            return self.__parent.get_int(
-                key,
-                default=default,  # type: ignore[arg-type]
-                required=required,
-            )
-
+    @staticmethod
+    def _convert_int(key: str, value: str) -> int:
         return int(value)
 
-    def get_string_list[T = str](  # type: ignore[override]
-        self,
+    @staticmethod
+    def _convert_string_list[T](
         key: str,
-        *,
-        default: list[T] | None = None,
-        required: bool = False,
-        transform: Callable[[str], T] | None = None,
-    ) -> list[T] | None:
-        values = self._get_stripped_value(key)
-
-        if values is None:
-            return self.__parent.get_string_list(
-                key,
-                default=default,  # type: ignore[arg-type]
-                required=required,
-                transform=transform,
-            )
-
+        value: str,
+        transform: Callable[[str], T] | None,
+    ) -> list[T]:
         raw_values = (
-            stripped for value in values.split(",") if (stripped := value.strip())
+            stripped for item in value.split(",") if (stripped := item.strip())
         )
         if transform is None:
             return list(raw_values)  # type: ignore[arg-type]
 
-        return [transform(value) for value in raw_values]
-
-    def get_int_list(  # type: ignore[override]
-        self,
-        key: str,
-        *,
-        default: list[int] | None = None,
-        required: bool = False,
-    ) -> list[int] | None:
-        values = self._get_stripped_value(key)
-
-        if values is None:
-            return self.__parent.get_int_list(
-                key,
-                default=default,  # type: ignore[arg-type]
-                required=required,
-            )
+        return [transform(item) for item in raw_values]
 
+    @staticmethod
+    def _convert_int_list(key: str, value: str) -> list[int]:
         result: list[int] = []
-        for value in values.split(","):
-            stripped = value.strip()
+        for item in value.split(","):
+            stripped = item.strip()
             if not stripped:
                 continue
 
             try:
                 result.append(int(stripped))
             except ValueError:
-                raise ValueError(f"Invalid integer for key {key}: '{value}'")
+                raise ValueError(f"Invalid integer for key {key}: '{item}'")
 
         return result
 
-    def get_datetime(  # type: ignore[override]
-        self,
-        key: str,
-        *,
-        default: datetime | None = None,
-        required: bool = False,
-        is_naive: bool = False,
-    ) -> datetime | None:
-        value = self._get_stripped_value(key)
-        if value is None:
-            return self.__parent.get_datetime(
-                key,
-                default=default,  # type: ignore[arg-type]
-                required=required,
-                is_naive=is_naive,
-            )
-
+    @staticmethod
+    def _convert_datetime(key: str, value: str, is_naive: bool) -> datetime:
         try:
             result = datetime.fromisoformat(value)
         except ValueError:
@@ -177,41 +268,15 @@ class DirenvEnv(Env):
                 "Received timezone-naive datetime value, but a timezone-aware datetime was expected"
             )
 
-    def get_date(  # type: ignore[override]
-        self,
-        key: str,
-        *,
-        default: date | None = None,
-        required: bool = False,
-    ) -> date | None:
-        value = self._get_stripped_value(key)
-        if value is None:
-            return self.__parent.get_date(
-                key,
-                default=default,  # type: ignore[arg-type]
-                required=required,
-            )
-
+    @staticmethod
+    def _convert_date(key: str, value: str) -> date:
         try:
             return date.fromisoformat(value)
         except ValueError:
             raise ValueError(f"Invalid date for key {key}: '{value}'")
 
-    def get_time(  # type: ignore[override]
-        self,
-        key: str,
-        *,
-        default: time | None = None,
-        required: bool = False,
-    ) -> time | None:
-        value = self._get_stripped_value(key)
-        if value is None:
-            return self.__parent.get_time(
-                key,
-                default=default,  # type: ignore[arg-type]
-                required=required,
-            )
-
+    @staticmethod
+    def _convert_time(key: str, value: str) -> time:
         try:
             result = time.fromisoformat(value)
         except ValueError:
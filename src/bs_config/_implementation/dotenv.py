@@ -0,0 +1,118 @@
+import codecs
+import logging
+import re
+
+_logger = logging.getLogger(__name__)
+
+_KEY = re.compile(r"[ \t]*(?:export[ \t]+)?([^=#\s]+)[ \t]*")
+# A backslash always escapes the next character, so an escaped backslash can't
+# escape the closing quote
+_SINGLE_QUOTED = re.compile(r"'((?:\\.|[^'\\])*)'", re.DOTALL)
+_DOUBLE_QUOTED = re.compile(r'"((?:\\.|[^"\\])*)"', re.DOTALL)
+_LINE_END = re.compile(r"[ \t]*(?:#[^\n]*)?(?:\n|$)")
+_INLINE_COMMENT = re.compile(r"\s+#.*")
+_SINGLE_QUOTE_ESCAPES = re.compile(r"\\[\\']")
+_DOUBLE_QUOTE_ESCAPES = re.compile(r"\\[\\'\"abfnrtv]")
+
+
+def _decode_double_quote_escape(match: re.Match[str]) -> str:
+    return codecs.decode(match.group(0), "unicode-escape")
+
+
+def parse_dotenv(text: str, source: object = "<dotenv>") -> dict[str, str]:
+    """
+    Parses the content of a dotenv file.
+
+    Supports ``KEY=value`` lines, an optional ``export`` prefix, comment lines, inline
+    comments after unquoted values (separated by whitespace), and single- or
+    double-quoted values, which may span multiple lines. Escape sequences are resolved
+    in double-quoted values, in single-quoted values only ``\\'`` and ``\\\\`` are.
+    Variable interpolation is not supported.
+
+    Keys without a value (no ``=``) are ignored. Lines that can't be parsed are logged
+    and skipped.
+
+    Args:
+        text: the content of the file
+        source: the source of the text, used in log messages
+
+    Returns:
+        the variables defined in the file. Later definitions win.
+    """
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+
+    values: dict[str, str] = {}
+    length = len(text)
+    pos = 0
+    line_number = 1
+    while pos < length:
+        line_end = text.find("\n", pos)
+        if line_end < 0:
+            line_end = length
+
+        start_line = line_number
+        line = text[pos:line_end]
+        stripped = line.strip()
+        if not stripped or stripped[0] == "#":
+            pos = line_end + 1
+            line_number += 1
+            continue
+
+        key_match = _KEY.match(text, pos, line_end)
+        if key_match is None or key_match.end() == line_end:
+            # Either invalid or a key without any value
+            if key_match is None:
+                _logger.warning(
+                    "Could not parse statement in %s at line %d", source, start_line
+                )
+            pos = line_end + 1
+            line_number += 1
+            continue
+
+        value_start = key_match.end()
+        if text[value_start] != "=":
+            _logger.warning(
+                "Could not parse statement in %s at line %d", source, start_line
+            )
+            pos = line_end + 1
+            line_number += 1
+            continue
+
+        value_start += 1
+        while value_start < line_end and text[value_start] in " \t":
+            value_start += 1
+
+        quote = text[value_start] if value_start < line_end else ""
+        if quote == "'" or quote == '"':
+            pattern = _SINGLE_QUOTED if quote == "'" else _DOUBLE_QUOTED
+            value_match = pattern.match(text, value_start)
+            end_match = (
+                None
+                if value_match is None
+                else _LINE_END.match(text, value_match.end())
+            )
+            if value_match is None or end_match is None:
+                _logger.warning(
+                    "Could not parse statement in %s at line %d", source, start_line
+                )
+                pos = line_end + 1
+                line_number += 1
+                continue
+
+            raw = value_match.group(1)
+            if quote == "'":
+                value = _SINGLE_QUOTE_ESCAPES.sub(lambda m: m.group(0)[-1], raw)
+            else:
+                value = _DOUBLE_QUOTE_ESCAPES.sub(_decode_double_quote_escape, raw)
+
+            line_number += text.count("\n", pos, end_match.end())
+            pos = end_match.end()
+        else:
+            value = _INLINE_COMMENT.sub("", text[value_start:line_end]).rstrip()
+            pos = line_end + 1
+            line_number += 1
+
+        values[key_match.group(1)] = value
+
+    return values
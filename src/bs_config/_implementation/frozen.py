@@ -0,0 +1,437 @@
+import warnings
+from collections.abc import Callable, Hashable
+from datetime import date, datetime, time, timedelta
+from typing import TYPE_CHECKING, Any
+
+from bs_config import Env
+
+from .compiled import CompiledEnv
+from .default import DefaultEnv
+from .direnv import DirenvEnv
+from .layer import LayerEnv, split_chain
+
+if TYPE_CHECKING:
+    from bs_config.memory import MemoryUsage
+
+    from .memory import Sizer
+
+# Not converted yet
+_MISSING: Any = object()
+# Not present in any layer
+_ABSENT: Any = object()
+
+# The raw value, the layer type that converts it, and the key used in error messages
+type _Entry = tuple[Any, type[LayerEnv], str]
+
+_ACCESSORS = (
+    "get_string",
+    "get_bool",
+    "get_int",
+    "get_string_list",
+    "get_int_list",
+    "get_datetime",
+    "get_date",
+    "get_time",
+    "get_duration",
+)
+
+
+def collect_layers(env: Env) -> tuple[list[LayerEnv], Env]:
+    """
+    Collects the layers of an Env, including those of Envs it falls back to, by
+    descending precedence. Also returns the Env that falls back to the defaults.
+    """
+    layers, fallback = split_chain(env._unwrap())
+    while not isinstance(fallback, DefaultEnv):
+        fallback_layers, next_fallback = split_chain(fallback._unwrap())
+        if not fallback_layers:
+            break
+
+        layers.extend(fallback_layers)
+        fallback = next_fallback
+
+    return layers, fallback
+
+
+def resolve_variant(
+    key: str,
+    find: Callable[[str], _Entry | None],
+) -> _Entry | None:
+    """
+    Resolves a key that isn't in its canonical form (uppercase letters, underscores)
+    and wasn't found as is. Only layers holding environment variables translate keys
+    to variable names, so only their values are found under the canonical key.
+    """
+    if key != key.lower():
+        warnings.warn("Keys should use kebab-case")
+
+    entry = find(DirenvEnv._canonical_key(key))
+    if entry is None or not issubclass(entry[1], DirenvEnv):
+        return None
+
+    value, layer_type, _ = entry
+    return value, layer_type, key
+
+
+class FrozenEnv(Env):
+    """
+    An immutable snapshot of the values of an Env. All keys are resolved once when
+    the snapshot is created, values are converted on first access and then reused.
+    The snapshot doesn't reference the layers it was created from.
+
+    Snapshots are safe to share between threads, concurrent first accesses of a value
+    just convert it more than once.
+    """
+
+    def __init__(
+        self,
+        entries: dict[str, _Entry],
+        fallback: Env,
+        prefix: str | None = None,
+        converted: dict[str, dict[Hashable, Any]] | None = None,
+    ) -> None:
+        self.__entries = entries
+        self.__fallback = fallback
+        self.__prefix = prefix
+        if converted is None:
+            converted = {accessor: {} for accessor in _ACCESSORS}
+        self.__converted = converted
+
+    @classmethod
+    def of(cls, env: Env) -> "FrozenEnv":
+        layers, fallback = collect_layers(env)
+        index = CompiledEnv._build_index(layers, complete=True)
+        entries: dict[str, _Entry] = {}
+        for key, entry in index.items():
+            if entry is not None:
+                value, layer = entry
+                entries[key] = (value, type(layer), layer._full_key(key))
+
+        return cls(entries, fallback)
+
+    def freeze(self) -> Env:
+        return self
+
+    def compile(self) -> Env:
+        return self
+
+    def _memory_usage(self, sizer: "Sizer") -> list["MemoryUsage"]:
+        from bs_config.memory import MemoryUsage
+
+        usage = self.__fallback._memory_usage(sizer)
+        # Scoped instances share the storage, it's only reported once
+        if self.__prefix is not None:
+            return usage
+
+        entries = self.__entries
+        converted = self.__converted
+
+        return [
+            MemoryUsage(
+                "frozen",
+                "FrozenEnv",
+                None,
+                len(entries),
+                sum(len(values) for values in converted.values()),
+                sizer.size(entries) + sizer.size(converted),
+            ),
+            *usage,
+        ]
+
+    def _scope(self, key: str) -> Env:
+        return FrozenEnv(
+            self.__entries,
+            self.__fallback / key,
+            self._full_key(key),
+            self.__converted,
+        )
+
+    def _full_key(self, key: str) -> str:
+        if self.__prefix is None:
+            return key
+
+        return f"{self.__prefix}.{key}"
+
+    def _convert(
+        self,
+        accessor: str,
+        key: str,
+        cache_key: Hashable,
+        convert: Callable[[type[LayerEnv], str, Any], Any],
+    ) -> Any:
+        """
+        Converts the value for the key, or returns ``_ABSENT`` if there is none. Only
+        the values of keys in the snapshot are stored, since other keys (and
+        variants like "my_key") may be built from arbitrary input.
+        """
+        entries = self.__entries
+        entry = entries.get(key)
+        if entry is None:
+            if key != key.lower() or "_" in key:
+                entry = resolve_variant(key, entries.get)
+            if entry is None:
+                return _ABSENT
+
+            value, layer_type, error_key = entry
+            return convert(layer_type, error_key, value)
+
+        if key != key.lower():
+            # Like the layers do when looking up the key
+            warnings.warn("Keys should use kebab-case")
+
+        value, layer_type, error_key = entry
+        result = convert(layer_type, error_key, value)
+        self.__converted[accessor][cache_key] = result
+        return result
+
+    def get_string[T = str](  # type: ignore[override]
+        self,
+        key: str,
+        *,
+        default: T | None = None,
+        required: bool = False,
+        transform: Callable[[str], T] | None = None,
+    ) -> T | None:
+        full_key = key if self.__prefix is None else f"{self.__prefix}.{key}"
+        result = self.__converted["get_string"].get(full_key, _MISSING)
+        if result is _MISSING:
+            result = self._convert(
+                "get_string",
+                full_key,
+                full_key,
+                lambda layer, error_key, value: layer._convert_string(
+                    error_key, value, None
+                ),
+            )
+
+        if result is _ABSENT:
+            return self.__fallback.get_string(
+                key,
+                default=default,
+                required=required,
+                transform=transform,
+            )
+
+        # Transforms are applied on every call, storing their results would keep
+        # every (possibly short-lived) transform alive
+        if transform is None:
+            return result  # type: ignore[no-any-return]
+
+        return transform(result)
+
+    def get_bool(  # type: ignore[override]
+        self,
+        key: str,
+        *,
+        default: bool,
+    ) -> bool:
+        full_key = key if self.__prefix is None else f"{self.__prefix}.{key}"
+        result = self.__converted["get_bool"].get(full_key, _MISSING)
+        if result is _MISSING:
+            result = self._convert(
+                "get_bool",
+                full_key,
+                full_key,
+                lambda layer, error_key, value: layer._convert_bool(error_key, value),
+            )
+
+        if result is _ABSENT:
+            return self.__fallback.get_bool(key, default=default)
+
+        return result  # type: ignore[no-any-return]
+
+    def get_int(  # type: ignore[override]
+        self,
+        key: str,
+        *,
+        default: int | None = None,
+        required: bool = False,
+    ) -> int | None:
+        full_key = key if self.__prefix is None else f"{self.__prefix}.{key}"
+        result = self.__converted["get_int"].get(full_key, _MISSING)
+        if result is _MISSING:
+            result = self._convert(
+                "get_int",
+                full_key,
+                full_key,
+                lambda layer, error_key, value: layer._convert_int(error_key, value),
+            )
+
+        if result is _ABSENT:
+            return self.__fallback.get_int(
+                key,
+                default=default,  # type: ignore[arg-type]
+                required=required,
+            )
+
+        return result  # type: ignore[no-any-return]
+
+    def get_string_list[T = str](  # type: ignore[override]
+        self,
+        key: str,
+        *,
+        default: list[T] | None = None,
+        required: bool = False,
+        transform: Callable[[str], T] | None = None,
+    ) -> list[T] | None:
+        full_key = key if self.__prefix is None else f"{self.__prefix}.{key}"
+        result = self.__converted["get_string_list"].get(full_key, _MISSING)
+        if result is _MISSING:
+            result = self._convert(
+                "get_string_list",
+                full_key,
+                full_key,
+                lambda layer, error_key, value: tuple(
+                    layer._convert_string_list(error_key, value, None)
+                ),
+            )
+
+        if result is _ABSENT:
+            return self.__fallback.get_string_list(
+                key,
+                default=default,  # type: ignore[arg-type]
+                required=required,
+                transform=transform,
+            )
+
+        if transform is not None:
+            return [transform(item) for item in result]
+
+        # Callers may modify returned lists, the stored value must stay the same
+        return list(result)
+
+    def get_int_list(  # type: ignore[override]
+        self,
+        key: str,
+        *,
+        default: list[int] | None = None,
+        required: bool = False,
+    ) -> list[int] | None:
+        full_key = key if self.__prefix is None else f"{self.__prefix}.{key}"
+        result = self.__converted["get_int_list"].get(full_key, _MISSING)
+        if result is _MISSING:
+            result = self._convert(
+                "get_int_list",
+                full_key,
+                full_key,
+                lambda layer, error_key, value: tuple(
+                    layer._convert_int_list(error_key, value)
+                ),
+            )
+
+        if result is _ABSENT:
+            return self.__fallback.get_int_list(
+                key,
+                default=default,  # type: ignore[arg-type]
+                required=required,
+            )
+
+        return list(result)
+
+    def get_datetime(  # type: ignore[override]
+        self,
+        key: str,
+        *,
+        default: datetime | None = None,
+        required: bool = False,
+        is_naive: bool = False,
+    ) -> datetime | None:
+        full_key = key if self.__prefix is None else f"{self.__prefix}.{key}"
+        cache_key = (full_key, is_naive)
+        result = self.__converted["get_datetime"].get(cache_key, _MISSING)
+        if result is _MISSING:
+            result = self._convert(
+                "get_datetime",
+                full_key,
+                cache_key,
+                lambda layer, error_key, value: layer._convert_datetime(
+                    error_key, value, is_naive
+                ),
+            )
+
+        if result is _ABSENT:
+            return self.__fallback.get_datetime(
+                key,
+                default=default,  # type: ignore[arg-type]
+                required=required,
+                is_naive=is_naive,
+            )
+
+        return result  # type: ignore[no-any-return]
+
+    def get_date(  # type: ignore[override]
+        self,
+        key: str,
+        *,
+        default: date | None = None,
+        required: bool = False,
+    ) -> date | None:
+        full_key = key if self.__prefix is None else f"{self.__prefix}.{key}"
+        result = self.__converted["get_date"].get(full_key, _MISSING)
+        if result is _MISSING:
+            result = self._convert(
+                "get_date",
+                full_key,
+                full_key,
+                lambda layer, error_key, value: layer._convert_date(error_key, value),
+            )
+
+        if result is _ABSENT:
+            return self.__fallback.get_date(
+                key,
+                default=default,  # type: ignore[arg-type]
+                required=required,
+            )
+
+        return result  # type: ignore[no-any-return]
+
+    def get_time(  # type: ignore[override]
+        self,
+        key: str,
+        *,
+        default: time | None = None,
+        required: bool = False,
+    ) -> time | None:
+        full_key = key if self.__prefix is None else f"{self.__prefix}.{key}"
+        result = self.__converted["get_time"].get(full_key, _MISSING)
+        if result is _MISSING:
+            result = self._convert(
+                "get_time",
+                full_key,
+                full_key,
+                lambda layer, error_key, value: layer._convert_time(error_key, value),
+            )
+
+        if result is _ABSENT:
+            return self.__fallback.get_time(
+                key,
+                default=default,  # type: ignore[arg-type]
+                required=required,
+            )
+
+        return result  # type: ignore[no-any-return]
+
+    def get_duration(  # type: ignore[override]
+        self,
+        key: str,
+        *,
+        default: timedelta | None = None,
+        required: bool = False,
+    ) -> timedelta | None:
+        # Only the result of the fields is stored, defaults may differ between calls
+        full_key = self._full_key(key)
+        cache = self.__converted["get_duration"]
+        result: timedelta | None = cache.get(full_key, _MISSING)
+        if result is _MISSING:
+            result = super().get_duration(key)
+            # Like in _convert(), misses aren't stored
+            if result is not None:
+                cache[full_key] = result
+
+        if result is None:
+            if required and default is None:
+                raise ValueError(f"Missing duration under scope-key {key}")
+
+            return default
+
+        return result
@@ -0,0 +1,169 @@
+import threading
+from bisect import bisect_left
+from typing import TYPE_CHECKING, Any, Self
+
+from bs_config import Env
+from bs_config.resolution import Resolution
+
+from .observed import ObservedEnv, Observers
+
+if TYPE_CHECKING:
+    from bs_config.memory import MemoryUsage
+
+    from .memory import Sizer
+
+# Upper bounds of the latency histogram buckets in seconds. The last bucket counts
+# all calls that took longer.
+LATENCY_BOUNDS = (
+    250e-9,
+    500e-9,
+    1e-6,
+    2.5e-6,
+    5e-6,
+    10e-6,
+    25e-6,
+    50e-6,
+    100e-6,
+    250e-6,
+    1e-3,
+)
+
+
+class _Metrics:
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.reads: dict[str, dict[str, int]] = {}
+        self.buckets = [0] * (len(LATENCY_BOUNDS) + 1)
+        self.total = 0.0
+
+    def record(self, resolution: Resolution) -> None:
+        source = resolution.source
+        if source is None:
+            if resolution.error is not None:
+                # The value couldn't be resolved, so no source served it
+                return
+
+            source = "unknown"
+
+        key = resolution.key
+        elapsed = resolution.elapsed
+        bucket = bisect_left(LATENCY_BOUNDS, elapsed)
+        with self.lock:
+            try:
+                self.reads[key][source] += 1
+            except KeyError:
+                sources = self.reads.setdefault(key, {})
+                sources[source] = sources.get(source, 0) + 1
+            self.buckets[bucket] += 1
+            self.total += elapsed
+
+    def snapshot(self) -> dict[str, Any]:
+        with self.lock:
+            reads = {
+                key: {"count": sum(sources.values()), "sources": dict(sources)}
+                for key, sources in self.reads.items()
+            }
+            buckets = list(self.buckets)
+            total = self.total
+
+        return {
+            "reads": reads,
+            "latency": {
+                "bounds": list(LATENCY_BOUNDS),
+                "buckets": buckets,
+                "count": sum(buckets),
+                "sum": total,
+            },
+        }
+
+    def measure(self, sizer: "Sizer") -> tuple[int, int, int]:
+        """
+        Returns the number of keys, the number of per-source counters and the
+        retained bytes.
+        """
+        with self.lock:
+            return (
+                len(self.reads),
+                sum(len(sources) for sources in self.reads.values()),
+                sizer.size(self.reads) + sizer.size(self.buckets),
+            )
+
+    def reset(self) -> None:
+        with self.lock:
+            self.reads = {}
+            self.buckets = [0] * (len(LATENCY_BOUNDS) + 1)
+            self.total = 0.0
+
+
+class InstrumentedEnv(ObservedEnv):
+    """
+    Records how often each key is read, which source served it, and how long reads
+    take, using an observer that sees every call. Scoped instances share the metrics
+    of the instance they were created from.
+    """
+
+    def __init__(
+        self,
+        source: Env,
+        observers: Observers | None = None,
+        prefix: str | None = None,
+        metrics: _Metrics | None = None,
+    ) -> None:
+        if metrics is None:
+            metrics = _Metrics()
+        if observers is None:
+            observers = Observers()
+            observers.add(metrics.record, 1.0)
+
+        super().__init__(source, observers, prefix)
+        self.__metrics = metrics
+
+    def _create(self, source: Env, observers: Observers, prefix: str) -> Self:
+        return type(self)(source, observers, prefix, self.__metrics)
+
+    def _state_memory_usage(self, sizer: "Sizer") -> list["MemoryUsage"]:
+        from bs_config.memory import MemoryUsage
+
+        keys, counters, retained_bytes = self.__metrics.measure(sizer)
+        return [
+            MemoryUsage(
+                "metrics",
+                type(self).__name__,
+                None,
+                keys,
+                counters,
+                retained_bytes,
+            )
+        ]
+
+    def snapshot(self) -> dict[str, Any]:
+        """
+        Returns a copy of the recorded metrics::
+
+            {
+                "reads": {
+                    "my-key": {"count": 3, "sources": {"environ": 2, "default": 1}},
+                },
+                "latency": {
+                    "bounds": [2.5e-07, 5e-07, ...],
+                    "buckets": [0, 2, ...],
+                    "count": 3,
+                    "sum": 2.1e-06,
+                },
+            }
+
+        Sources are named after the layer that held the value (see
+        ``LayerEnv.name``), "default" if no layer had a value, "fallback" if the
+        value came from an Env passed as ``fallback`` to ``load()``, or "unknown" if
+        the instrumented Env doesn't keep track of its sources (like frozen Envs).
+        Latencies are in seconds. ``buckets`` counts the reads per bucket (not
+        cumulative), bucket ``i`` contains the reads that took at most ``bounds[i]``,
+        the last bucket all slower reads.
+        """
+        return self.__metrics.snapshot()
+
+    def reset(self) -> None:
+        """
+        Discards all recorded metrics.
+        """
+        self.__metrics.reset()
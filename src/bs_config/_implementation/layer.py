@@ -0,0 +1,500 @@
+import abc
+import weakref
+from collections.abc import Callable, Iterable
+from datetime import date, datetime, time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Self
+
+from bs_config import Env
+
+if TYPE_CHECKING:
+    from bs_config.memory import MemoryUsage
+    from bs_config.parse_cache import ParseCache
+
+    from .memory import Sizer
+
+
+class LayerEnv(Env, abc.ABC):
+    """
+    Base class for Env implementations that hold a set of values and fall back to a
+    parent Env for keys they don't contain.
+
+    Subclasses split every lookup into two steps: ``_lookup`` finds the stripped raw
+    value for a key (or None if it is missing or blank), and the ``_convert_*``
+    methods turn that raw value into the requested type. Keeping the steps separate
+    allows other Env implementations to resolve a key once and convert the value with
+    the layer that actually holds it.
+    """
+
+    def __init__(
+        self,
+        parent: Env,
+        *,
+        prefix: str | None = None,
+        path: Path | None = None,
+        name: str | None = None,
+    ) -> None:
+        self.__parent = parent
+        self.__prefix = prefix
+        self.__path = path
+        if name is None:
+            name = type(self).__name__ if path is None else str(path)
+        self.__name = name
+        self.__listeners: list[weakref.WeakMethod[Callable[[], None]]] = []
+        self.__children: list[tuple[str, weakref.ref[LayerEnv]]] = []
+
+    @property
+    def parent(self) -> Env:
+        return self.__parent
+
+    @property
+    def volatile(self) -> bool:
+        """
+        Whether the values of this layer may change without notifying subscribers.
+        Values of volatile layers must not be cached or indexed.
+        """
+        return False
+
+    @property
+    def path(self) -> Path | None:
+        """
+        The file the values of this layer were loaded from, if any.
+        """
+        return self.__path
+
+    @property
+    def name(self) -> str:
+        """
+        Describes where the values of this layer come from: the file they were loaded
+        from, "environ" for environment variables, or the class name otherwise. Scoped
+        layers have the name of the layer they were created from.
+        """
+        return self.__name
+
+    def _full_key(self, key: str) -> str:
+        """
+        Returns the unscoped key for a key looked up in this layer.
+        """
+        if self.__prefix is None:
+            return key
+
+        return f"{self.__prefix}.{key}"
+
+    def _scope(self, key: str) -> Env:
+        scoped = self._create(
+            self.__parent / key,
+            self._scoped_values(key),
+            self._full_key(key),
+        )
+        scoped.__name = self.__name
+        self.__children.append((key, weakref.ref(scoped)))
+        return scoped
+
+    @abc.abstractmethod
+    def _create(self, parent: Env, values: Any, prefix: str) -> "LayerEnv":
+        """
+        Creates a new scoped layer of the same type.
+        """
+        pass
+
+    @abc.abstractmethod
+    def _scoped_values(self, key: str) -> Any:
+        """
+        Returns the values of this layer within the scope of the given key, in the form
+        accepted by the constructor.
+        """
+        pass
+
+    @abc.abstractmethod
+    def _set_values(self, values: Any) -> None:
+        """
+        Replaces the values of this layer. Implementations must swap the values in a
+        single assignment, so concurrent readers either see the old or the new values.
+        """
+        pass
+
+    def _trimmed_values(self, keep: Callable[[str], bool]) -> Any | None:
+        """
+        Returns the values of this layer (in the form accepted by ``_set_values()``)
+        reduced to the keys for which ``keep`` returns True, or None if the values
+        can't be trimmed. A kept key includes all keys scoped within it.
+        """
+        return None
+
+    def _memory_usage(self, sizer: "Sizer") -> list["MemoryUsage"]:
+        from bs_config.memory import MemoryUsage
+
+        keys, values, retained_bytes = self._measure_values(sizer)
+        return [
+            MemoryUsage(
+                self.name,
+                type(self).__name__,
+                None,
+                keys,
+                values,
+                retained_bytes,
+            ),
+            *self.__parent._memory_usage(sizer),
+        ]
+
+    def _measure_values(self, sizer: "Sizer") -> tuple[int, int, int]:
+        """
+        Counts the keys and values of this layer and measures the memory they retain.
+
+        Returns:
+            the number of keys, the number of values and the retained bytes
+        """
+        return 0, 0, 0
+
+    @classmethod
+    def _parse(cls, path: Path, data: bytes) -> Any:
+        """
+        Parses the content of the given file into values for this layer.
+        """
+        raise NotImplementedError(f"{cls.__name__} can't be loaded from a file")
+
+    @classmethod
+    def _read(cls, path: Path, cache: "ParseCache | None" = None) -> Any:
+        """
+        Reads the values for this layer from the given file. A missing file results in
+        empty values.
+
+        Args:
+            path: the file to read
+            cache: a cache for parsed values, if any
+        """
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            return cls._parse(path, b"")
+
+        if cache is None:
+            return cls._parse(path, data)
+
+        return cache._get(cls, path, data)
+
+    @classmethod
+    def _read_source(cls, path: Path, cache: "ParseCache | None" = None) -> Any | None:
+        """
+        Reads the values for a new layer from the given file.
+
+        Returns:
+            the values, or None if the file doesn't contribute any values and no layer
+            should be created for it
+        """
+        return cls._read(path, cache)
+
+    @classmethod
+    def _defer_source(cls, path: Path, cache: "ParseCache | None" = None) -> Any | None:
+        """
+        Like ``_read_source()``, but implementations may return a placeholder and
+        defer reading the file until its values are first needed. The default
+        implementation reads the file immediately.
+        """
+        return cls._read_source(path, cache)
+
+    @classmethod
+    def _from_source(
+        cls,
+        parent: Env,
+        values: Any,
+        path: Path,
+        *,
+        env_prefix: str | None = None,
+    ) -> Self:
+        """
+        Creates a new layer from values returned by ``_read_source()``.
+
+        Args:
+            parent: the Env to fall back to
+            values: the values read from the file
+            path: the file
+            env_prefix: the prefix of environment variable names to keep, only used by
+                layers holding environment variables
+        """
+        raise NotImplementedError(f"{cls.__name__} can't be loaded from a file")
+
+    def _reload(self) -> None:
+        """
+        Reads the values of this layer from its file again and replaces them.
+        """
+        if self.__path is None:
+            raise ValueError("Layer was not loaded from a file")
+
+        self._replace_values(self._read(self.__path))
+
+    def _replace_values(self, values: Any) -> None:
+        self._set_values(values)
+        self._notify_changed()
+
+    def _subscribe(self, callback: Callable[[], None]) -> None:
+        self.__listeners.append(weakref.WeakMethod(callback))  # type: ignore[arg-type]
+        self.__parent._subscribe(callback)
+
+    def _notify_changed(self) -> None:
+        """
+        Updates scoped layers derived from this layer and notifies all subscribers.
+        Must be called after the values of this layer changed.
+        """
+        children = self.__children
+        self.__children = [(key, child) for key, child in children if child()]
+        for key, child_ref in children:
+            child = child_ref()
+            if child is not None:
+                child._replace_values(self._scoped_values(key))
+
+        listeners = self.__listeners
+        self.__listeners = [
+            listener for listener in listeners if listener() is not None
+        ]
+        for listener in listeners:
+            callback = listener()
+            if callback is not None:
+                callback()
+
+    def _resolve_many(
+        self,
+        keys: Iterable[str],
+    ) -> tuple[dict[str, tuple[Any, "LayerEnv"]], dict[str, ValueError], Env]:
+        layers, fallback = split_chain(self)
+        resolved: dict[str, tuple[Any, LayerEnv]] = {}
+        failed: dict[str, ValueError] = {}
+
+        pending = list(dict.fromkeys(keys))
+        for layer in layers:
+            if not pending:
+                break
+
+            remaining = []
+            for key in pending:
+                try:
+                    value = layer._lookup(key)
+                except ValueError as e:
+                    failed[key] = e
+                    continue
+
+                if value is None:
+                    remaining.append(key)
+                else:
+                    resolved[key] = value, layer
+
+            pending = remaining
+
+        return resolved, failed, fallback
+
+    @abc.abstractmethod
+    def _lookup(self, key: str) -> Any | None:
+        """
+        Returns the stripped raw value for the given key, or None if the value is
+        missing or blank.
+        """
+        pass
+
+    @abc.abstractmethod
+    def _keys(self) -> Iterable[str]:
+        """
+        Returns the keys (in their canonical kebab-case form) that this layer holds
+        values for. It's fine to include keys that would resolve to blank values.
+        """
+        pass
+
+    @staticmethod
+    @abc.abstractmethod
+    def _convert_string[T](
+        key: str,
+        value: Any,
+        transform: Callable[[str], T] | None,
+    ) -> T:
+        pass
+
+    @staticmethod
+    @abc.abstractmethod
+    def _convert_bool(key: str, value: Any) -> bool:
+        pass
+
+    @staticmethod
+    @abc.abstractmethod
+    def _convert_int(key: str, value: Any) -> int:
+        pass
+
+    @staticmethod
+    @abc.abstractmethod
+    def _convert_string_list[T](
+        key: str,
+        value: Any,
+        transform: Callable[[str], T] | None,
+    ) -> list[T]:
+        pass
+
+    @staticmethod
+    @abc.abstractmethod
+    def _convert_int_list(key: str, value: Any) -> list[int]:
+        pass
+
+    @staticmethod
+    @abc.abstractmethod
+    def _convert_datetime(key: str, value: Any, is_naive: bool) -> datetime:
+        pass
+
+    @staticmethod
+    @abc.abstractmethod
+    def _convert_date(key: str, value: Any) -> date:
+        pass
+
+    @staticmethod
+    @abc.abstractmethod
+    def _convert_time(key: str, value: Any) -> time:
+        pass
+
+    def get_string[T = str](  # type: ignore[override]
+        self,
+        key: str,
+        *,
+        default: T | None = None,
+        required: bool = False,
+        transform: Callable[[str], T] | None = None,
+    ) -> T | None:
+        value = self._lookup(key)
+        if value is None:
+            return self.__parent.get_string(
+                key,
+                default=default,
+                required=required,
+                transform=transform,
+            )
+
+        return self._convert_string(self._full_key(key), value, transform)
+
+    def get_bool(  # type: ignore[override]
+        self,
+        key: str,
+        *,
+        default: bool,
+    ) -> bool:
+        value = self._lookup(key)
+        if value is None:
+            return self.__parent.get_bool(
+                key,
+                default=default,
+            )
+
+        return self._convert_bool(self._full_key(key), value)
+
+    def get_int(  # type: ignore[override]
+        self,
+        key: str,
+        *,
+        default: int | None = None,
+        required: bool = False,
+    ) -> int | None:
+        value = self._lookup(key)
+        if value is None:
+            return self.__parent.get_int(
+                key,
+                default=default,  # type: ignore[arg-type]
+                required=required,
+            )
+
+        return self._convert_int(self._full_key(key), value)
+
+    def get_string_list[T = str](  # type: ignore[override]
+        self,
+        key: str,
+        *,
+        default: list[T] | None = None,
+        required: bool = False,
+        transform: Callable[[str], T] | None = None,
+    ) -> list[T] | None:
+        value = self._lookup(key)
+        if value is None:
+            return self.__parent.get_string_list(
+                key,
+                default=default,  # type: ignore[arg-type]
+                required=required,
+                transform=transform,
+            )
+
+        return self._convert_string_list(self._full_key(key), value, transform)
+
+    def get_int_list(  # type: ignore[override]
+        self,
+        key: str,
+        *,
+        default: list[int] | None = None,
+        required: bool = False,
+    ) -> list[int] | None:
+        value = self._lookup(key)
+        if value is None:
+            return self.__parent.get_int_list(
+                key,
+                default=default,  # type: ignore[arg-type]
+                required=required,
+            )
+
+        return self._convert_int_list(self._full_key(key), value)
+
+    def get_datetime(  # type: ignore[override]
+        self,
+        key: str,
+        *,
+        default: datetime | None = None,
+        required: bool = False,
+        is_naive: bool = False,
+    ) -> datetime | None:
+        value = self._lookup(key)
+        if value is None:
+            return self.__parent.get_datetime(
+                key,
+                default=default,  # type: ignore[arg-type]
+                required=required,
+                is_naive=is_naive,
+            )
+
+        return self._convert_datetime(self._full_key(key), value, is_naive)
+
+    def get_date(  # type: ignore[override]
+        self,
+        key: str,
+        *,
+        default: date | None = None,
+        required: bool = False,
+    ) -> date | None:
+        value = self._lookup(key)
+        if value is None:
+            return self.__parent.get_date(
+                key,
+                default=default,  # type: ignore[arg-type]
+                required=required,
+            )
+
+        return self._convert_date(self._full_key(key), value)
+
+    def get_time(  # type: ignore[override]
+        self,
+        key: str,
+        *,
+        default: time | None = None,
+        required: bool = False,
+    ) -> time | None:
+        value = self._lookup(key)
+        if value is None:
+            return self.__parent.get_time(
+                key,
+                default=default,  # type: ignore[arg-type]
+                required=required,
+            )
+
+        return self._convert_time(self._full_key(key), value)
+
+
+def split_chain(env: Env) -> tuple[list[LayerEnv], Env]:
+    """
+    Splits an Env into its layers (ordered by descending precedence) and the first
+    Env in the parent chain that is not a layer.
+    """
+    layers: list[LayerEnv] = []
+    while isinstance(env, LayerEnv):
+        layers.append(env)
+        env = env.parent
+
+    return layers, env
@@ -0,0 +1,230 @@
+from collections.abc import Callable, Mapping
+from datetime import date, datetime, time, timedelta
+from typing import Any
+
+from bs_config import Env
+from bs_config.key import ConfigKey
+from bs_config.spec import KeySpec
+
+from .layer import LayerEnv
+
+DURATION_FIELDS = (
+    "weeks",
+    "days",
+    "hours",
+    "minutes",
+    "seconds",
+    "milliseconds",
+    "microseconds",
+)
+
+type _Converter = Callable[[LayerEnv, str, Any, KeySpec], Any]
+type _Getter = Callable[[Env, str, KeySpec], Any]
+
+ACCESSORS: dict[Any, tuple[str, _Converter, _Getter]] = {
+    str: (
+        "get_string",
+        lambda layer, key, value, spec: layer._convert_string(
+            key, value, spec.transform
+        ),
+        lambda env, key, spec: env.get_string(
+            key,
+            default=spec.default,
+            required=spec.required,
+            transform=spec.transform,
+        ),
+    ),
+    bool: (
+        "get_bool",
+        lambda layer, key, value, spec: layer._convert_bool(key, value),
+        lambda env, key, spec: env.get_bool(key, default=bool(spec.default)),
+    ),
+    int: (
+        "get_int",
+        lambda layer, key, value, spec: layer._convert_int(key, value),
+        lambda env, key, spec: env.get_int(
+            key,
+            default=spec.default,
+            required=spec.required,
+        ),
+    ),
+    list[str]: (
+        "get_string_list",
+        lambda layer, key, value, spec: layer._convert_string_list(
+            key, value, spec.transform
+        ),
+        lambda env, key, spec: env.get_string_list(
+            key,
+            default=spec.default,
+            required=spec.required,
+            transform=spec.transform,
+        ),
+    ),
+    list[int]: (
+        "get_int_list",
+        lambda layer, key, value, spec: layer._convert_int_list(key, value),
+        lambda env, key, spec: env.get_int_list(
+            key,
+            default=spec.default,
+            required=spec.required,
+        ),
+    ),
+    datetime: (
+        "get_datetime",
+        lambda layer, key, value, spec: layer._convert_datetime(
+            key, value, spec.is_naive
+        ),
+        lambda env, key, spec: env.get_datetime(
+            key,
+            default=spec.default,
+            required=spec.required,
+            is_naive=spec.is_naive,
+        ),
+    ),
+    date: (
+        "get_date",
+        lambda layer, key, value, spec: layer._convert_date(key, value),
+        lambda env, key, spec: env.get_date(
+            key,
+            default=spec.default,
+            required=spec.required,
+        ),
+    ),
+    time: (
+        "get_time",
+        lambda layer, key, value, spec: layer._convert_time(key, value),
+        lambda env, key, spec: env.get_time(
+            key,
+            default=spec.default,
+            required=spec.required,
+        ),
+    ),
+}
+
+_INT_SPEC = KeySpec(int)
+_, _INT_CONVERTER, _INT_GETTER = ACCESSORS[int]
+
+
+def normalize_spec(
+    spec: Mapping[str, KeySpec | tuple[Any, ...]],
+) -> dict[str, KeySpec]:
+    result: dict[str, KeySpec] = {}
+    for key, key_spec in spec.items():
+        if not isinstance(key_spec, KeySpec):
+            key_spec = KeySpec(*key_spec)
+
+        if key_spec.type is not timedelta and key_spec.type not in ACCESSORS:
+            raise ValueError(f"Unsupported type {key_spec.type} for key {key}")
+
+        if key_spec.type is bool and key_spec.required:
+            raise ValueError(f"Bool values can't be required (key {key})")
+
+        result[key] = key_spec
+
+    return result
+
+
+class CompiledSpec:
+    """
+    A batch lookup spec with the keys to look up and the converter and getter of
+    each value precomputed, so repeated lookups of the same spec don't repeat that
+    work.
+    """
+
+    __slots__ = ("__fields", "__lookup_keys")
+
+    def __init__(self, specs: dict[str, KeySpec]) -> None:
+        """
+        Args:
+            specs: a normalized spec, see ``normalize_spec()``
+        """
+        lookup_keys: list[str] = []
+        # The key, its spec, the converter and getter for the value, and the keys of
+        # the fields of durations
+        fields: list[tuple[str, KeySpec, _Converter, _Getter, tuple[str, ...]]] = []
+        for key, key_spec in specs.items():
+            if key_spec.type is timedelta:
+                parts = tuple(f"{key}.{field}" for field in DURATION_FIELDS)
+                if isinstance(key, ConfigKey):
+                    parts = tuple(ConfigKey(part) for part in parts)
+                lookup_keys.extend(parts)
+                fields.append((key, key_spec, _INT_CONVERTER, _INT_GETTER, parts))
+            else:
+                _, converter, getter = ACCESSORS[key_spec.type]
+                lookup_keys.append(key)
+                fields.append((key, key_spec, converter, getter, ()))
+
+        self.__lookup_keys = tuple(lookup_keys)
+        self.__fields = tuple(fields)
+
+    def resolve(self, env: Env) -> dict[str, Any]:
+        """
+        Raises:
+            ValueError: If any of the values is invalid or missing but required. The
+                error message lists all affected keys.
+        """
+        resolved, failed, fallback = env._resolve_many(self.__lookup_keys)
+
+        def _get(
+            key: str,
+            key_spec: KeySpec,
+            converter: _Converter,
+            getter: _Getter,
+        ) -> Any:
+            error = failed.get(key)
+            if error is not None:
+                raise error
+
+            entry = resolved.get(key)
+            if entry is None:
+                return getter(fallback, key, key_spec)
+
+            value, layer = entry
+            return converter(layer, layer._full_key(key), value, key_spec)
+
+        def _get_duration(
+            key: str,
+            key_spec: KeySpec,
+            parts: tuple[str, ...],
+        ) -> timedelta | None:
+            values = [
+                _get(part, _INT_SPEC, _INT_CONVERTER, _INT_GETTER) for part in parts
+            ]
+            if all(value is None for value in values):
+                if key_spec.required and key_spec.default is None:
+                    raise ValueError(f"Missing duration under scope-key {key}")
+
+                return key_spec.default  # type: ignore[no-any-return]
+
+            return timedelta(
+                **{
+                    field: value or 0
+                    for field, value in zip(DURATION_FIELDS, values, strict=True)
+                }
+            )
+
+        result: dict[str, Any] = {}
+        errors: dict[str, ValueError] = {}
+        for key, key_spec, converter, getter, parts in self.__fields:
+            try:
+                if parts:
+                    result[key] = _get_duration(key, key_spec, parts)
+                else:
+                    result[key] = _get(key, key_spec, converter, getter)
+            except ValueError as e:
+                errors[key] = e
+
+        if errors:
+            details = "\n".join(f"- {key}: {error}" for key, error in errors.items())
+            raise ValueError(
+                f"Could not resolve {len(errors)} config values:\n{details}"
+            )
+
+        return result
+
+
+def get_many(
+    env: Env,
+    spec: Mapping[str, KeySpec | tuple[Any, ...]],
+) -> dict[str, Any]:
+    return CompiledSpec(normalize_spec(spec)).resolve(env)
@@ -0,0 +1,35 @@
+import sys
+from typing import Any
+
+from bs_config import Env
+
+
+class Sizer:
+    """
+    Measures the deep size of values, counting every object only once across all
+    calls on the same instance.
+    """
+
+    def __init__(self) -> None:
+        self.__seen: set[int] = set()
+
+    def size(self, value: Any) -> int:
+        seen = self.__seen
+        total = 0
+        pending = [value]
+        while pending:
+            item = pending.pop()
+            # Other Envs and functions (like transforms in cache keys) are referenced,
+            # not retained
+            if isinstance(item, Env) or callable(item) or id(item) in seen:
+                continue
+
+            seen.add(id(item))
+            total += sys.getsizeof(item)
+            if isinstance(item, dict):
+                pending.extend(item.keys())
+                pending.extend(item.values())
+            elif isinstance(item, list | tuple | set | frozenset):
+                pending.extend(item)
+
+        return total
@@ -0,0 +1,534 @@
+import logging
+from collections.abc import Callable, Mapping, Sequence
+from datetime import date, datetime, time, timedelta
+from random import random
+from time import perf_counter_ns
+from typing import TYPE_CHECKING, Any, Self
+
+from bs_config import Env
+from bs_config.resolution import Observer, Resolution
+
+from .default import DefaultEnv
+from .layer import LayerEnv, split_chain
+from .many import DURATION_FIELDS
+
+if TYPE_CHECKING:
+    from bs_config.memory import MemoryUsage
+
+    from .memory import Sizer
+
+_logger = logging.getLogger(__name__)
+
+type _Entry = tuple[Any, LayerEnv] | None
+
+
+class Observers:
+    """
+    The observers registered on an observed Env and all Envs scoped from it.
+    """
+
+    def __init__(self) -> None:
+        self.__entries: tuple[tuple[Observer, float], ...] = ()
+        # Derived from the entries and replaced as a whole on every change, so readers
+        # never need a lock
+        self.__always: tuple[Observer, ...] = ()
+        self.__sampled: tuple[tuple[Observer, float], ...] = ()
+
+    def add(self, observer: Observer, sample_rate: float) -> None:
+        if not 0 < sample_rate <= 1:
+            raise ValueError("sample_rate must be in (0, 1]")
+
+        self._set_entries((*self.__entries, (observer, sample_rate)))
+
+    def remove(self, observer: Observer) -> None:
+        entries = self.__entries
+        remaining = tuple(entry for entry in entries if entry[0] != observer)
+        if len(remaining) == len(entries):
+            raise ValueError("Observer is not registered")
+
+        self._set_entries(remaining)
+
+    def _set_entries(self, entries: tuple[tuple[Observer, float], ...]) -> None:
+        self.__entries = entries
+        self.__always = tuple(observer for observer, rate in entries if rate >= 1)
+        self.__sampled = tuple(entry for entry in entries if entry[1] < 1)
+
+    def sample(self) -> Sequence[Observer]:
+        """
+        Decides which observers are notified about the next call.
+        """
+        sampled = self.__sampled
+        if not sampled:
+            return self.__always
+
+        chosen = [observer for observer, rate in sampled if random() < rate]
+        if not chosen:
+            return self.__always
+
+        return [*self.__always, *chosen]
+
+
+def _get_duration(
+    resolved: Mapping[str, tuple[Any, LayerEnv]],
+    fallback: Env,
+    key: str,
+    default: timedelta | None,
+    required: bool,
+) -> timedelta | None:
+    parts: dict[str, int | None] = {}
+    for field in DURATION_FIELDS:
+        entry = resolved.get(field)
+        if entry is None:
+            parts[field] = fallback.get_int(field)
+        else:
+            value, layer = entry
+            parts[field] = layer._convert_int(layer._full_key(field), value)
+
+    if all(value is None for value in parts.values()):
+        if required and default is None:
+            raise ValueError(f"Missing duration under scope-key {key}")
+
+        return default
+
+    return timedelta(**{field: value or 0 for field, value in parts.items()})
+
+
+class ObservedEnv(Env):
+    """
+    Notifies observers after every getter call. Calls that no observer samples are
+    passed straight to the wrapped Env. Scoped instances share the observers of the
+    instance they were created from.
+    """
+
+    def __init__(
+        self,
+        source: Env,
+        observers: Observers | None = None,
+        prefix: str | None = None,
+    ) -> None:
+        self.__source = source
+        self.__observers = Observers() if observers is None else observers
+        self.__prefix = prefix
+        # The layers of a chain never change (only their values), so they are only
+        # collected once instead of on every call
+        self.__layers, self.__fallback = split_chain(source)
+        # Wrapped Envs that don't resolve keys themselves (like caches or other
+        # observed Envs) are read through, so their behavior is kept. The source of
+        # the value is then looked up separately.
+        self.__opaque = (
+            not self.__layers and type(source)._resolve_many is Env._resolve_many
+        )
+
+    def observe(self, observer: Observer, *, sample_rate: float = 1.0) -> Self:
+        """
+        Registers another observer on this instance, see ``Env.observe()``.
+        """
+        self.__observers.add(observer, sample_rate)
+        return self
+
+    def remove_observer(self, observer: Observer) -> None:
+        """
+        Unregisters an observer that was registered using ``observe()``.
+
+        Raises:
+            ValueError: if the observer is not registered
+        """
+        self.__observers.remove(observer)
+
+    def _unwrap(self) -> Env:
+        return self.__source._unwrap()
+
+    def _subscribe(self, callback: Callable[[], None]) -> None:
+        self.__source._subscribe(callback)
+
+    def _source_name(self, key: str) -> str | None:
+        return self.__source._source_name(key)
+
+    def _memory_usage(self, sizer: "Sizer") -> list["MemoryUsage"]:
+        usage = self.__source._memory_usage(sizer)
+        # Scoped instances share the state of the instance they were created from
+        if self.__prefix is not None:
+            return usage
+
+        return [*self._state_memory_usage(sizer), *usage]
+
+    def _state_memory_usage(self, sizer: "Sizer") -> list["MemoryUsage"]:
+        """
+        Measures the memory retained by state that is shared with scoped instances,
+        like recorded metrics.
+        """
+        return []
+
+    def _scope(self, key: str) -> Env:
+        return self._create(self.__source / key, self.__observers, self._full_key(key))
+
+    def _create(self, source: Env, observers: Observers, prefix: str) -> Self:
+        """
+        Creates a new scoped instance of the same type.
+        """
+        return type(self)(source, observers, prefix)
+
+    def _full_key(self, key: str) -> str:
+        if self.__prefix is None:
+            return key
+
+        return f"{self.__prefix}.{key}"
+
+    def _resolve(self, key: str) -> tuple[_Entry, Env]:
+        layers = self.__layers
+        if layers:
+            for layer in layers:
+                value = layer._lookup(key)
+                if value is not None:
+                    return (value, layer), self.__fallback
+
+            return None, self.__fallback
+
+        resolved, failed, fallback = self.__source._resolve_many((key,))
+        error = failed.get(key)
+        if error is not None:
+            raise error
+
+        return resolved.get(key), fallback
+
+    def _observe[R](
+        self,
+        observers: Sequence[Observer],
+        key: str,
+        accessor: str,
+        convert: Callable[[Any, LayerEnv], R],
+        get_default: Callable[[Env], R],
+        resolve: Callable[[], tuple[_Entry, Env]] | None = None,
+        source_name: Callable[[], str | None] | None = None,
+    ) -> R:
+        started = perf_counter_ns()
+        result: R | None = None
+        source: str | None = None
+        error: Exception | None = None
+        try:
+            if self.__opaque:
+                source = (
+                    self.__source._source_name(key)
+                    if source_name is None
+                    else source_name()
+                )
+                result = get_default(self.__source)
+                return result
+
+            entry, fallback = self._resolve(key) if resolve is None else resolve()
+            if entry is None:
+                source = "default" if isinstance(fallback, DefaultEnv) else "fallback"
+                result = get_default(fallback)
+            else:
+                value, layer = entry
+                source = layer.name
+                result = convert(value, layer)
+
+            return result
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            # Positional arguments are notably faster for NamedTuples
+            resolution = Resolution(
+                self._full_key(key),
+                accessor,
+                result,
+                source,
+                source == "default",
+                (perf_counter_ns() - started) / 1e9,
+                error,
+            )
+            for observer in observers:
+                try:
+                    observer(resolution)
+                except Exception:
+                    _logger.exception("Observer %r failed", observer)
+
+    def get_string[T = str](  # type: ignore[override]
+        self,
+        key: str,
+        *,
+        default: T | None = None,
+        required: bool = False,
+        transform: Callable[[str], T] | None = None,
+    ) -> T | None:
+        observers = self.__observers.sample()
+        if not observers:
+            return self.__source.get_string(
+                key,
+                default=default,
+                required=required,
+                transform=transform,
+            )
+
+        return self._observe(
+            observers,
+            key,
+            "get_string",
+            lambda value, layer: layer._convert_string(
+                layer._full_key(key), value, transform
+            ),
+            lambda env: env.get_string(
+                key,
+                default=default,
+                required=required,
+                transform=transform,
+            ),
+        )
+
+    def get_bool(  # type: ignore[override]
+        self,
+        key: str,
+        *,
+        default: bool,
+    ) -> bool:
+        observers = self.__observers.sample()
+        if not observers:
+            return self.__source.get_bool(key, default=default)
+
+        return self._observe(
+            observers,
+            key,
+            "get_bool",
+            lambda value, layer: layer._convert_bool(layer._full_key(key), value),
+            lambda env: env.get_bool(key, default=default),
+        )
+
+    def get_int(  # type: ignore[override]
+        self,
+        key: str,
+        *,
+        default: int | None = None,
+        required: bool = False,
+    ) -> int | None:
+        observers = self.__observers.sample()
+        if not observers:
+            return self.__source.get_int(
+                key,
+                default=default,  # type: ignore[arg-type]
+                required=required,
+            )
+
+        return self._observe(
+            observers,
+            key,
+            "get_int",
+            lambda value, layer: layer._convert_int(layer._full_key(key), value),
+            lambda env: env.get_int(
+                key,
+                default=default,  # type: ignore[arg-type]
+                required=required,
+            ),
+        )
+
+    def get_string_list[T = str](  # type: ignore[override]
+        self,
+        key: str,
+        *,
+        default: list[T] | None = None,
+        required: bool = False,
+        transform: Callable[[str], T] | None = None,
+    ) -> list[T] | None:
+        observers = self.__observers.sample()
+        if not observers:
+            return self.__source.get_string_list(
+                key,
+                default=default,  # type: ignore[arg-type]
+                required=required,
+                transform=transform,
+            )
+
+        return self._observe(
+            observers,
+            key,
+            "get_string_list",
+            lambda value, layer: layer._convert_string_list(
+                layer._full_key(key), value, transform
+            ),
+            lambda env: env.get_string_list(
+                key,
+                default=default,  # type: ignore[arg-type]
+                required=required,
+                transform=transform,
+            ),
+        )
+
+    def get_int_list(  # type: ignore[override]
+        self,
+        key: str,
+        *,
+        default: list[int] | None = None,
+        required: bool = False,
+    ) -> list[int] | None:
+        observers = self.__observers.sample()
+        if not observers:
+            return self.__source.get_int_list(
+                key,
+                default=default,  # type: ignore[arg-type]
+                required=required,
+            )
+
+        return self._observe(
+            observers,
+            key,
+            "get_int_list",
+            lambda value, layer: layer._convert_int_list(layer._full_key(key), value),
+            lambda env: env.get_int_list(
+                key,
+                default=default,  # type: ignore[arg-type]
+                required=required,
+            ),
+        )
+
+    def get_datetime(  # type: ignore[override]
+        self,
+        key: str,
+        *,
+        default: datetime | None = None,
+        required: bool = False,
+        is_naive: bool = False,
+    ) -> datetime | None:
+        observers = self.__observers.sample()
+        if not observers:
+            return self.__source.get_datetime(
+                key,
+                default=default,  # type: ignore[arg-type]
+                required=required,
+                is_naive=is_naive,
+            )
+
+        return self._observe(
+            observers,
+            key,
+            "get_datetime",
+            lambda value, layer: layer._convert_datetime(
+                layer._full_key(key), value, is_naive
+            ),
+            lambda env: env.get_datetime(
+                key,
+                default=default,  # type: ignore[arg-type]
+                required=required,
+                is_naive=is_naive,
+            ),
+        )
+
+    def get_date(  # type: ignore[override]
+        self,
+        key: str,
+        *,
+        default: date | None = None,
+        required: bool = False,
+    ) -> date | None:
+        observers = self.__observers.sample()
+        if not observers:
+            return self.__source.get_date(
+                key,
+                default=default,  # type: ignore[arg-type]
+                required=required,
+            )
+
+        return self._observe(
+            observers,
+            key,
+            "get_date",
+            lambda value, layer: layer._convert_date(layer._full_key(key), value),
+            lambda env: env.get_date(
+                key,
+                default=default,  # type: ignore[arg-type]
+                required=required,
+            ),
+        )
+
+    def get_time(  # type: ignore[override]
+        self,
+        key: str,
+        *,
+        default: time | None = None,
+        required: bool = False,
+    ) -> time | None:
+        observers = self.__observers.sample()
+        if not observers:
+            return self.__source.get_time(
+                key,
+                default=default,  # type: ignore[arg-type]
+                required=required,
+            )
+
+        return self._observe(
+            observers,
+            key,
+            "get_time",
+            lambda value, layer: layer._convert_time(layer._full_key(key), value),
+            lambda env: env.get_time(
+                key,
+                default=default,  # type: ignore[arg-type]
+                required=required,
+            ),
+        )
+
+    def get_duration(  # type: ignore[override]
+        self,
+        key: str,
+        *,
+        default: timedelta | None = None,
+        required: bool = False,
+    ) -> timedelta | None:
+        observers = self.__observers.sample()
+        if not observers:
+            return self.__source.get_duration(
+                key,
+                default=default,
+                required=required,
+            )
+
+        # Observed as a single call, served by the layer holding the first set field
+        fields: list[tuple[dict[str, tuple[Any, LayerEnv]], Env]] = []
+
+        def _resolve() -> tuple[_Entry, Env]:
+            resolved, failed, fallback = (self.__source / key)._resolve_many(
+                DURATION_FIELDS
+            )
+            for error in failed.values():
+                raise error
+
+            fields.append((resolved, fallback))
+            entry = next(
+                (resolved[field] for field in DURATION_FIELDS if field in resolved),
+                None,
+            )
+            return entry, fallback
+
+        def _source_name() -> str | None:
+            # Like a resolved duration, named after the source of the first set field
+            names = [
+                self.__source._source_name(f"{key}.{field}")
+                for field in DURATION_FIELDS
+            ]
+            return next(
+                (name for name in names if name not in ("default", "fallback")),
+                names[0],
+            )
+
+        if self.__opaque:
+            return self._observe(
+                observers,
+                key,
+                "get_duration",
+                lambda value, layer: None,
+                lambda env: env.get_duration(
+                    key,
+                    default=default,
+                    required=required,
+                ),
+                source_name=_source_name,
+            )
+
+        return self._observe(
+            observers,
+            key,
+            "get_duration",
+            lambda value, layer: _get_duration(*fields[0], key, default, required),
+            lambda env: _get_duration(*fields[0], key, default, required),
+            _resolve,
+        )
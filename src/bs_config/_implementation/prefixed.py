@@ -0,0 +1,48 @@
+from collections.abc import Iterator, Mapping
+
+
+class PrefixedView(Mapping[str, str]):
+    """
+    A read-only view of the entries of a mapping whose names start with a prefix, with
+    the prefix removed. Reads go straight through to the underlying mapping, so the
+    view reflects later changes to it.
+    """
+
+    __slots__ = ("__prefix", "__source")
+
+    def __init__(self, source: Mapping[str, str], prefix: str) -> None:
+        self.__source = source
+        self.__prefix = prefix
+
+    def __getitem__(self, name: str) -> str:
+        return self.__source[self.__prefix + name]
+
+    def get(self, name: str, default: str | None = None) -> str | None:  # type: ignore[override]
+        return self.__source.get(self.__prefix + name, default)
+
+    def __contains__(self, name: object) -> bool:
+        return isinstance(name, str) and self.__prefix + name in self.__source
+
+    def __iter__(self) -> Iterator[str]:
+        prefix = self.__prefix
+        prefix_length = len(prefix)
+        for name in self.__source:
+            if name.startswith(prefix):
+                yield name[prefix_length:]
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def _view(self, prefix: str) -> "PrefixedView":
+        return PrefixedView(self.__source, self.__prefix + prefix)
+
+
+def prefixed_view(source: Mapping[str, str], prefix: str) -> PrefixedView:
+    """
+    Creates a view of the entries of ``source`` starting with ``prefix``. Views of
+    views are flattened, so lookups always go straight to the underlying mapping.
+    """
+    if isinstance(source, PrefixedView):
+        return source._view(prefix)
+
+    return PrefixedView(source, prefix)
@@ -1,8 +1,14 @@
 from collections.abc import Callable
 from datetime import date, datetime, time
+from typing import TYPE_CHECKING
 
 from bs_config import Env
 
+if TYPE_CHECKING:
+    from bs_config.memory import MemoryUsage
+
+    from .memory import Sizer
+
 
 class ScopedEnv(Env):
     def __init__(self, parent: Env, prefix: str) -> None:
@@ -11,6 +17,23 @@ class ScopedEnv(Env):
         self.__parent = parent
         self.__prefix = prefix
 
+    def _scope(self, key: str) -> Env:
+        # Collapse nested scopes into a single instance
+        return self.__parent / f"{self.__prefix}.{key}"
+
+    def _unwrap(self) -> Env:
+        return self.__parent._unwrap()
+
+    def _subscribe(self, callback: Callable[[], None]) -> None:
+        self.__parent._subscribe(callback)
+
+    def _source_name(self, key: str) -> str | None:
+        return self.__parent._source_name(f"{self.__prefix}.{key}")
+
+    def _memory_usage(self, sizer: "Sizer") -> list["MemoryUsage"]:
+        # Only reads through the parent, whose memory is reported with the parent
+        return []
+
     def get_string[T = str](  # type: ignore[override]
         self,
         key: str,
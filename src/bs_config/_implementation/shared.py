@@ -0,0 +1,83 @@
+import weakref
+from multiprocessing.shared_memory import SharedMemory
+from types import TracebackType
+from typing import Self
+
+from bs_config import Env
+
+from .snapshot import SnapshotEnv
+
+
+class SharedSnapshot:
+    """
+    A snapshot of the values of an Env in a shared memory block, see ``Env.share()``.
+    The block is removed once ``close()`` is called, or when the creating process
+    exits. Processes that already attached to it keep their view.
+    """
+
+    def __init__(self, data: bytes) -> None:
+        self.__memory = SharedMemory(create=True, size=len(data))
+        self.__memory.buf[: len(data)] = data  # type: ignore[index]
+        self.__size = len(data)
+        self.__closed = False
+
+    @property
+    def name(self) -> str:
+        """
+        The name to pass to ``Env.attach()``.
+        """
+        return self.__memory.name
+
+    @property
+    def size(self) -> int:
+        """
+        The size of the snapshot in bytes.
+        """
+        return self.__size
+
+    def close(self) -> None:
+        """
+        Removes the shared memory block. Envs that are already attached to it stay
+        usable, but no further processes can attach.
+        """
+        if self.__closed:
+            return
+
+        self.__closed = True
+        self.__memory.close()
+        self.__memory.unlink()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+
+def _detach(memory: SharedMemory, view: memoryview) -> None:
+    # The block can only be unmapped once no views of it exist anymore
+    view.release()
+    memory.close()
+
+
+class _Attachment:
+    """
+    Keeps a shared memory block mapped as long as an Env reads from it.
+    """
+
+    def __init__(self, name: str) -> None:
+        # Only the creating process may remove the block, so it must not be tracked
+        # (and removed on exit) by attaching processes
+        memory = SharedMemory(name=name, track=False)
+        self.view = memory.buf.toreadonly()  # type: ignore[union-attr]
+        weakref.finalize(self, _detach, memory, self.view)
+
+
+def attach(name: str, fallback: Env) -> Env:
+    attachment = _Attachment(name)
+    return SnapshotEnv.open(attachment.view, fallback, owner=attachment)
@@ -0,0 +1,481 @@
+import struct
+import warnings
+from collections.abc import Callable
+from datetime import date, datetime, time
+from typing import TYPE_CHECKING, Any
+from zlib import crc32
+
+from bs_config import Env
+
+from .compiled import CompiledEnv
+from .default import DefaultEnv
+from .direnv import DirenvEnv
+from .frozen import collect_layers, resolve_variant
+from .layer import LayerEnv
+from .toml import TomlEnv
+
+if TYPE_CHECKING:
+    from bs_config.memory import MemoryUsage
+
+    from .memory import Sizer
+
+# Layout of a snapshot (all integers little-endian):
+#
+#   header  magic, format version, number of slots, number of entries
+#   slots   open addressing hash table over the keys, probed linearly. Each slot
+#           holds the CRC32 of the key and offset/length pairs of the key, the key
+#           used in error messages and the value. Empty slots have a value length
+#           of 0.
+#   data    the UTF-8 encoded keys and the tagged values the slots point to
+#
+# Offsets are relative to the start of the snapshot.
+_MAGIC = b"BSCF"
+# Increment whenever the layout or the value encoding changes
+_VERSION = 1
+_HEADER = struct.Struct("<4sIII")
+_SLOT = struct.Struct("<IIIIIII")
+_LENGTH = struct.Struct("<I")
+_FLOAT = struct.Struct("<d")
+
+# The first byte of every value. Raw environment values are converted like
+# DirenvEnv values, all others like TomlEnv values.
+_TAG_ENVIRON = 1
+_TAG_STRING = 2
+_TAG_BOOL = 3
+_TAG_INT = 4
+_TAG_FLOAT = 5
+_TAG_DATETIME = 6
+_TAG_DATE = 7
+_TAG_TIME = 8
+_TAG_LIST = 9
+_TAG_TABLE = 10
+
+type _Entry = tuple[Any, type[LayerEnv], str]
+
+
+def _encode_value(value: Any) -> bytes:
+    # bool is a subtype of int and datetime a subtype of date, so order matters
+    if isinstance(value, str):
+        return bytes((_TAG_STRING,)) + value.encode()
+    if isinstance(value, bool):
+        return bytes((_TAG_BOOL, value))
+    if isinstance(value, int):
+        # TOML doesn't restrict the size of integers in a way every parser respects
+        return bytes((_TAG_INT,)) + str(value).encode()
+    if isinstance(value, float):
+        return bytes((_TAG_FLOAT,)) + _FLOAT.pack(value)
+    if isinstance(value, datetime):
+        return bytes((_TAG_DATETIME,)) + value.isoformat().encode()
+    if isinstance(value, date):
+        return bytes((_TAG_DATE,)) + value.isoformat().encode()
+    if isinstance(value, time):
+        return bytes((_TAG_TIME,)) + value.isoformat().encode()
+    if isinstance(value, (list, tuple)):
+        parts = [bytes((_TAG_LIST,)), _LENGTH.pack(len(value))]
+        for item in value:
+            encoded = _encode_value(item)
+            parts.append(_LENGTH.pack(len(encoded)))
+            parts.append(encoded)
+        return b"".join(parts)
+    if isinstance(value, dict):
+        # Tables can't be read as values, only the error message needs their type
+        return bytes((_TAG_TABLE,))
+
+    raise ValueError(f"Can't serialize value of type {type(value)}")
+
+
+def _decode_value(view: memoryview, offset: int, length: int) -> Any:
+    tag = view[offset]
+    payload = view[offset + 1 : offset + length]
+    if tag == _TAG_ENVIRON or tag == _TAG_STRING:
+        return str(payload, "utf-8")
+    if tag == _TAG_BOOL:
+        return payload[0] == 1
+    if tag == _TAG_INT:
+        return int(str(payload, "ascii"))
+    if tag == _TAG_FLOAT:
+        return _FLOAT.unpack(payload)[0]
+    if tag == _TAG_DATETIME:
+        return datetime.fromisoformat(str(payload, "ascii"))
+    if tag == _TAG_DATE:
+        return date.fromisoformat(str(payload, "ascii"))
+    if tag == _TAG_TIME:
+        return time.fromisoformat(str(payload, "ascii"))
+    if tag == _TAG_LIST:
+        (count,) = _LENGTH.unpack_from(view, offset + 1)
+        position = offset + 1 + _LENGTH.size
+        items = []
+        for _ in range(count):
+            (item_length,) = _LENGTH.unpack_from(view, position)
+            position += _LENGTH.size
+            items.append(_decode_value(view, position, item_length))
+            position += item_length
+        return items
+    if tag == _TAG_TABLE:
+        return {}
+
+    raise ValueError(f"Invalid value tag {tag} in snapshot")
+
+
+def encode_snapshot(env: Env, *, include_env: bool) -> bytes:
+    """
+    Serializes the resolved values of all layers of an Env, by the same rules as
+    ``Env.freeze()``.
+
+    Args:
+        env: the Env to serialize
+        include_env: whether to include the values of ``os.environ`` layers.
+            Otherwise, the values of lower layers are used for their keys.
+
+    Raises:
+        ValueError: if the Env falls back to an Env that isn't made of layers, or a
+            value can't be serialized
+    """
+    layers, fallback = collect_layers(env)
+    if not isinstance(fallback, DefaultEnv):
+        raise ValueError(f"Can't serialize values of {type(fallback).__name__}")
+
+    if not include_env:
+        layers = [layer for layer in layers if layer.name != "environ"]
+
+    entries: list[tuple[bytes, bytes, bytes]] = []
+    for key, entry in sorted(CompiledEnv._build_index(layers, complete=True).items()):
+        if entry is None:
+            continue
+
+        value, layer = entry
+        if isinstance(layer, DirenvEnv):
+            encoded = bytes((_TAG_ENVIRON,)) + value.encode()
+        elif isinstance(layer, TomlEnv):
+            encoded = _encode_value(value)
+        else:
+            raise ValueError(f"Can't serialize values of {type(layer).__name__}")
+
+        entries.append((key.encode(), layer._full_key(key).encode(), encoded))
+
+    # At most half of the slots are used, so probe sequences stay short
+    slot_count = 8
+    while slot_count < 2 * len(entries):
+        slot_count *= 2
+    mask = slot_count - 1
+
+    slots: list[tuple[int, ...] | None] = [None] * slot_count
+    data = bytearray()
+    data_offset = _HEADER.size + slot_count * _SLOT.size
+    for encoded_key, error_key, value in entries:
+        key_offset = data_offset + len(data)
+        data += encoded_key
+        if error_key == encoded_key:
+            error_key_offset = key_offset
+        else:
+            error_key_offset = data_offset + len(data)
+            data += error_key
+        value_offset = data_offset + len(data)
+        data += value
+
+        key_hash = crc32(encoded_key)
+        index = key_hash & mask
+        while slots[index] is not None:
+            index = (index + 1) & mask
+        slots[index] = (
+            key_hash,
+            key_offset,
+            len(encoded_key),
+            error_key_offset,
+            len(error_key),
+            value_offset,
+            len(value),
+        )
+
+    result = bytearray(_HEADER.pack(_MAGIC, _VERSION, slot_count, len(entries)))
+    empty = _SLOT.pack(0, 0, 0, 0, 0, 0, 0)
+    for slot in slots:
+        result += empty if slot is None else _SLOT.pack(*slot)
+    result += data
+    return bytes(result)
+
+
+class SnapshotEnv(Env):
+    """
+    Reads values directly from a serialized snapshot (see ``encode_snapshot()``),
+    without deserializing it as a whole. Only the value of the requested key is
+    decoded on each lookup, and then converted like the layer it came from would.
+    """
+
+    def __init__(
+        self,
+        view: memoryview,
+        mask: int,
+        fallback: Env,
+        prefix: str | None = None,
+        owner: object = None,
+    ) -> None:
+        self.__view = view
+        self.__mask = mask
+        self.__fallback = fallback
+        self.__prefix = prefix
+        # Keeps the memory backing the view alive, shared by all scoped instances
+        self.__owner = owner
+
+    @classmethod
+    def open(
+        cls,
+        view: memoryview,
+        fallback: Env,
+        owner: object = None,
+    ) -> "SnapshotEnv":
+        """
+        Raises:
+            ValueError: if the view doesn't contain a snapshot of a supported version
+        """
+        if len(view) < _HEADER.size:
+            raise ValueError("Not a config snapshot")
+
+        magic, version, slot_count, _ = _HEADER.unpack_from(view)
+        if magic != _MAGIC:
+            raise ValueError("Not a config snapshot")
+        if version != _VERSION:
+            raise ValueError(f"Unsupported config snapshot version {version}")
+        if len(view) < _HEADER.size + slot_count * _SLOT.size:
+            raise ValueError("Truncated config snapshot")
+
+        return cls(view, slot_count - 1, fallback, owner=owner)
+
+    def compile(self) -> Env:
+        return self
+
+    def _memory_usage(self, sizer: "Sizer") -> list["MemoryUsage"]:
+        from bs_config.memory import MemoryUsage
+
+        usage = self.__fallback._memory_usage(sizer)
+        # Scoped instances share the mapped memory, it's only reported once
+        if self.__prefix is not None:
+            return usage
+
+        _, _, _, count = _HEADER.unpack_from(self.__view)
+        return [
+            MemoryUsage(
+                "snapshot",
+                "SnapshotEnv",
+                None,
+                count,
+                count,
+                len(self.__view),
+            ),
+            *usage,
+        ]
+
+    def _scope(self, key: str) -> Env:
+        return SnapshotEnv(
+            self.__view,
+            self.__mask,
+            self.__fallback / key,
+            self._full_key(key),
+            self.__owner,
+        )
+
+    def _full_key(self, key: str) -> str:
+        if self.__prefix is None:
+            return key
+
+        return f"{self.__prefix}.{key}"
+
+    def _resolve(self, key: str) -> _Entry | None:
+        full_key = key if self.__prefix is None else f"{self.__prefix}.{key}"
+        entry = self._find(full_key)
+        if entry is None:
+            if full_key != full_key.lower() or "_" in full_key:
+                return resolve_variant(full_key, self._find)
+        elif full_key != full_key.lower():
+            # Like the layers do when looking up the key
+            warnings.warn("Keys should use kebab-case")
+
+        return entry
+
+    def _find(self, full_key: str) -> _Entry | None:
+        encoded = full_key.encode()
+        key_hash = crc32(encoded)
+        view = self.__view
+        mask = self.__mask
+        index = key_hash & mask
+        while True:
+            (
+                slot_hash,
+                key_offset,
+                key_length,
+                error_key_offset,
+                error_key_length,
+                value_offset,
+                value_length,
+            ) = _SLOT.unpack_from(view, _HEADER.size + index * _SLOT.size)
+            if not value_length:
+                return None
+
+            if (
+                slot_hash == key_hash
+                and view[key_offset : key_offset + key_length].tobytes() == encoded
+            ):
+                break
+
+            index = (index + 1) & mask
+
+        layer_type: type[LayerEnv] = (
+            DirenvEnv if view[value_offset] == _TAG_ENVIRON else TomlEnv
+        )
+        value = _decode_value(view, value_offset, value_length)
+        if error_key_offset == key_offset:
+            error_key = full_key
+        else:
+            error_key = str(
+                view[error_key_offset : error_key_offset + error_key_length], "utf-8"
+            )
+
+        return value, layer_type, error_key
+
+    def get_string[T = str](  # type: ignore[override]
+        self,
+        key: str,
+        *,
+        default: T | None = None,
+        required: bool = False,
+        transform: Callable[[str], T] | None = None,
+    ) -> T | None:
+        entry = self._resolve(key)
+        if entry is None:
+            return self.__fallback.get_string(
+                key,
+                default=default,
+                required=required,
+                transform=transform,
+            )
+
+        value, layer, error_key = entry
+        return layer._convert_string(error_key, value, transform)
+
+    def get_bool(  # type: ignore[override]
+        self,
+        key: str,
+        *,
+        default: bool,
+    ) -> bool:
+        entry = self._resolve(key)
+        if entry is None:
+            return self.__fallback.get_bool(
+                key,
+                default=default,
+            )
+
+        value, layer, error_key = entry
+        return layer._convert_bool(error_key, value)
+
+    def get_int(  # type: ignore[override]
+        self,
+        key: str,
+        *,
+        default: int | None = None,
+        required: bool = False,
+    ) -> int | None:
+        entry = self._resolve(key)
+        if entry is None:
+            return self.__fallback.get_int(
+                key,
+                default=default,  # type: ignore[arg-type]
+                required=required,
+            )
+
+        value, layer, error_key = entry
+        return layer._convert_int(error_key, value)
+
+    def get_string_list[T = str](  # type: ignore[override]
+        self,
+        key: str,
+        *,
+        default: list[T] | None = None,
+        required: bool = False,
+        transform: Callable[[str], T] | None = None,
+    ) -> list[T] | None:
+        entry = self._resolve(key)
+        if entry is None:
+            return self.__fallback.get_string_list(
+                key,
+                default=default,  # type: ignore[arg-type]
+                required=required,
+                transform=transform,
+            )
+
+        value, layer, error_key = entry
+        return layer._convert_string_list(error_key, value, transform)
+
+    def get_int_list(  # type: ignore[override]
+        self,
+        key: str,
+        *,
+        default: list[int] | None = None,
+        required: bool = False,
+    ) -> list[int] | None:
+        entry = self._resolve(key)
+        if entry is None:
+            return self.__fallback.get_int_list(
+                key,
+                default=default,  # type: ignore[arg-type]
+                required=required,
+            )
+
+        value, layer, error_key = entry
+        return layer._convert_int_list(error_key, value)
+
+    def get_datetime(  # type: ignore[override]
+        self,
+        key: str,
+        *,
+        default: datetime | None = None,
+        required: bool = False,
+        is_naive: bool = False,
+    ) -> datetime | None:
+        entry = self._resolve(key)
+        if entry is None:
+            return self.__fallback.get_datetime(
+                key,
+                default=default,  # type: ignore[arg-type]
+                required=required,
+                is_naive=is_naive,
+            )
+
+        value, layer, error_key = entry
+        return layer._convert_datetime(error_key, value, is_naive)
+
+    def get_date(  # type: ignore[override]
+        self,
+        key: str,
+        *,
+        default: date | None = None,
+        required: bool = False,
+    ) -> date | None:
+        entry = self._resolve(key)
+        if entry is None:
+            return self.__fallback.get_date(
+                key,
+                default=default,  # type: ignore[arg-type]
+                required=required,
+            )
+
+        value, layer, error_key = entry
+        return layer._convert_date(error_key, value)
+
+    def get_time(  # type: ignore[override]
+        self,
+        key: str,
+        *,
+        default: time | None = None,
+        required: bool = False,
+    ) -> time | None:
+        entry = self._resolve(key)
+        if entry is None:
+            return self.__fallback.get_time(
+                key,
+                default=default,  # type: ignore[arg-type]
+                required=required,
+            )
+
+        value, layer, error_key = entry
+        return layer._convert_time(error_key, value)
@@ -1,40 +1,204 @@
-import tomllib
+import threading
 import warnings
-from collections.abc import Callable
+from collections.abc import Callable, Iterable, Sequence
 from datetime import date, datetime, time
 from pathlib import Path
-from typing import Any, Self, cast
+from typing import TYPE_CHECKING, Any, Self, cast
 
 from bs_config import Env
+from bs_config.key import ConfigKey
 
+from .layer import LayerEnv
 
-class TomlEnv(Env):
-    def __init__(self, parent: Env, toml_values: dict[str, Any]) -> None:
-        self.__parent = parent
+if TYPE_CHECKING:
+    from bs_config.parse_cache import ParseCache
+
+    from .memory import Sizer
+
+
+def _compact(value: Any, strings: dict[str, str]) -> Any:
+    """
+    Converts a parsed TOML value to a form that takes up less memory: equal strings
+    (including the keys of tables) share a single instance, and lists are stored as
+    tuples, which aren't over-allocated.
+    """
+    if isinstance(value, str):
+        return strings.setdefault(value, value)
+    if isinstance(value, dict):
+        return {
+            strings.setdefault(name, name): _compact(item, strings)
+            for name, item in value.items()
+        }
+    if isinstance(value, list):
+        return tuple(_compact(item, strings) for item in value)
+
+    return value
+
+
+class _Deferred:
+    """
+    Placeholder for the values of a TOML file that is parsed on first access.
+    """
+
+    __slots__ = ("cache",)
+
+    def __init__(self, cache: "ParseCache | None") -> None:
+        self.cache = cache
+
+
+class TomlEnv(LayerEnv):
+    def __init__(
+        self,
+        parent: Env,
+        toml_values: Any,
+        *,
+        prefix: str | None = None,
+        path: Path | None = None,
+    ) -> None:
+        """
+        Args:
+            parent: the Env to fall back to
+            toml_values: the parsed TOML document. For scoped layers, this is the
+                value at the scope key, which may also be a scalar value or None.
+                May also be a placeholder created by ``_defer_source()``, in which case
+                the file at ``path`` is parsed on first access.
+            prefix: the scope key of this layer, if any
+            path: the file the values were loaded from, if any
+        """
+        super().__init__(parent, prefix=prefix, path=path)
         self.__values = toml_values
+        self.__lock = threading.Lock()
+
+    def _values(self) -> Any:
+        values = self.__values
+        if not isinstance(values, _Deferred):
+            return values
+
+        with self.__lock:
+            values = self.__values
+            if isinstance(values, _Deferred):
+                # Errors propagate to the caller, parsing is retried on the next access
+                values = self._read(self.path, values.cache)  # type: ignore[arg-type]
+                self.__values = values
+
+        return values
 
     @classmethod
     def load_toml_config(cls, parent: Env, toml_config: Path) -> Self | None:
-        if not toml_config.is_file():
+        values = cls._read_source(toml_config)
+        if values is None:
+            return None
+
+        return cls._from_source(parent, values, toml_config)
+
+    @classmethod
+    def _from_source(
+        cls,
+        parent: Env,
+        values: dict[str, Any],
+        path: Path,
+        *,
+        env_prefix: str | None = None,
+    ) -> Self:
+        return cls(parent, values, path=path)
+
+    @classmethod
+    def _read_source(
+        cls,
+        path: Path,
+        cache: "ParseCache | None" = None,
+    ) -> dict[str, Any] | None:
+        if not path.is_file():
             return None
 
+        return cls._read(path, cache)  # type: ignore[no-any-return]
+
+    @classmethod
+    def _defer_source(
+        cls,
+        path: Path,
+        cache: "ParseCache | None" = None,
+    ) -> Any | None:
+        if not path.is_file():
+            return None
+
+        return _Deferred(cache)
+
+    @classmethod
+    def _parse(cls, path: Path, data: bytes) -> dict[str, Any]:
+        import tomllib
+
         try:
-            with toml_config.open("rb") as f:
-                content = tomllib.load(f, parse_float=str)
-        except tomllib.TOMLDecodeError as e:
-            raise ValueError(f"Could not decode TOML config at {toml_config}: %s", e)
+            values = tomllib.loads(data.decode(), parse_float=str)
+        except (tomllib.TOMLDecodeError, UnicodeDecodeError) as e:
+            raise ValueError(f"Could not decode TOML config at {path}: %s", e)
+
+        return _compact(values, {})  # type: ignore[no-any-return]
 
-        return cls(parent, content)
+    def _set_values(self, values: Any) -> None:
+        # Prevents a concurrent first access from overwriting the new values
+        with self.__lock:
+            self.__values = values
+
+    def _trimmed_values(self, keep: Callable[[str], bool]) -> Any | None:
+        values = self.__values
+        # Files that were never parsed don't take up any memory
+        if isinstance(values, _Deferred) or not isinstance(values, dict):
+            return None
+
+        def _trim(prefix: str, table: dict[str, Any]) -> dict[str, Any]:
+            result: dict[str, Any] = {}
+            for name, value in table.items():
+                key = f"{prefix}{name}"
+                if keep(key):
+                    result[name] = value
+                elif isinstance(value, dict):
+                    trimmed = _trim(f"{key}.", value)
+                    if trimmed:
+                        result[name] = trimmed
+
+            return result
+
+        return _trim("", values)
+
+    def _measure_values(self, sizer: "Sizer") -> tuple[int, int, int]:
+        values = self.__values
+        # Files that were never parsed don't take up any memory
+        if isinstance(values, _Deferred):
+            return 0, 0, 0
+
+        if not isinstance(values, dict):
+            # Scoped to a single value
+            count = 0 if values is None else 1
+            return 0, count, sizer.size(values)
+
+        keys = 0
+        leaves = 0
+        tables = [values]
+        while tables:
+            for value in tables.pop().values():
+                keys += 1
+                if isinstance(value, dict):
+                    tables.append(value)
+                else:
+                    leaves += 1
+
+        return keys, leaves, sizer.size(values)
 
     def _get_nested_value(self, key: str) -> Any | None:
-        if key != key.lower():
-            warnings.warn("Keys should use kebab-case")
+        key_parts: Iterable[str]
+        if isinstance(key, ConfigKey):
+            key_parts = key.parts
+        else:
+            if key != key.lower():
+                warnings.warn("Keys should use kebab-case")
+
+            if not key:
+                raise ValueError("Empty key")
 
-        if not key:
-            raise ValueError("Empty key")
+            key_parts = key.split(".")
 
-        key_parts = key.split(".")
-        value: Any | None = self.__values
+        value: Any | None = self._values()
         for part in key_parts:
             if isinstance(value, dict):
                 value = value.get(part)
@@ -45,17 +209,51 @@ class TomlEnv(Env):
 
         return value
 
-    def _get_stripped_value[T](self, key: str, value_type: type[T]) -> T | None:
-        value = self._get_nested_value(key)
+    def _create(self, parent: Env, values: Any, prefix: str) -> LayerEnv:
+        return TomlEnv(parent, values, prefix=prefix)
 
-        if value is None:
-            return value
+    def _scoped_values(self, key: str) -> Any:
+        value: Any | None = self._values()
+        for part in ConfigKey(key).parts:
+            if isinstance(value, dict):
+                value = value.get(part)
+            else:
+                # Lookups within a scalar value raise an error, lookups within a
+                # missing value don't find anything. Both stays true for the scope.
+                break
+
+        return value
+
+    def _lookup(self, key: str) -> Any | None:
+        value = self._get_nested_value(key)
 
         if isinstance(value, str):
             value = value.strip()
             if not value:
                 return None
 
+        return value
+
+    def _keys(self) -> Iterable[str]:
+        def _walk(prefix: str, table: dict[str, Any]) -> Iterable[str]:
+            for name, value in table.items():
+                # Keys containing a dot can't be looked up
+                if "." in name:
+                    continue
+
+                key = f"{prefix}{name}"
+                yield key
+                if isinstance(value, dict):
+                    yield from _walk(f"{key}.", value)
+
+        values = self._values()
+        if not isinstance(values, dict):
+            return ()
+
+        return _walk("", values)
+
+    @staticmethod
+    def _check_type[T](key: str, value: Any, value_type: type[T]) -> T:
         if isinstance(value, value_type):
             return value
 
@@ -63,86 +261,52 @@ class TomlEnv(Env):
             f"Expected value of type {value_type}, but got {type(value)} for key {key}"
         )
 
-    def get_string[T = str](  # type: ignore[override]
-        self,
-        key: str,
-        *,
-        default: T | None = None,
-        required: bool = False,
-        transform: Callable[[str], T] | None = None,
-    ) -> T | None:
-        value = self._get_stripped_value(key, str)
-        if value is None:
-            return self.__parent.get_string(
-                key,
-                default=default,
-                required=required,
-                transform=transform,
-            )
+    @staticmethod
+    def _check_list(key: str, value: Any) -> Sequence[Any]:
+        # Parsed documents store lists as tuples, see _compact()
+        if isinstance(value, (list, tuple)):
+            return value
+
+        raise ValueError(
+            f"Expected value of type {list}, but got {type(value)} for key {key}"
+        )
 
+    @staticmethod
+    def _convert_string[T](
+        key: str,
+        value: Any,
+        transform: Callable[[str], T] | None,
+    ) -> T:
+        value = TomlEnv._check_type(key, value, str)
         if transform is None:
             return value  # type: ignore[return-value]
 
         return transform(value)
 
-    def get_bool(  # type: ignore[override]
-        self,
-        key: str,
-        *,
-        default: bool,
-    ) -> bool:
-        value = self._get_stripped_value(key, bool)
-        if value is None:
-            return self.__parent.get_bool(
-                key,
-                default=default,
-            )
-
-        return value
-
-    def get_int(  # type: ignore[override]
-        self,
-        key: str,
-        *,
-        default: int | None = None,
-        required: bool = False,
-    ) -> int | None:
-        value = self._get_stripped_value(key, int)
-        if value is None:
-            return self.__parent.get_int(
-                key,
-                default=default,  # type: ignore[arg-type]
-                required=required,
-            )
+    @staticmethod
+    def _convert_bool(key: str, value: Any) -> bool:
+        return TomlEnv._check_type(key, value, bool)
 
-        return value
+    @staticmethod
+    def _convert_int(key: str, value: Any) -> int:
+        return TomlEnv._check_type(key, value, int)
 
-    def get_string_list[T = str](  # type: ignore[override]
-        self,
+    @staticmethod
+    def _convert_string_list[T](
         key: str,
-        *,
-        default: list[T] | None = None,
-        required: bool = False,
-        transform: Callable[[str], T] | None = None,
-    ) -> list[T] | None:
-        values = self._get_stripped_value(key, list)
-
-        if values is None:
-            return self.__parent.get_string_list(
-                key,
-                default=default,  # type: ignore[arg-type]
-                required=required,
-                transform=transform,
-            )
+        value: Any,
+        transform: Callable[[str], T] | None,
+    ) -> list[T]:
+        values = TomlEnv._check_list(key, value)
 
         result: list[T] = []
-        for value in values:
-            if not isinstance(value, str):
+        for item in values:
+            if not isinstance(item, str):
                 raise ValueError(
-                    f"Got {type(value)} value instead of str in list for key {key}"
+                    f"Got {type(item)} value instead of str in list for key {key}"
                 )
 
-            stripped = value.strip()
+            stripped = item.strip()
             if not stripped:
                 continue
 
@@ -153,48 +317,23 @@ class TomlEnv(Env):
 
         return result
 
-    def get_int_list(  # type: ignore[override]
-        self,
-        key: str,
-        *,
-        default: list[int] | None = None,
-        required: bool = False,
-    ) -> list[int] | None:
-        values = self._get_stripped_value(key, list)
-
-        if values is None:
-            return self.__parent.get_int_list(
-                key,
-                default=default,  # type: ignore[arg-type]
-                required=required,
-            )
+    @staticmethod
+    def _convert_int_list(key: str, value: Any) -> list[int]:
+        values = TomlEnv._check_list(key, value)
 
         result: list[int] = []
-        for value in values:
+        for item in values:
             # Not doing isinstance() here because bool is a subtype of int
-            if type(value) is not int:
+            if type(item) is not int:
                 raise ValueError(f"Got non-int value in list for key {key}")
 
-            result.append(value)
+            result.append(item)
 
         return result
 
-    def get_datetime(  # type: ignore[override]
-        self,
-        key: str,
-        *,
-        default: datetime | None = None,
-        required: bool = False,
-        is_naive: bool = False,
-    ) -> datetime | None:
-        value = self._get_stripped_value(key, datetime)
-        if value is None:
-            return self.__parent.get_datetime(
-                key,
-                default=default,  # type: ignore[arg-type]
-                required=required,
-                is_naive=is_naive,
-            )
+    @staticmethod
+    def _convert_datetime(key: str, value: Any, is_naive: bool) -> datetime:
+        value = TomlEnv._check_type(key, value, datetime)
 
         if value.tzinfo is None:
             if is_naive:
@@ -211,37 +350,13 @@ class TomlEnv(Env):
                 "Received timezone-naive datetime value, but a timezone-aware datetime was expected"
             )
 
-    def get_date(  # type: ignore[override]
-        self,
-        key: str,
-        *,
-        default: date | None = None,
-        required: bool = False,
-    ) -> date | None:
-        value = self._get_stripped_value(key, date)
-        if value is None:
-            return self.__parent.get_date(
-                key,
-                default=default,  # type: ignore[arg-type]
-                required=required,
-            )
-
-        return value
+    @staticmethod
+    def _convert_date(key: str, value: Any) -> date:
+        return TomlEnv._check_type(key, value, date)
 
-    def get_time(  # type: ignore[override]
-        self,
-        key: str,
-        *,
-        default: time | None = None,
-        required: bool = False,
-    ) -> time | None:
-        value = self._get_stripped_value(key, time)
-        if value is None:
-            return self.__parent.get_time(
-                key,
-                default=default,  # type: ignore[arg-type]
-                required=required,
-            )
+    @staticmethod
+    def _convert_time(key: str, value: Any) -> time:
+        value = TomlEnv._check_type(key, value, time)
 
         if value.tzinfo is not None:
             # Should be impossible to represent in TOML anyway
@@ -0,0 +1,253 @@
+from collections.abc import Callable
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Self
+
+from bs_config import Env
+from bs_config.resolution import Resolution
+
+from .direnv import DirenvEnv
+from .layer import LayerEnv, split_chain
+from .observed import ObservedEnv, Observers
+
+if TYPE_CHECKING:
+    from bs_config.memory import MemoryUsage
+
+    from .memory import Sizer
+    from .warmup import Read
+
+# Reads of these getters depend on their arguments, so TracedEnv records them itself
+_ARGUMENT_ACCESSORS = frozenset({"get_string", "get_string_list", "get_datetime"})
+
+
+class _AccessTrace:
+    def __init__(self, layers: list[LayerEnv]) -> None:
+        # The layers of the Env the trace was started on, scoped instances record
+        # their keys relative to it
+        self.layers = layers
+        self.keys: set[str] = set()
+        self.reads: set[Read] = set()
+
+    def record(self, resolution: Resolution) -> None:
+        key = resolution.key
+        self.keys.add(key)
+        if key != key.lower() or "_" in key:
+            # Layers holding environment variables resolve the key like its canonical
+            # form, which is what they list (and trim) their keys by
+            self.keys.add(DirenvEnv._canonical_key(key))
+        if resolution.accessor not in _ARGUMENT_ACCESSORS:
+            self.reads.add((key, resolution.accessor, False))
+
+    def is_accessed(self, key: str) -> bool:
+        """
+        Whether the key or one of the scopes containing it was accessed.
+        """
+        keys = self.keys
+        while True:
+            if key in keys:
+                return True
+
+            index = key.rfind(".")
+            if index < 0:
+                return False
+
+            key = key[:index]
+
+    def unused_keys(self, layer: LayerEnv) -> list[str]:
+        scopes: set[str] = set()
+        for key in list(self.keys):
+            index = key.rfind(".")
+            while index > 0:
+                key = key[:index]
+                scopes.add(key)
+                index = key.rfind(".")
+
+        unused: list[str] = []
+        for key in layer._keys():
+            if key in scopes or self.is_accessed(key):
+                continue
+
+            # A table that is unused as a whole is reported instead of its keys
+            index = key.rfind(".")
+            if index > 0 and self.is_unused_scope(key[:index], unused):
+                continue
+
+            unused.append(key)
+
+        return unused
+
+    @staticmethod
+    def is_unused_scope(scope: str, unused: list[str]) -> bool:
+        while True:
+            if scope in unused:
+                return True
+
+            index = scope.rfind(".")
+            if index < 0:
+                return False
+
+            scope = scope[:index]
+
+
+class TracedEnv(ObservedEnv):
+    """
+    Records the keys that are accessed through it, to find keys in the loaded sources
+    that are never used. Scoped instances share the trace of the instance they were
+    created from.
+    """
+
+    def __init__(
+        self,
+        source: Env,
+        observers: Observers | None = None,
+        prefix: str | None = None,
+        trace: _AccessTrace | None = None,
+    ) -> None:
+        if trace is None:
+            layers, _ = split_chain(source._unwrap())
+            trace = _AccessTrace(layers)
+        if observers is None:
+            observers = Observers()
+            observers.add(trace.record, 1.0)
+
+        super().__init__(source, observers, prefix)
+        self.__trace = trace
+
+    def _create(self, source: Env, observers: Observers, prefix: str) -> Self:
+        return type(self)(source, observers, prefix, self.__trace)
+
+    def _state_memory_usage(self, sizer: "Sizer") -> list["MemoryUsage"]:
+        from bs_config.memory import MemoryUsage
+
+        keys = self.__trace.keys.copy()
+        reads = self.__trace.reads.copy()
+        return [
+            MemoryUsage(
+                "trace",
+                type(self).__name__,
+                None,
+                len(keys),
+                len(reads),
+                sizer.size(keys) + sizer.size(reads),
+            )
+        ]
+
+    def get_string[T = str](  # type: ignore[override]
+        self,
+        key: str,
+        *,
+        default: T | None = None,
+        required: bool = False,
+        transform: Callable[[str], T] | None = None,
+    ) -> T | None:
+        try:
+            return super().get_string(
+                key,
+                default=default,
+                required=required,
+                transform=transform,
+            )
+        finally:
+            # Results of transforms are cached per transform, which a later start
+            # can't recreate, so they aren't warmed up
+            if transform is None:
+                self.__trace.reads.add((self._full_key(key), "get_string", False))
+
+    def get_string_list[T = str](  # type: ignore[override]
+        self,
+        key: str,
+        *,
+        default: list[T] | None = None,
+        required: bool = False,
+        transform: Callable[[str], T] | None = None,
+    ) -> list[T] | None:
+        try:
+            return super().get_string_list(
+                key,
+                default=default,  # type: ignore[arg-type]
+                required=required,
+                transform=transform,
+            )
+        finally:
+            if transform is None:
+                self.__trace.reads.add((self._full_key(key), "get_string_list", False))
+
+    def get_datetime(  # type: ignore[override]
+        self,
+        key: str,
+        *,
+        default: datetime | None = None,
+        required: bool = False,
+        is_naive: bool = False,
+    ) -> datetime | None:
+        try:
+            return super().get_datetime(
+                key,
+                default=default,  # type: ignore[arg-type]
+                required=required,
+                is_naive=is_naive,
+            )
+        finally:
+            self.__trace.reads.add((self._full_key(key), "get_datetime", is_naive))
+
+    def accessed_keys(self) -> set[str]:
+        """
+        Returns the keys that were accessed so far, including their scopes. Keys that
+        were accessed in a non-canonical form (like "my_key") are included in their
+        canonical form as well.
+        """
+        return self.__trace.keys.copy()
+
+    def save_manifest(self, path: Path) -> None:
+        """
+        Writes the accessed keys and the getters used to read them to a JSON
+        manifest, which can be passed to ``Env.load()`` or ``Env.warm_up()`` on later
+        starts to resolve all of them ahead of time. Reads with a ``transform`` are
+        left out, since their cached results can't be recreated from the manifest.
+        """
+        from .warmup import write_manifest
+
+        write_manifest(path, self.__trace.reads.copy())
+
+    def unused_keys(self) -> dict[str, list[str]]:
+        """
+        Lists the keys of each source that were never accessed. If no key within a
+        scope (like a TOML table) was accessed, only the scope is listed. Lazily loaded
+        TOML configs are parsed to list their keys.
+
+        Returns:
+            the unused keys by source name (see ``Env.instrumented()``), in ascending
+            precedence
+        """
+        trace = self.__trace
+        result: dict[str, list[str]] = {}
+        for layer in reversed(trace.layers):
+            result.setdefault(layer.name, []).extend(trace.unused_keys(layer))
+
+        return result
+
+    def trim(self) -> dict[str, list[str]]:
+        """
+        Removes all values that were never accessed from the loaded sources, to reduce
+        their memory usage and the size of compiled indexes built over them. The
+        sources are changed in place, so this affects every Env sharing them, and
+        reading a removed key returns the default from then on.
+
+        Live environments and lazily loaded TOML configs that were never parsed are
+        not trimmed. Reloading a file (see ``watch()``) restores all of its values.
+
+        Returns:
+            the removed keys by source name, like ``unused_keys()``
+        """
+        trace = self.__trace
+        removed: dict[str, list[str]] = {}
+        for layer in reversed(trace.layers):
+            values = layer._trimmed_values(trace.is_accessed)
+            if values is None:
+                continue
+
+            unused = trace.unused_keys(layer)
+            layer._replace_values(values)
+            removed.setdefault(layer.name, []).extend(unused)
+
+        return removed
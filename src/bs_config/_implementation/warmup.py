@@ -0,0 +1,121 @@
+import json
+import logging
+from collections.abc import Iterable
+from datetime import timedelta
+from pathlib import Path
+from typing import Any
+
+from bs_config import Env
+from bs_config.spec import KeySpec
+
+from .many import ACCESSORS
+
+_logger = logging.getLogger(__name__)
+
+# Increment whenever the manifest format changes
+_MANIFEST_VERSION = 2
+
+_TYPES: dict[str, Any] = {
+    name: value_type for value_type, (name, _, _) in ACCESSORS.items()
+} | {"get_duration": timedelta}
+
+# A recorded read: the key, the accessor, and whether a naive datetime was expected
+type Read = tuple[str, str, bool]
+
+
+def write_manifest(path: Path, reads: Iterable[Read]) -> None:
+    """
+    Writes the reads to a warm-up manifest. Arguments that affect the conversion are
+    only written if they differ from their default.
+    """
+    entries: list[list[Any]] = []
+    for key, accessor, is_naive in sorted(set(reads)):
+        if is_naive:
+            entries.append([key, accessor, {"is_naive": True}])
+        else:
+            entries.append([key, accessor])
+
+    content = {"version": _MANIFEST_VERSION, "reads": entries}
+    path.write_text(json.dumps(content, indent=2) + "\n")
+
+
+def read_manifest(path: Path) -> list[Read]:
+    """
+    Reads the reads of a warm-up manifest.
+
+    Raises:
+        ValueError: if the manifest is invalid
+    """
+    content = json.loads(path.read_text())
+    if not isinstance(content, dict) or content.get("version") != _MANIFEST_VERSION:
+        raise ValueError(f"Unsupported warm-up manifest {path}")
+
+    reads: list[Read] = []
+    for entry in content.get("reads", []):
+        if (
+            not isinstance(entry, list)
+            or len(entry) not in (2, 3)
+            or not isinstance(entry[0], str)
+            or entry[1] not in _TYPES
+        ):
+            raise ValueError(f"Invalid entry {entry!r} in warm-up manifest {path}")
+
+        options = entry[2] if len(entry) == 3 else {}
+        if (
+            not isinstance(options, dict)
+            or not options.keys() <= {"is_naive"}
+            or not isinstance(options.get("is_naive", False), bool)
+        ):
+            raise ValueError(f"Invalid entry {entry!r} in warm-up manifest {path}")
+
+        reads.append((entry[0], entry[1], options.get("is_naive", False)))
+
+    return reads
+
+
+def warm_up(env: Env, reads: Iterable[Read]) -> int:
+    # A batch lookup can only resolve each key once, so keys that are read using
+    # multiple accessors take multiple batches
+    batches: list[dict[str, KeySpec]] = []
+    durations: list[str] = []
+    for key, accessor, is_naive in reads:
+        # Batch lookups resolve the fields of durations individually, which wouldn't
+        # warm up caches of get_duration() calls
+        if accessor == "get_duration":
+            durations.append(key)
+            continue
+
+        spec = KeySpec(_TYPES[accessor], is_naive=is_naive)
+        for batch in batches:
+            if key not in batch:
+                batch[key] = spec
+                break
+        else:
+            batches.append({key: spec})
+
+    count = 0
+    for batch in batches:
+        try:
+            env.get_many(batch)
+        except ValueError:
+            # The whole batch failed, so the keys are resolved one by one to warm up
+            # all others. The errors surface again when the values are actually read.
+            for key, spec in batch.items():
+                try:
+                    env.get_many({key: spec})
+                except ValueError:
+                    _logger.warning("Could not warm up %s", key, exc_info=True)
+                else:
+                    count += 1
+        else:
+            count += len(batch)
+
+    for key in durations:
+        try:
+            env.get_duration(key)
+        except ValueError:
+            _logger.warning("Could not warm up %s", key, exc_info=True)
+        else:
+            count += 1
+
+    return count
@@ -0,0 +1,194 @@
+import ctypes
+import ctypes.util
+import logging
+import os
+import select
+import sys
+import threading
+from pathlib import Path
+from types import TracebackType
+from typing import Self
+
+from .layer import LayerEnv
+
+_logger = logging.getLogger(__name__)
+
+# See inotify(7)
+_IN_MODIFY = 0x002
+_IN_ATTRIB = 0x004
+_IN_CLOSE_WRITE = 0x008
+_IN_MOVED_FROM = 0x040
+_IN_MOVED_TO = 0x080
+_IN_CREATE = 0x100
+_IN_DELETE = 0x200
+_IN_MASK = (
+    _IN_MODIFY
+    | _IN_ATTRIB
+    | _IN_CLOSE_WRITE
+    | _IN_MOVED_FROM
+    | _IN_MOVED_TO
+    | _IN_CREATE
+    | _IN_DELETE
+)
+
+type _Signature = tuple[int, int, int] | None
+
+
+def _signature(path: Path) -> _Signature:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+
+    return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+
+class _Inotify:
+    def __init__(self) -> None:
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self.__add_watch = libc.inotify_add_watch
+        self.__add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+        self.fd = fd
+
+    def add_watch(self, directory: Path) -> None:
+        if self.__add_watch(self.fd, os.fsencode(directory), _IN_MASK) < 0:
+            raise OSError(ctypes.get_errno(), f"Could not watch {directory}")
+
+    def drain(self) -> None:
+        try:
+            while os.read(self.fd, 65536):
+                pass
+        except BlockingIOError:
+            pass
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+    @classmethod
+    def create(cls) -> "_Inotify | None":
+        if not sys.platform.startswith("linux"):
+            return None
+
+        try:
+            return cls()
+        except (AttributeError, OSError):
+            return None
+
+
+class FileWatcher:
+    """
+    Watches the files of an Env's sources in a background thread and reloads a source
+    when its file changes. Uses inotify where available and polls the file stats
+    otherwise.
+
+    Sources are swapped atomically, so concurrent readers either see the old or the
+    new values of a source. If a changed file can't be parsed, the old values are
+    kept and the file is retried on the next change or poll.
+    """
+
+    def __init__(self, layers: list[LayerEnv], interval: float) -> None:
+        self.__layers = [layer for layer in layers if layer.path is not None]
+        self.__interval = interval
+        self.__signatures: dict[int, _Signature] = {
+            id(layer): _signature(layer.path)  # type: ignore[arg-type]
+            for layer in self.__layers
+        }
+        self.__lock = threading.Lock()
+        self.__stop = threading.Event()
+        self.__wake_read, self.__wake_write = os.pipe()
+        self.__inotify = _Inotify.create()
+        if self.__inotify is not None:
+            directories = {
+                layer.path.resolve().parent  # type: ignore[union-attr]
+                for layer in self.__layers
+            }
+            try:
+                for directory in directories:
+                    self.__inotify.add_watch(directory)
+            except OSError:
+                _logger.debug("Falling back to polling", exc_info=True)
+                self.__inotify.close()
+                self.__inotify = None
+
+        self.__thread = threading.Thread(
+            target=self._run,
+            name="bs-config-watcher",
+            daemon=True,
+        )
+        self.__thread.start()
+
+    @property
+    def uses_inotify(self) -> bool:
+        return self.__inotify is not None
+
+    def check(self) -> list[Path]:
+        """
+        Checks all files for changes and reloads the sources of changed files.
+
+        Returns:
+            the files that were reloaded
+        """
+        reloaded: list[Path] = []
+        with self.__lock:
+            for layer in self.__layers:
+                path: Path = layer.path  # type: ignore[assignment]
+                signature = _signature(path)
+                if signature == self.__signatures[id(layer)]:
+                    continue
+
+                try:
+                    layer._reload()
+                except (OSError, ValueError):
+                    _logger.warning("Could not reload %s", path, exc_info=True)
+                    continue
+
+                self.__signatures[id(layer)] = signature
+                reloaded.append(path)
+
+        return reloaded
+
+    def _run(self) -> None:
+        inotify = self.__inotify
+        read_fds = [self.__wake_read]
+        if inotify is not None:
+            read_fds.append(inotify.fd)
+
+        while not self.__stop.is_set():
+            readable, _, _ = select.select(read_fds, [], [], self.__interval)
+            if self.__stop.is_set():
+                break
+
+            if inotify is not None and inotify.fd in readable:
+                inotify.drain()
+
+            self.check()
+
+    def stop(self) -> None:
+        """
+        Stops watching. Already loaded values stay available.
+        """
+        if self.__stop.is_set():
+            return
+
+        self.__stop.set()
+        os.write(self.__wake_write, b"\0")
+        self.__thread.join()
+        os.close(self.__wake_read)
+        os.close(self.__wake_write)
+        if self.__inotify is not None:
+            self.__inotify.close()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        self.stop()
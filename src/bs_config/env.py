@@ -1,17 +1,51 @@
 from __future__ import annotations
 
 import abc
-from typing import TYPE_CHECKING, Literal, cast, overload
 
+# Not imported from typing, which is expensive to import and only needed by type
+# checkers. Type checkers treat any constant with this name like the one in typing.
+TYPE_CHECKING = False
 if TYPE_CHECKING:
-    from collections.abc import Callable, Iterable
-    from datetime import date, datetime, time
+    from collections.abc import Callable, Iterable, Mapping
+    from datetime import date, datetime, time, timedelta
     from pathlib import Path
-
-from datetime import timedelta
+    from typing import Any, Literal, overload
+
+    from ._implementation.cached import CachedEnv
+    from ._implementation.instrumented import InstrumentedEnv
+    from ._implementation.layer import LayerEnv
+    from ._implementation.memory import Sizer
+    from ._implementation.observed import ObservedEnv
+    from ._implementation.shared import SharedSnapshot
+    from ._implementation.traced import TracedEnv
+    from ._implementation.watch import FileWatcher
+    from .key import ConfigKey
+    from .memory import MemoryUsage
+    from .parse_cache import ParseCache
+    from .resolution import Observer
+    from .spec import KeySpec
 
 
 class Env(abc.ABC):
+    __scopes: dict[str, Env]
+
+    @staticmethod
+    def key(key: str, /) -> ConfigKey:
+        """
+        Validates and translates a key once, so it can be looked up repeatedly without
+        repeating that work on every call. The result can be passed to any getter.
+
+        Args:
+            key: the kebab-case key, scopes separated by dots
+
+        Returns:
+            the precompiled key
+
+        """
+        from .key import ConfigKey
+
+        return ConfigKey(key)
+
     def __truediv__(self, key: str, /) -> Env:
         """
         Args:
@@ -21,57 +55,429 @@ class Env(abc.ABC):
             an instance that is scoped to the given key
 
         """
-        from ._implementation.scoped import ScopedEnv
-
         if not key:
             raise ValueError("Key cannot be empty")
 
+        try:
+            scopes = self.__scopes
+        except AttributeError:
+            scopes = self.__scopes = {}
+
+        result = scopes.get(key)
+        if result is None:
+            result = self._scope(key)
+            scopes[key] = result
+
+        return result
+
+    def _scope(self, key: str) -> Env:
+        """
+        Creates a new instance scoped to the given key. Implementations should
+        override this to scope their values directly instead of wrapping themselves.
+        Results are cached by ``__truediv__``.
+        """
+        from ._implementation.scoped import ScopedEnv
+
         return ScopedEnv(self, key)
 
-    @overload
-    def get_string[T = str](
-        self,
-        key: str,
-        *,
-        default: T,
-        required: bool = False,
-        transform: Callable[[str], T] | None = None,
-    ) -> T:
-        pass
+    def compile(self) -> Env:
+        """
+        Collapses all layers of this Env (environment, dotenv and TOML values) into a
+        single precedence-resolved index. Lookups on the returned instance are a single
+        hash probe instead of a walk through every layer, the results are the same.
 
-    @overload
-    def get_string[T = str](
-        self,
-        key: str,
-        *,
-        default: None = None,
-        required: Literal[False] = False,
-        transform: Callable[[str], T] | None = None,
-    ) -> T | None:
-        pass
+        Returns:
+            an instance that resolves keys using the precomputed index
 
-    @overload
-    def get_string[T = str](
+        """
+        from ._implementation.compiled import CompiledEnv
+
+        return CompiledEnv(self)
+
+    def freeze(self) -> Env:
+        """
+        Takes an immutable snapshot of this Env. Every key present in any layer is
+        resolved once, values are converted on first access by a typed getter and then
+        reused. The snapshot keeps no references to the layers, so it can be shared
+        between threads without locks, and later changes (reloaded files, a live
+        ``os.environ``) are not reflected in it.
+
+        Keys nested inside non-table values resolve to the default instead of
+        raising.
+
+        Returns:
+            an immutable instance holding the current values of this Env
+
+        """
+        from ._implementation.frozen import FrozenEnv
+
+        return FrozenEnv.of(self)
+
+    def share(self) -> SharedSnapshot:
+        """
+        Serializes the current values of this Env into a new shared memory block, so
+        worker processes can read them using ``Env.attach()`` instead of loading all
+        sources again. Workers read directly from the shared block without copying
+        or deserializing it, so their memory usage doesn't grow with the config size.
+
+        Values are resolved like ``freeze()`` does. The environment is snapshotted,
+        later changes to it are not visible to attached processes.
+
+        Returns:
+            the shared snapshot, which must be closed using ``close()`` (or by using it
+            as a context manager) once all workers attached to it
+
+        Raises:
+            ValueError: if this Env falls back to an Env that isn't loaded from
+                sources (see ``load()``)
+
+        """
+        from ._implementation.shared import SharedSnapshot
+        from ._implementation.snapshot import encode_snapshot
+
+        return SharedSnapshot(encode_snapshot(self, include_env=True))
+
+    def save_artifact(self, path: Path, *, include_env: bool = False) -> None:
+        """
+        Writes the current values of this Env to a binary artifact, which can be
+        passed to ``load()`` as ``artifact``. Loading an artifact maps it into memory
+        and reads values directly from it, so it takes the same time regardless of
+        the config size. Use this as a build step, for example to bake your config
+        into a container image.
+
+        Values are resolved like ``freeze()`` does, but the ``os.environ`` variables
+        are left out unless ``include_env`` is True. The environment at build time
+        usually doesn't belong into the artifact and may contain secrets.
+
+        Args:
+            path: the file to write, replaced atomically if it exists
+            include_env: whether to include the ``os.environ`` variables, if this Env
+                was loaded with them
+
+        Raises:
+            ValueError: if this Env falls back to an Env that isn't loaded from
+                sources (see ``load()``)
+
+        """
+        from ._implementation.artifact import write_artifact
+
+        write_artifact(self, path, include_env=include_env)
+
+    def cached(self, maxsize: int = 1024) -> CachedEnv:
+        """
+        Caches the converted results of getter calls, keyed by the key and the
+        arguments that affect the conversion (``transform`` and ``is_naive``). Defaults
+        are applied on each call, so reads that only differ in their default share a
+        cached result. The cache is cleared whenever an underlying value changes.
+        Changes to a live ``os.environ`` (see ``load()``) are not detected, call
+        ``cache_clear()`` after changing the environment.
+
+        Args:
+            maxsize: the maximum number of cached results. If the cache is full, the
+                least recently used result is evicted.
+
+        Returns:
+            an instance that caches the results of this Env. Use its ``cache_info()``
+            method to get hit/miss statistics.
+
+        """
+        from ._implementation.cached import CachedEnv
+
+        return CachedEnv(self, maxsize)
+
+    def instrumented(self) -> InstrumentedEnv:
+        """
+        Records per-key read counts, the source that served each read (the
+        environment, a dotenv or TOML file, or the default) and a latency histogram of
+        all reads. Only the returned instance records metrics, this Env is unaffected.
+
+        Wrap the outermost Env you read from, but inside ``cached()``, since reads
+        served by the cache are not instrumented. Scoped instances (``env / "scope"``)
+        record into the same metrics, using the full key.
+
+        Returns:
+            an instance that records metrics about reads. Use its ``snapshot()`` method
+            to get them as a dict, and ``reset()`` to discard them.
+
+        """
+        from ._implementation.instrumented import InstrumentedEnv
+
+        return InstrumentedEnv(self)
+
+    def traced(self) -> TracedEnv:
+        """
+        Records which keys are accessed through the returned instance. After the
+        application ran for a while, ``unused_keys()`` on the returned instance lists
+        the keys of each source that were never accessed, and ``trim()`` removes
+        them from the sources to save memory.
+
+        Wrap the outermost Env you read from, but inside ``cached()``, since reads
+        served by the cache are not traced.
+
+        Returns:
+            an instance that records accessed keys
+
+        """
+        from ._implementation.traced import TracedEnv
+
+        return TracedEnv(self)
+
+    def memory_report(self) -> list[MemoryUsage]:
+        """
+        Reports the approximate memory retained by this Env: the values of each
+        layer (environment, dotenv and TOML), and the caches, indexes and other
+        state of wrapping Envs. Scoped instances created from this Env using ``/``
+        are reported as well, since they may hold copies of values.
+
+        Sizes are measured by walking the retained objects, which takes time
+        proportional to the size of the config. Live environments (see ``load()``)
+        are not copied, so they are reported without retained bytes. TOML configs
+        that weren't parsed yet (see ``lazy`` in ``load()``) are not parsed.
+
+        Returns:
+            one entry per layer or piece of state, ordered from this Env to the
+            Envs it falls back to, followed by the entries of scoped instances
+
+        """
+        from ._implementation.memory import Sizer
+
+        sizer = Sizer()
+        report: list[MemoryUsage] = []
+
+        def _walk(env: Env, scope: str | None) -> None:
+            report.extend(
+                usage._replace(scope=scope) for usage in env._memory_usage(sizer)
+            )
+            try:
+                scopes = env.__scopes
+            except AttributeError:
+                return
+
+            for key, scoped in list(scopes.items()):
+                _walk(scoped, key if scope is None else f"{scope}.{key}")
+
+        _walk(self, None)
+        return report
+
+    def warm_up(self, manifest: Path) -> int:
+        """
+        Resolves and converts all values listed in a warm-up manifest (see
+        ``save_manifest()`` of ``traced()`` Envs) in a batch. This parses lazily loaded
+        TOML configs that contain the values, and fills the caches of cached and frozen
+        Envs, so the first real reads don't have to do that work. Those caches don't
+        depend on the default, so reads with any default benefit.
+
+        Values that are invalid are logged and skipped, their errors are raised when
+        they are actually read.
+
+        Args:
+            manifest: the manifest file. It's not an error if it doesn't exist.
+
+        Returns:
+            the number of values that were warmed up without errors
+
+        Raises:
+            ValueError: if the manifest is invalid
+        """
+        from ._implementation.warmup import read_manifest, warm_up
+
+        try:
+            reads = read_manifest(manifest)
+        except FileNotFoundError:
+            return 0
+
+        return warm_up(self, reads)
+
+    def observe(self, observer: Observer, *, sample_rate: float = 1.0) -> ObservedEnv:
+        """
+        Registers a callback that is called after getter calls with a ``Resolution``
+        describing the call: the key, the getter, the result, the source that served
+        the value, whether the default was used, and the elapsed time.
+
+        Only the returned instance notifies observers, this Env is unaffected. Further
+        observers can be registered on the returned instance using ``observe()``,
+        which then returns the same instance. Scoped instances (``env / "scope"``)
+        share its observers.
+
+        Exceptions raised by observers are logged and don't affect the call.
+
+        Args:
+            observer: the callback
+            sample_rate: the fraction of calls (chosen randomly) the observer is
+                notified about, in (0, 1]. Calls that no observer is notified about
+                are passed straight through, so a low rate keeps the overhead low even
+                for values that are read very often.
+
+        Returns:
+            an instance that notifies the observer
+
+        """
+        from ._implementation.observed import ObservedEnv
+
+        return ObservedEnv(self).observe(observer, sample_rate=sample_rate)
+
+    def get_many(
         self,
-        key: str,
-        *,
-        default: None = None,
-        required: Literal[True],
-        transform: Callable[[str], T] | None = None,
-    ) -> T:
-        pass
+        spec: Mapping[str, KeySpec | tuple[Any, ...]],
+    ) -> dict[str, Any]:
+        """
+        Resolves multiple keys at once. Each source is only traversed once for all keys,
+        and all missing or invalid values are reported together.
 
-    @overload
-    def get_string[T = str](
+        **Example**::
+
+            values = env.get_many({
+                "my-int": KeySpec(int, required=True),
+                "my-list": (list[str], ["a", "b"]),
+                "my-duration": KeySpec(timedelta),
+            })
+
+        Args:
+            spec: a mapping from key to a ``KeySpec`` (or a tuple with the same fields)
+                describing the expected type, default and requirement of the value
+
+        Returns:
+            a dict from key to the resolved value (or default)
+
+        Raises:
+            ValueError: If any of the values is invalid or missing but required. The
+                error message lists all affected keys.
+        """
+        from ._implementation.many import get_many
+
+        return get_many(self, spec)
+
+    def _resolve_many(
         self,
-        key: str,
-        *,
-        default: T | None = None,
-        required: bool = False,
-        transform: Callable[[str], T] | None = None,
-    ) -> T | None:
+        keys: Iterable[str],
+    ) -> tuple[dict[str, tuple[Any, LayerEnv]], dict[str, ValueError], Env]:
+        """
+        Resolves the raw values of multiple keys.
+
+        Returns:
+            the found values with the layer holding them, errors that occurred during
+            lookup, and the Env that should be used for all other keys.
+        """
+        return {}, {}, self
+
+    def _source_name(self, key: str) -> str | None:
+        """
+        Names the source that serves the value of a key (see ``instrumented()``): the
+        layer holding it, "default" if no layer has a value, "fallback" if another Env
+        the layers fall back to serves it, or None if that is unknown.
+
+        Wrappers that read through another Env, but don't resolve keys themselves
+        (see ``_resolve_many()``), should forward this to that Env.
+        """
+        from ._implementation.default import DefaultEnv
+
+        resolved, failed, fallback = self._resolve_many((key,))
+        entry = resolved.get(key)
+        if entry is not None:
+            return entry[1].name
+
+        if key in failed or fallback is self:
+            return None
+
+        return "default" if isinstance(fallback, DefaultEnv) else "fallback"
+
+    def watch(self, interval: float = 1.0) -> FileWatcher:
+        """
+        Starts watching the TOML and dotenv files this Env was loaded from. If a file
+        changes, only that source is parsed again and swapped in atomically. Readers
+        never block and never see a partially applied change. Compiled indexes and
+        caches are updated automatically.
+
+        Files that did not exist when the Env was loaded are not watched.
+
+        Args:
+            interval: the polling interval in seconds. If inotify is available, changes
+                are detected immediately and polling only serves as a safety net.
+
+        Returns:
+            the watcher, which must be stopped using ``stop()`` (or by using it as a
+            context manager) when it is no longer needed
+
+        """
+        from ._implementation.layer import split_chain
+        from ._implementation.watch import FileWatcher
+
+        layers, _ = split_chain(self._unwrap())
+        return FileWatcher(layers, interval)
+
+    def _unwrap(self) -> Env:
+        """
+        Returns the Env wrapped by this instance, or this instance if it doesn't wrap
+        another Env.
+        """
+        return self
+
+    def _memory_usage(self, sizer: Sizer) -> list[MemoryUsage]:
+        """
+        Measures the memory retained by this Env and the Envs it wraps or falls back
+        to, ordered from this Env to its last fallback. Wrapped Envs should be
+        measured first, so values they share with this Env are attributed to them.
+
+        The default implementation reports nothing.
+        """
+        return []
+
+    def _subscribe(self, callback: Callable[[], None]) -> None:
+        """
+        Registers a callback that is called whenever values that this Env resolves
+        change. Callbacks are only referenced weakly, so they must be bound methods.
+
+        The default implementation does nothing, since values are immutable unless an
+        implementation states otherwise.
+        """
         pass
 
+    if TYPE_CHECKING:
+
+        @overload
+        def get_string[T = str](
+            self,
+            key: str,
+            *,
+            default: T,
+            required: bool = False,
+            transform: Callable[[str], T] | None = None,
+        ) -> T:
+            pass
+
+        @overload
+        def get_string[T = str](
+            self,
+            key: str,
+            *,
+            default: None = None,
+            required: Literal[False] = False,
+            transform: Callable[[str], T] | None = None,
+        ) -> T | None:
+            pass
+
+        @overload
+        def get_string[T = str](
+            self,
+            key: str,
+            *,
+            default: None = None,
+            required: Literal[True],
+            transform: Callable[[str], T] | None = None,
+        ) -> T:
+            pass
+
+        @overload
+        def get_string[T = str](
+            self,
+            key: str,
+            *,
+            default: T | None = None,
+            required: bool = False,
+            transform: Callable[[str], T] | None = None,
+        ) -> T | None:
+            pass
+
     @abc.abstractmethod
     def get_string[T = str](
         self,
@@ -117,45 +523,47 @@ class Env(abc.ABC):
         """
         pass
 
-    @overload
-    def get_int(
-        self,
-        key: str,
-        *,
-        default: int,
-        required: bool = False,
-    ) -> int:
-        pass
-
-    @overload
-    def get_int(
-        self,
-        key: str,
-        *,
-        default: None = None,
-        required: Literal[False] = False,
-    ) -> int | None:
-        pass
-
-    @overload
-    def get_int(
-        self,
-        key: str,
-        *,
-        default: None = None,
-        required: Literal[True],
-    ) -> int:
-        pass
-
-    @overload
-    def get_int(
-        self,
-        key: str,
-        *,
-        default: int | None = None,
-        required: bool = False,
-    ) -> int | None:
-        pass
+    if TYPE_CHECKING:
+
+        @overload
+        def get_int(
+            self,
+            key: str,
+            *,
+            default: int,
+            required: bool = False,
+        ) -> int:
+            pass
+
+        @overload
+        def get_int(
+            self,
+            key: str,
+            *,
+            default: None = None,
+            required: Literal[False] = False,
+        ) -> int | None:
+            pass
+
+        @overload
+        def get_int(
+            self,
+            key: str,
+            *,
+            default: None = None,
+            required: Literal[True],
+        ) -> int:
+            pass
+
+        @overload
+        def get_int(
+            self,
+            key: str,
+            *,
+            default: int | None = None,
+            required: bool = False,
+        ) -> int | None:
+            pass
 
     @abc.abstractmethod
     def get_int(
@@ -182,49 +590,51 @@ class Env(abc.ABC):
         """
         pass
 
-    @overload
-    def get_string_list[T = str](
-        self,
-        key: str,
-        *,
-        default: list[T],
-        required: bool = False,
-        transform: Callable[[str], T] | None = None,
-    ) -> list[T]:
-        pass
-
-    @overload
-    def get_string_list[T = str](
-        self,
-        key: str,
-        *,
-        default: None = None,
-        required: Literal[False] = False,
-        transform: Callable[[str], T] | None = None,
-    ) -> list[T] | None:
-        pass
-
-    @overload
-    def get_string_list[T = str](
-        self,
-        key: str,
-        *,
-        default: None = None,
-        required: Literal[True],
-        transform: Callable[[str], T] | None = None,
-    ) -> list[T]:
-        pass
-
-    @overload
-    def get_string_list[T = str](
-        self,
-        key: str,
-        *,
-        default: list[T] | None = None,
-        required: bool = False,
-        transform: Callable[[str], T] | None = None,
-    ) -> list[T] | None:
-        pass
+    if TYPE_CHECKING:
+
+        @overload
+        def get_string_list[T = str](
+            self,
+            key: str,
+            *,
+            default: list[T],
+            required: bool = False,
+            transform: Callable[[str], T] | None = None,
+        ) -> list[T]:
+            pass
+
+        @overload
+        def get_string_list[T = str](
+            self,
+            key: str,
+            *,
+            default: None = None,
+            required: Literal[False] = False,
+            transform: Callable[[str], T] | None = None,
+        ) -> list[T] | None:
+            pass
+
+        @overload
+        def get_string_list[T = str](
+            self,
+            key: str,
+            *,
+            default: None = None,
+            required: Literal[True],
+            transform: Callable[[str], T] | None = None,
+        ) -> list[T]:
+            pass
+
+        @overload
+        def get_string_list[T = str](
+            self,
+            key: str,
+            *,
+            default: list[T] | None = None,
+            required: bool = False,
+            transform: Callable[[str], T] | None = None,
+        ) -> list[T] | None:
+            pass
 
     @abc.abstractmethod
     def get_string_list[T = str](
@@ -255,45 +665,47 @@ class Env(abc.ABC):
         """
         pass
 
-    @overload
-    def get_int_list(
-        self,
-        key: str,
-        *,
-        default: list[int],
-        required: bool = False,
-    ) -> list[int]:
-        pass
-
-    @overload
-    def get_int_list(
-        self,
-        key: str,
-        *,
-        default: None = None,
-        required: Literal[False] = False,
-    ) -> list[int] | None:
-        pass
-
-    @overload
-    def get_int_list(
-        self,
-        key: str,
-        *,
-        default: None = None,
-        required: Literal[True],
-    ) -> list[int]:
-        pass
-
-    @overload
-    def get_int_list(
-        self,
-        key: str,
-        *,
-        default: list[int] | None = None,
-        required: bool = False,
-    ) -> list[int] | None:
-        pass
+    if TYPE_CHECKING:
+
+        @overload
+        def get_int_list(
+            self,
+            key: str,
+            *,
+            default: list[int],
+            required: bool = False,
+        ) -> list[int]:
+            pass
+
+        @overload
+        def get_int_list(
+            self,
+            key: str,
+            *,
+            default: None = None,
+            required: Literal[False] = False,
+        ) -> list[int] | None:
+            pass
+
+        @overload
+        def get_int_list(
+            self,
+            key: str,
+            *,
+            default: None = None,
+            required: Literal[True],
+        ) -> list[int]:
+            pass
+
+        @overload
+        def get_int_list(
+            self,
+            key: str,
+            *,
+            default: list[int] | None = None,
+            required: bool = False,
+        ) -> list[int] | None:
+            pass
 
     @abc.abstractmethod
     def get_int_list(
@@ -321,49 +733,51 @@ class Env(abc.ABC):
         """
         pass
 
-    @overload
-    def get_datetime(
-        self,
-        key: str,
-        *,
-        default: datetime,
-        required: bool = False,
-        is_naive: bool = False,
-    ) -> datetime:
-        pass
-
-    @overload
-    def get_datetime(
-        self,
-        key: str,
-        *,
-        default: datetime | None = None,
-        required: Literal[False] = False,
-        is_naive: bool = False,
-    ) -> datetime | None:
-        pass
-
-    @overload
-    def get_datetime(
-        self,
-        key: str,
-        *,
-        default: datetime | None = None,
-        required: Literal[True],
-        is_naive: bool = False,
-    ) -> datetime:
-        pass
-
-    @overload
-    def get_datetime(
-        self,
-        key: str,
-        *,
-        default: datetime | None = None,
-        required: bool = False,
-        is_naive: bool = False,
-    ) -> datetime | None:
-        pass
+    if TYPE_CHECKING:
+
+        @overload
+        def get_datetime(
+            self,
+            key: str,
+            *,
+            default: datetime,
+            required: bool = False,
+            is_naive: bool = False,
+        ) -> datetime:
+            pass
+
+        @overload
+        def get_datetime(
+            self,
+            key: str,
+            *,
+            default: datetime | None = None,
+            required: Literal[False] = False,
+            is_naive: bool = False,
+        ) -> datetime | None:
+            pass
+
+        @overload
+        def get_datetime(
+            self,
+            key: str,
+            *,
+            default: datetime | None = None,
+            required: Literal[True],
+            is_naive: bool = False,
+        ) -> datetime:
+            pass
+
+        @overload
+        def get_datetime(
+            self,
+            key: str,
+            *,
+            default: datetime | None = None,
+            required: bool = False,
+            is_naive: bool = False,
+        ) -> datetime | None:
+            pass
 
     @abc.abstractmethod
     def get_datetime(
@@ -401,45 +815,47 @@ class Env(abc.ABC):
         """
         pass
 
-    @overload
-    def get_date(
-        self,
-        key: str,
-        *,
-        default: date,
-        required: bool = False,
-    ) -> date:
-        pass
-
-    @overload
-    def get_date(
-        self,
-        key: str,
-        *,
-        default: date | None = None,
-        required: Literal[False] = False,
-    ) -> date | None:
-        pass
-
-    @overload
-    def get_date(
-        self,
-        key: str,
-        *,
-        default: date | None = None,
-        required: Literal[True],
-    ) -> date:
-        pass
-
-    @overload
-    def get_date(
-        self,
-        key: str,
-        *,
-        default: date | None = None,
-        required: bool = False,
-    ) -> date | None:
-        pass
+    if TYPE_CHECKING:
+
+        @overload
+        def get_date(
+            self,
+            key: str,
+            *,
+            default: date,
+            required: bool = False,
+        ) -> date:
+            pass
+
+        @overload
+        def get_date(
+            self,
+            key: str,
+            *,
+            default: date | None = None,
+            required: Literal[False] = False,
+        ) -> date | None:
+            pass
+
+        @overload
+        def get_date(
+            self,
+            key: str,
+            *,
+            default: date | None = None,
+            required: Literal[True],
+        ) -> date:
+            pass
+
+        @overload
+        def get_date(
+            self,
+            key: str,
+            *,
+            default: date | None = None,
+            required: bool = False,
+        ) -> date | None:
+            pass
 
     @abc.abstractmethod
     def get_date(
@@ -468,45 +884,47 @@ class Env(abc.ABC):
         """
         pass
 
-    @overload
-    def get_time(
-        self,
-        key: str,
-        *,
-        default: time,
-        required: bool = False,
-    ) -> time:
-        pass
-
-    @overload
-    def get_time(
-        self,
-        key: str,
-        *,
-        default: time | None = None,
-        required: Literal[False] = False,
-    ) -> time | None:
-        pass
-
-    @overload
-    def get_time(
-        self,
-        key: str,
-        *,
-        default: time | None = None,
-        required: Literal[True],
-    ) -> time:
-        pass
-
-    @overload
-    def get_time(
-        self,
-        key: str,
-        *,
-        default: time | None = None,
-        required: bool = False,
-    ) -> time | None:
-        pass
+    if TYPE_CHECKING:
+
+        @overload
+        def get_time(
+            self,
+            key: str,
+            *,
+            default: time,
+            required: bool = False,
+        ) -> time:
+            pass
+
+        @overload
+        def get_time(
+            self,
+            key: str,
+            *,
+            default: time | None = None,
+            required: Literal[False] = False,
+        ) -> time | None:
+            pass
+
+        @overload
+        def get_time(
+            self,
+            key: str,
+            *,
+            default: time | None = None,
+            required: Literal[True],
+        ) -> time:
+            pass
+
+        @overload
+        def get_time(
+            self,
+            key: str,
+            *,
+            default: time | None = None,
+            required: bool = False,
+        ) -> time | None:
+            pass
 
     @abc.abstractmethod
     def get_time(
@@ -537,45 +955,47 @@ class Env(abc.ABC):
         """
         pass
 
-    @overload
-    def get_duration(
-        self,
-        key: str,
-        *,
-        default: timedelta,
-        required: bool = False,
-    ) -> timedelta:
-        pass
-
-    @overload
-    def get_duration(
-        self,
-        key: str,
-        *,
-        default: timedelta | None = None,
-        required: Literal[True],
-    ) -> timedelta:
-        pass
-
-    @overload
-    def get_duration(
-        self,
-        key: str,
-        *,
-        default: timedelta | None = None,
-        required: Literal[False] = False,
-    ) -> timedelta | None:
-        pass
-
-    @overload
-    def get_duration(
-        self,
-        key: str,
-        *,
-        default: timedelta | None = None,
-        required: bool = False,
-    ) -> timedelta | None:
-        pass
+    if TYPE_CHECKING:
+
+        @overload
+        def get_duration(
+            self,
+            key: str,
+            *,
+            default: timedelta,
+            required: bool = False,
+        ) -> timedelta:
+            pass
+
+        @overload
+        def get_duration(
+            self,
+            key: str,
+            *,
+            default: timedelta | None = None,
+            required: Literal[True],
+        ) -> timedelta:
+            pass
+
+        @overload
+        def get_duration(
+            self,
+            key: str,
+            *,
+            default: timedelta | None = None,
+            required: Literal[False] = False,
+        ) -> timedelta | None:
+            pass
+
+        @overload
+        def get_duration(
+            self,
+            key: str,
+            *,
+            default: timedelta | None = None,
+            required: bool = False,
+        ) -> timedelta | None:
+            pass
 
     def get_duration(
         self,
@@ -616,6 +1036,8 @@ class Env(abc.ABC):
                 1. Any supplied value was not a valid int
                 2. No subfield was set, no default was given, but required is True
         """
+        from datetime import timedelta
+
         scoped = self / key
 
         # First get all parts as optional to allow us to differentiate 0 and None
@@ -657,17 +1079,29 @@ class Env(abc.ABC):
         additional_dotenvs: Iterable[str] | None = None,
         toml_configs: Iterable[Path] | None = None,
         fallback: Env | None = None,
+        env_mode: Literal["snapshot", "live"] = "snapshot",
+        env_prefix: str | None = None,
+        compiled: bool = False,
+        parse_cache: ParseCache | None = None,
+        lazy: bool = False,
+        warm_up_manifest: Path | None = None,
+        artifact: Path | None = None,
     ) -> Env:
         """
         Loads an Env instance.
 
         Precedence (highest to lowest): ``os.environ``, ``additional_dotenvs``,
-            ``.env``, ``toml_configs``
-
-        **Warning**: To use dotenv functionality, you must install the dotenv extra.
+            ``.env``, ``toml_configs``, ``artifact``
 
         Args:
             include_env: whether to include the ``os.environ`` variables
+            env_mode: how to include the ``os.environ`` variables. "snapshot" copies
+                them, so later changes to the environment are not reflected. "live"
+                reads through to ``os.environ`` on every lookup without copying it.
+            env_prefix: if set, only variables starting with this prefix are included
+                from ``os.environ`` and the dotenv files, and the prefix is removed
+                before translating their names to keys. For example, with the prefix
+                "MYAPP_", the variable ``MYAPP_MY_VALUE`` is available as ``my-value``.
             include_default_dotenv: whether to include the ``.env`` file (if it exists)
             additional_dotenvs: a list of other ``.env`` files to include. This should
                 just be the prefix, so "test" for "test.env". Ascending precedence (last
@@ -678,10 +1112,150 @@ class Env(abc.ABC):
                 Ascending precedence (last one wins a conflict).
             fallback: an existing Env instance that will be used if a key is not present
                 in the Env being created.
+            compiled: whether to collapse all loaded sources into a single index, see
+                ``compile()``.
+            parse_cache: a cache for the parsed contents of TOML and dotenv files,
+                shared between processes. See ``ParseCache``.
+            lazy: whether to defer parsing TOML configs until the first lookup that
+                reaches them. Errors in a TOML config are then raised by that lookup.
+                Compiling the Env requires all values, so it parses all files.
+            warm_up_manifest: a manifest of values to resolve right after loading, see
+                ``warm_up()``. The returned Env then caches converted values (see
+                ``cached()``) so the warmed up values are kept, unless ``env_mode`` is
+                "live".
+            artifact: a binary artifact written by ``save_artifact()``. It's memory
+                mapped instead of parsed, all other sources take precedence over it.
+                Unlike the other files, it must exist.
+        """
+        sources = cls._file_sources(
+            include_default_dotenv=include_default_dotenv,
+            additional_dotenvs=additional_dotenvs,
+            toml_configs=toml_configs,
+        )
+        return cls._assemble(
+            [
+                (
+                    layer,
+                    path,
+                    layer._defer_source(path, parse_cache)
+                    if lazy
+                    else layer._read_source(path, parse_cache),
+                )
+                for layer, path in sources
+            ],
+            include_env=include_env,
+            env_mode=env_mode,
+            env_prefix=env_prefix,
+            fallback=fallback,
+            compiled=compiled,
+            warm_up_manifest=warm_up_manifest,
+            artifact=artifact,
+        )
+
+    @classmethod
+    async def aload(
+        cls,
+        *,
+        include_env: bool = True,
+        include_default_dotenv: bool = False,
+        additional_dotenvs: Iterable[str] | None = None,
+        toml_configs: Iterable[Path] | None = None,
+        fallback: Env | None = None,
+        env_mode: Literal["snapshot", "live"] = "snapshot",
+        env_prefix: str | None = None,
+        compiled: bool = False,
+        parse_cache: ParseCache | None = None,
+        lazy: bool = False,
+        warm_up_manifest: Path | None = None,
+        artifact: Path | None = None,
+    ) -> Env:
+        """
+        Loads an Env instance without blocking the event loop. All files are read and
+        parsed concurrently in worker threads. The parameters and the precedence of the
+        sources are the same as for ``load()``.
+        """
+        import asyncio
+
+        sources = cls._file_sources(
+            include_default_dotenv=include_default_dotenv,
+            additional_dotenvs=additional_dotenvs,
+            toml_configs=toml_configs,
+        )
+        values = await asyncio.gather(
+            *(
+                asyncio.to_thread(
+                    layer._defer_source if lazy else layer._read_source,
+                    path,
+                    parse_cache,
+                )
+                for layer, path in sources
+            )
+        )
+        return await asyncio.to_thread(
+            cls._assemble,
+            [
+                (layer, path, layer_values)
+                for (layer, path), layer_values in zip(sources, values, strict=True)
+            ],
+            include_env=include_env,
+            env_mode=env_mode,
+            env_prefix=env_prefix,
+            fallback=fallback,
+            compiled=compiled,
+            warm_up_manifest=warm_up_manifest,
+            artifact=artifact,
+        )
+
+    @staticmethod
+    def _file_sources(
+        *,
+        include_default_dotenv: bool,
+        additional_dotenvs: Iterable[str] | None,
+        toml_configs: Iterable[Path] | None,
+    ) -> list[tuple[type[LayerEnv], Path]]:
+        """
+        Returns the files to load, in ascending precedence.
+        """
+        from pathlib import Path
+
+        sources: list[tuple[type[LayerEnv], Path]] = []
+        # Implementations are only imported if a source of their type is requested
+        if toml_configs is not None:
+            from ._implementation.toml import TomlEnv
+
+            sources.extend((TomlEnv, Path(config)) for config in toml_configs)
+
+        dotenvs: list[Path] = []
+        if include_default_dotenv:
+            dotenvs.append(Path(".env"))
+        if additional_dotenvs is not None:
+            dotenvs.extend(Path(f"{name}.env") for name in additional_dotenvs)
+
+        if dotenvs:
+            from ._implementation.direnv import DirenvEnv
+
+            sources.extend((DirenvEnv, path) for path in dotenvs)
+
+        return sources
+
+    @classmethod
+    def _assemble(
+        cls,
+        sources: Iterable[tuple[type[LayerEnv], Path, Any | None]],
+        *,
+        include_env: bool,
+        env_mode: Literal["snapshot", "live"],
+        env_prefix: str | None,
+        fallback: Env | None,
+        compiled: bool,
+        warm_up_manifest: Path | None = None,
+        artifact: Path | None = None,
+    ) -> Env:
+        """
+        Stacks the already read file sources (ascending precedence) on top of each
+        other.
         """
         from ._implementation.default import DefaultEnv
-        from ._implementation.direnv import DirenvEnv
-        from ._implementation.toml import TomlEnv
 
         result: Env
         if fallback is None:
@@ -689,38 +1263,79 @@ class Env(abc.ABC):
         else:
             result = fallback
 
-        if toml_configs is not None:
-            for toml_config in toml_configs:
-                toml_env = TomlEnv.load_toml_config(result, toml_config)
-                if toml_env is not None:
-                    result = toml_env
+        if artifact is not None:
+            from ._implementation.artifact import open_artifact
 
-        if include_default_dotenv or (additional_dotenvs is not None):
-            try:
-                from dotenv import dotenv_values
-            except ImportError as e:
-                raise RuntimeError(
-                    "dotenv extra is not installed! Use bs-config[dotenv]."
-                ) from e
-
-            if include_default_dotenv:
-                values = dotenv_values(".env")
-                if values:
-                    result = DirenvEnv(result, cls._remove_none_values(values))
-
-            if additional_dotenvs is not None:
-                for additional_dotenv in additional_dotenvs:
-                    values = dotenv_values(f"{additional_dotenv}.env")
-                    if values:
-                        result = DirenvEnv(result, cls._remove_none_values(values))
+            result = open_artifact(artifact, result)
+
+        for layer, path, values in sources:
+            if values is not None:
+                result = layer._from_source(result, values, path, env_prefix=env_prefix)
 
         if include_env:
             from os import environ
 
-            result = DirenvEnv(result, cls._remove_none_values(dict(environ)))
+            from ._implementation.direnv import DirenvEnv
+
+            if env_mode == "live":
+                result = DirenvEnv(
+                    result,
+                    environ,
+                    live=True,
+                    env_prefix=env_prefix,
+                    name="environ",
+                )
+            elif env_mode == "snapshot":
+                # With a prefix, only the matching variables are copied
+                result = DirenvEnv(
+                    result,
+                    environ if env_prefix else dict(environ),
+                    env_prefix=env_prefix,
+                    name="environ",
+                )
+            else:
+                raise ValueError(f"Invalid env_mode: {env_mode}")
+
+        if compiled:
+            result = result.compile()
+
+        if warm_up_manifest is not None:
+            from ._implementation.warmup import read_manifest, warm_up
+
+            try:
+                reads = read_manifest(warm_up_manifest)
+            except FileNotFoundError:
+                reads = []
+
+            # Keep the converted values, unless they can change without notice
+            if not (include_env and env_mode == "live"):
+                result = result.cached(maxsize=max(1024, len(reads)))
+
+            warm_up(result, reads)
 
         return result
 
+    @classmethod
+    def attach(cls, name: str, *, fallback: Env | None = None) -> Env:
+        """
+        Attaches to a snapshot shared by another process using ``share()``. The
+        returned Env is read-only and stays usable after the sharing process closed
+        the snapshot.
+
+        Args:
+            name: the name of the shared snapshot
+            fallback: an Env that will be used if a key is not present in the snapshot
+
+        Raises:
+            FileNotFoundError: if no snapshot with that name exists
+            ValueError: if the shared memory block doesn't contain a snapshot
+
+        """
+        from ._implementation.default import DefaultEnv
+        from ._implementation.shared import attach
+
+        return attach(name, DefaultEnv() if fallback is None else fallback)
+
     @classmethod
     def load_from_dict(
         cls,
@@ -736,15 +1351,3 @@ class Env(abc.ABC):
             DefaultEnv(),
             {key: value for key, value in values.items() if value is not None},
         )
-
-    @staticmethod
-    def _remove_none_values(data: dict[str, str | None]) -> dict[str, str]:
-        none_keys = []
-        for key, value in data.items():
-            if value is None:
-                none_keys.append(key)
-
-        for key in none_keys:
-            del data[key]
-
-        return cast(dict[str, str], data)
@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import warnings
+from typing import Self
+
+
+class ConfigKey(str):
+    """
+    A config key that is validated and translated once, so lookups don't have to
+    repeat the work on every call.
+
+    Since ConfigKey is a ``str``, it can be used anywhere a key is accepted. Create
+    instances using ``Env.key()`` or by calling ``ConfigKey(key)`` directly.
+
+    Attributes:
+        parts: the scopes of the key, which are also the path within a TOML config
+        variable_name: the SCREAMING_SNAKE_CASE name used for environment variables and
+            dotenv files
+    """
+
+    parts: tuple[str, ...]
+    variable_name: str
+
+    def __new__(cls, key: str) -> Self:
+        if isinstance(key, cls):
+            return key
+
+        if not key:
+            raise ValueError("Empty key")
+
+        if key != key.lower():
+            warnings.warn("Keys should use kebab-case")
+
+        result = super().__new__(cls, key)
+        result.parts = tuple(key.split("."))
+        result.variable_name = "__".join(
+            part.replace("-", "_").upper() for part in result.parts
+        )
+        return result
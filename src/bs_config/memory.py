@@ -0,0 +1,28 @@
+from typing import NamedTuple
+
+
+class MemoryUsage(NamedTuple):
+    """
+    The approximate memory retained by one part of an Env (see
+    ``Env.memory_report()``).
+
+    Attributes:
+        name: what the memory is used for. The name of a layer (see
+            ``Env.instrumented()``), or "cache", "index", "frozen", "snapshot",
+            "metrics" or "trace" for the state of Envs wrapping other Envs.
+        kind: the class name of the Env holding the memory, e.g. "TomlEnv"
+        scope: the scope key (see ``Env.__truediv__``) of the Env holding the memory,
+            or None if it isn't scoped
+        keys: the number of keys held, including TOML tables
+        values: the number of values held, not counting TOML tables
+        retained_bytes: the approximate number of bytes retained. Objects shared
+            between entries are only counted for the first entry. Snapshots count
+            the size of their mapped memory, which is shared between processes.
+    """
+
+    name: str
+    kind: str
+    scope: str | None
+    keys: int
+    values: int
+    retained_bytes: int
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import pickle
+import tempfile
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+if TYPE_CHECKING:
+    from ._implementation.layer import LayerEnv
+
+_logger = logging.getLogger(__name__)
+
+# Increment whenever the entry format or the parsed representation changes
+_FORMAT_VERSION = 3
+
+
+class ParseCacheInfo(NamedTuple):
+    hits: int
+    misses: int
+
+
+class ParseCache:
+    """
+    Stores the parsed values of TOML and dotenv files in a directory, so other
+    processes can skip parsing files that didn't change. Pass an instance to
+    ``Env.load()`` or ``Env.aload()``.
+
+    Entries are keyed by the path of the file and are only used if the modification
+    time, the size and the content hash of the file still match. Stale entries are
+    replaced.
+
+    **Warning**: Entries are stored using pickle. The cache directory must not be
+    writable by untrusted users.
+    """
+
+    def __init__(self, directory: Path) -> None:
+        """
+        Args:
+            directory: the directory to store the entries in. It's created if it
+                doesn't exist.
+        """
+        self.__directory = directory
+        self.__lock = threading.Lock()
+        self.__hits = 0
+        self.__misses = 0
+
+    @property
+    def directory(self) -> Path:
+        return self.__directory
+
+    def cache_info(self) -> ParseCacheInfo:
+        with self.__lock:
+            return ParseCacheInfo(hits=self.__hits, misses=self.__misses)
+
+    def _get(self, layer: type[LayerEnv], path: Path, data: bytes) -> Any:
+        stat = path.stat()
+        digest = hashlib.blake2b(data, digest_size=16).digest()
+        entry_path = self._entry_path(layer, path)
+        header = (_FORMAT_VERSION, stat.st_mtime_ns, stat.st_size, digest)
+
+        entry = self._load_entry(entry_path)
+        if entry is not None and entry[0] == header:
+            with self.__lock:
+                self.__hits += 1
+            return entry[1]
+
+        with self.__lock:
+            self.__misses += 1
+
+        values = layer._parse(path, data)
+        self._store_entry(entry_path, (header, values))
+        return values
+
+    def _entry_path(self, layer: type[LayerEnv], path: Path) -> Path:
+        name = f"{layer.__module__}.{layer.__qualname__}:{path.resolve()}"
+        return self.__directory / f"{hashlib.sha256(name.encode()).hexdigest()}.pickle"
+
+    @staticmethod
+    def _load_entry(entry_path: Path) -> tuple[Any, Any] | None:
+        try:
+            with entry_path.open("rb") as f:
+                entry = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            _logger.debug("Ignoring invalid cache entry %s", entry_path, exc_info=True)
+            return None
+
+        if not isinstance(entry, tuple) or len(entry) != 2:
+            return None
+
+        return entry
+
+    def _store_entry(self, entry_path: Path, entry: tuple[Any, Any]) -> None:
+        try:
+            self.__directory.mkdir(parents=True, exist_ok=True)
+            # Write to a temporary file first, so concurrent readers never see a
+            # partially written entry
+            fd, tmp_name = tempfile.mkstemp(dir=self.__directory, suffix=".tmp")
+            tmp_path = Path(tmp_name)
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+                tmp_path.replace(entry_path)
+            except BaseException:
+                tmp_path.unlink()
+                raise
+        except OSError:
+            _logger.warning("Could not write cache entry %s", entry_path, exc_info=True)
@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+
+class Resolution(NamedTuple):
+    """
+    Describes a single getter call on an observed Env (see ``Env.observe()``).
+
+    Attributes:
+        key: the full key, including the scopes of the Env it was read from
+        accessor: the name of the getter, e.g. "get_int"
+        result: the returned value, or None if the call raised an error
+        source: the name of the source that served the value (see
+            ``Env.instrumented()``), or None if the value couldn't be resolved or the
+            observed Env doesn't keep track of its sources (like frozen Envs)
+        used_default: whether no source had a value, so the default was returned
+        elapsed: the duration of the call in seconds
+        error: the error raised by the call, if any
+    """
+
+    key: str
+    accessor: str
+    result: Any
+    source: str | None
+    used_default: bool
+    elapsed: float
+    error: Exception | None = None
+
+
+type Observer = Callable[[Resolution], None]
@@ -0,0 +1,231 @@
+from __future__ import annotations
+
+import dataclasses
+import types
+import typing
+from typing import TYPE_CHECKING, Any
+
+from .key import ConfigKey
+from .spec import KeySpec
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from ._implementation.many import CompiledSpec
+    from .env import Env
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class _ValueField:
+    name: str
+    key: ConfigKey
+    default_factory: Callable[[], Any] | None
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class _SectionField:
+    name: str
+    plan: _Plan
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class _Plan:
+    cls: type[Any]
+    fields: tuple[_ValueField | _SectionField, ...]
+
+
+class SchemaResolver[T]:
+    """
+    Resolves a settings dataclass from an Env. Create instances using
+    ``compile_schema()``.
+    """
+
+    __slots__ = ("__compiled", "__plan", "__spec")
+
+    def __init__(
+        self,
+        plan: _Plan,
+        spec: dict[str, KeySpec],
+        compiled: CompiledSpec,
+    ) -> None:
+        self.__plan = plan
+        self.__spec = spec
+        self.__compiled = compiled
+
+    @property
+    def spec(self) -> dict[str, KeySpec]:
+        """
+        The batch lookup spec (see ``Env.get_many()``) of all values in the schema.
+        """
+        return dict(self.__spec)
+
+    def __call__(self, env: Env) -> T:
+        """
+        Resolves all values of the schema and creates an instance of it.
+
+        Raises:
+            ValueError: If any of the values is invalid or missing but required. The
+                error message lists all affected keys.
+        """
+        values = self.__compiled.resolve(env)
+        return self._build(self.__plan, values)  # type: ignore[no-any-return]
+
+    @classmethod
+    def _build(cls, plan: _Plan, values: dict[str, Any]) -> Any:
+        kwargs: dict[str, Any] = {}
+        for field in plan.fields:
+            if isinstance(field, _SectionField):
+                kwargs[field.name] = cls._build(field.plan, values)
+                continue
+
+            value = values[field.key]
+            if value is None and field.default_factory is not None:
+                value = field.default_factory()
+
+            kwargs[field.name] = value
+
+        return plan.cls(**kwargs)
+
+
+def compile_schema[T](schema: type[T]) -> SchemaResolver[T]:
+    """
+    Compiles a settings dataclass into a resolver. All keys are translated, all types
+    are checked and the lookup of each value is prepared once, so resolving the schema
+    is just a batch lookup.
+
+    Field names are translated to kebab-case keys (``my_value`` becomes ``my-value``).
+    Fields whose type is a dataclass are resolved as nested sections within the scope
+    of the field name. Supported field types are the ones supported by
+    ``Env.get_many()``, optionally combined with None.
+
+    The following field metadata is supported:
+
+    - ``key``: a custom key for the field (relative to its section)
+    - ``is_naive``: for ``datetime`` fields, whether a naive datetime is expected
+    - ``transform``: for ``str`` and ``list`` fields, a function to transform each
+      non-blank string. The annotated type may then be the type returned by the
+      transform function.
+
+    Fields are required if they have no default and aren't optional. ``bool`` fields
+    must have a default.
+
+    **Example**::
+
+        @dataclass(frozen=True, slots=True)
+        class DatabaseSettings:
+            host: str
+            port: int = 5432
+
+        @dataclass(frozen=True, slots=True)
+        class Settings:
+            database: DatabaseSettings
+            debug: bool = False
+            timeout: timedelta | None = None
+
+        resolve_settings = compile_schema(Settings)
+        settings = resolve_settings(env)
+
+    Args:
+        schema: a dataclass type
+
+    Returns:
+        a resolver, which can be called with an Env to resolve an instance of the
+        schema
+
+    Raises:
+        ValueError: if the schema contains unsupported fields
+    """
+    from ._implementation.many import CompiledSpec
+
+    spec: dict[str, KeySpec] = {}
+    plan = _compile(schema, None, spec)
+    return SchemaResolver(plan, spec, CompiledSpec(spec))
+
+
+def _compile(
+    schema: type[Any],
+    prefix: str | None,
+    spec: dict[str, KeySpec],
+) -> _Plan:
+    if not dataclasses.is_dataclass(schema):
+        raise ValueError(f"Schema {schema} is not a dataclass")
+
+    hints = typing.get_type_hints(schema)
+    fields: list[_ValueField | _SectionField] = []
+    for field in dataclasses.fields(schema):
+        if not field.init:
+            continue
+
+        name = field.metadata.get("key", field.name.replace("_", "-"))
+        key = name if prefix is None else f"{prefix}.{name}"
+        field_type = hints[field.name]
+
+        if dataclasses.is_dataclass(field_type):
+            fields.append(
+                _SectionField(
+                    name=field.name,
+                    plan=_compile(field_type, key, spec),  # type: ignore[arg-type]
+                )
+            )
+            continue
+
+        config_key = ConfigKey(key)
+        key_spec, default_factory = _to_spec(key, field, field_type)
+        spec[config_key] = key_spec
+        fields.append(
+            _ValueField(
+                name=field.name,
+                key=config_key,
+                default_factory=default_factory,
+            )
+        )
+
+    return _Plan(cls=schema, fields=tuple(fields))
+
+
+def _to_spec(
+    key: str,
+    field: dataclasses.Field[Any],
+    field_type: Any,
+) -> tuple[KeySpec, Callable[[], Any] | None]:
+    is_optional = False
+    if isinstance(field_type, types.UnionType) or (
+        typing.get_origin(field_type) is typing.Union
+    ):
+        args = [arg for arg in typing.get_args(field_type) if arg is not type(None)]
+        if len(args) != 1:
+            raise ValueError(f"Unsupported union type {field_type} for key {key}")
+
+        is_optional = True
+        field_type = args[0]
+
+    transform = field.metadata.get("transform")
+    if transform is not None:
+        field_type = list[str] if typing.get_origin(field_type) is list else str
+
+    default: Any = None
+    default_factory: Callable[[], Any] | None = None
+    has_default = True
+    if field.default is not dataclasses.MISSING:
+        default = field.default
+    elif field.default_factory is not dataclasses.MISSING:
+        default_factory = field.default_factory
+    else:
+        has_default = False
+
+    if field_type is bool and not has_default:
+        raise ValueError(f"Bool field for key {key} needs a default")
+
+    from ._implementation.many import normalize_spec
+
+    key_spec = KeySpec(
+        type=field_type,
+        default=default,
+        required=not (is_optional or has_default or field_type is bool),
+        is_naive=field.metadata.get("is_naive", False),
+        transform=transform,
+    )
+    # Validates the spec (supported types etc.)
+    normalize_spec({key: key_spec})
+
+    return key_spec, default_factory
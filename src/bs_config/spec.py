@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+
+class KeySpec(NamedTuple):
+    """
+    Describes how to resolve a single key in a batch lookup (see ``Env.get_many()``).
+
+    Attributes:
+        type: the expected type of the value. One of ``str``, ``bool``, ``int``,
+            ``list[str]``, ``list[int]``, ``datetime``, ``date``, ``time`` or
+            ``timedelta``.
+        default: a default value, defaults to None
+        required: if True, a missing value is reported as an error. Not supported for
+            ``bool``.
+        is_naive: for ``datetime`` values, whether a timezone-naive value is expected
+        transform: for ``str`` and ``list[str]`` values, a function to transform each
+            non-blank string
+    """
+
+    type: Any
+    default: Any = None
+    required: bool = False
+    is_naive: bool = False
+    transform: Callable[[str], Any] | None = None
@@ -0,0 +1,52 @@
+import asyncio
+
+import pytest
+
+from bs_config import Env
+
+
+@pytest.fixture
+def sources(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    first = tmp_path / "first.toml"
+    first.write_text('a = "first"\nb = "first"\nc = "first"\nd = "first"\n')
+    second = tmp_path / "second.toml"
+    second.write_text('b = "second"\nc = "second"\nd = "second"\n')
+    (tmp_path / ".env").write_text("C=dotenv\nD=dotenv\n")
+    monkeypatch.setenv("D", "environ")
+    return [first, second, tmp_path / "missing.toml"]
+
+
+def _load(loader, sources, **kwargs):
+    return loader(
+        toml_configs=sources,
+        include_default_dotenv=True,
+        **kwargs,
+    )
+
+
+@pytest.mark.parametrize("compiled", [False, True])
+def test_same_as_load(sources, compiled):
+    env = asyncio.run(_load(Env.aload, sources, compiled=compiled))
+    expected = _load(Env.load, sources, compiled=compiled)
+
+    for key in ["a", "b", "c", "d", "missing"]:
+        assert env.get_string(key) == expected.get_string(key)
+
+    assert env.get_string("a") == "first"
+    assert env.get_string("b") == "second"
+    assert env.get_string("c") == "dotenv"
+    assert env.get_string("d") == "environ"
+
+
+def test_fallback(sources):
+    fallback = Env.load_from_dict({"FALLBACK": "value"})
+    env = asyncio.run(_load(Env.aload, sources, fallback=fallback))
+    assert env.get_string("fallback") == "value"
+
+
+def test_invalid_toml(tmp_path):
+    invalid = tmp_path / "invalid.toml"
+    invalid.write_text("a = \n")
+    with pytest.raises(ValueError):
+        asyncio.run(Env.aload(toml_configs=[invalid]))
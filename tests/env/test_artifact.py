@@ -0,0 +1,115 @@
+import asyncio
+from datetime import date, timedelta
+from pathlib import Path
+
+import pytest
+
+from bs_config import Env
+
+
+@pytest.fixture
+def artifact(tmp_path, example_file_loader) -> Path:
+    dotenv = tmp_path / "build.env"
+    dotenv.write_text("TOP__STRING=from-dotenv\nOTHER=value\n")
+    path = tmp_path / "config.bin"
+    Env.load(
+        include_env=False,
+        toml_configs=[example_file_loader("example.toml")],
+        additional_dotenvs=[str(tmp_path / "build")],
+    ).save_artifact(path)
+    return path
+
+
+def test_values(artifact):
+    env = Env.load(include_env=False, artifact=artifact)
+    assert env.get_string("top.string") == "from-dotenv"
+    assert env.get_string("other") == "value"
+    assert env.get_int("top.int") == 123
+    assert env.get_string_list("top.list-strings") == ["foo", "bar"]
+    assert env.get_date("top.date") == date(1979, 5, 27)
+    assert (env / "top").get_duration("duration") == timedelta(
+        weeks=1,
+        days=2,
+        hours=3,
+        minutes=4,
+        seconds=5,
+        milliseconds=6,
+        microseconds=107,
+    )
+    assert env.get_int("missing", default=42) == 42
+
+
+def test_sources_take_precedence(tmp_path, artifact):
+    toml = tmp_path / "override.toml"
+    toml.write_text('other = "from-toml"\n')
+    env = Env.load(include_env=False, toml_configs=[toml], artifact=artifact)
+
+    assert env.get_string("other") == "from-toml"
+    assert env.get_string("top.string") == "from-dotenv"
+
+
+@pytest.mark.parametrize("env_mode", ["snapshot", "live"])
+def test_environ_takes_precedence(monkeypatch, artifact, env_mode):
+    monkeypatch.setenv("OTHER", "from-environ")
+    env = Env.load(env_mode=env_mode, artifact=artifact)
+    assert env.get_string("other") == "from-environ"
+
+    monkeypatch.setenv("OTHER", "changed")
+    expected = "changed" if env_mode == "live" else "from-environ"
+    assert env.get_string("other") == expected
+
+
+def test_environ_excluded(monkeypatch, tmp_path):
+    toml = tmp_path / "config.toml"
+    toml.write_text('other = "from-toml"\n')
+    monkeypatch.setenv("DB_PASSWORD", "hunter2")
+    monkeypatch.setenv("OTHER", "from-environ")
+    path = tmp_path / "config.bin"
+    Env.load(toml_configs=[toml]).save_artifact(path)
+
+    assert b"hunter2" not in path.read_bytes()
+    monkeypatch.delenv("DB_PASSWORD")
+    env = Env.load(include_env=False, artifact=path)
+    assert env.get_string("db-password") is None
+    assert env.get_string("other") == "from-toml"
+
+
+def test_environ_included(monkeypatch, tmp_path):
+    monkeypatch.setenv("DB_PASSWORD", "hunter2")
+    path = tmp_path / "config.bin"
+    Env.load().save_artifact(path, include_env=True)
+
+    monkeypatch.delenv("DB_PASSWORD")
+    env = Env.load(include_env=False, artifact=path)
+    assert env.get_string("db-password") == "hunter2"
+
+
+def test_compiled(artifact):
+    env = Env.load(include_env=False, artifact=artifact, compiled=True)
+    assert env.get_string("top.string") == "from-dotenv"
+
+
+def test_aload(artifact):
+    env = asyncio.run(Env.aload(include_env=False, artifact=artifact))
+    assert env.get_string("other") == "value"
+
+
+def test_replaced_artifact_unaffected(tmp_path, artifact):
+    env = Env.load(include_env=False, artifact=artifact)
+    Env.load_from_dict({"OTHER": "new"}).save_artifact(artifact)
+
+    assert env.get_string("other") == "value"
+    assert Env.load(include_env=False, artifact=artifact).get_string("other") == "new"
+
+
+def test_missing_artifact(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        Env.load(include_env=False, artifact=tmp_path / "missing.bin")
+
+
+@pytest.mark.parametrize("content", [b"", b"not an artifact"])
+def test_invalid_artifact(tmp_path, content):
+    path = tmp_path / "invalid.bin"
+    path.write_bytes(content)
+    with pytest.raises(ValueError, match="artifact"):
+        Env.load(include_env=False, artifact=path)
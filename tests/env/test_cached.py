@@ -0,0 +1,157 @@
+from datetime import timedelta
+
+import pytest
+
+from bs_config import Env
+from bs_config._implementation.default import DefaultEnv
+from bs_config._implementation.direnv import DirenvEnv
+
+
+@pytest.fixture
+def values() -> dict[str, str]:
+    return {
+        "INT": "42",
+        "INVALID_INT": "abc",
+        "LIST": "1,2,3",
+        "DURATION__SECONDS": "5",
+    }
+
+
+@pytest.fixture
+def layer(values) -> DirenvEnv:
+    return DirenvEnv(DefaultEnv(), values)
+
+
+def test_hit_and_miss(layer):
+    env = layer.cached()
+    assert env.get_int("int") == 42
+    assert env.get_int("int") == 42
+    info = env.cache_info()
+    assert info.hits == 1
+    assert info.misses == 1
+    assert info.currsize == 1
+
+
+def test_default_is_not_part_of_key(layer):
+    env = layer.cached()
+    assert env.get_int("missing", default=1) == 1
+    assert env.get_int("missing", default=2) == 2
+    assert env.get_int("int", default=1) == 42
+    assert env.get_int("int") == 42
+    info = env.cache_info()
+    assert info.hits == 2
+    assert info.misses == 2
+
+
+def test_arguments_are_part_of_key(layer):
+    env = layer.cached()
+    assert env.get_string_list("list") == ["1", "2", "3"]
+    assert env.get_string_list("list", transform=int) == [1, 2, 3]
+    assert env.cache_info().misses == 2
+
+
+def test_bool_default(layer):
+    env = layer.cached()
+    assert env.get_bool("missing", default=True) is True
+    assert env.get_bool("missing", default=False) is False
+    assert env.get_bool("int", default=True) is False
+    assert env.cache_info().hits == 1
+
+
+def test_unhashable_default(layer):
+    env = layer.cached()
+    assert env.get_string("missing", default=[1]) == [1]
+    assert env.get_string_list("missing", default=[["a"]]) == [["a"]]
+
+
+def test_required(layer):
+    env = layer.cached()
+    for _ in range(2):
+        with pytest.raises(ValueError, match="missing"):
+            env.get_int("missing", required=True)
+
+    with pytest.raises(ValueError, match="duration"):
+        env.get_duration("missing", required=True)
+
+
+def test_lru_eviction(layer):
+    env = layer.cached(maxsize=2)
+    env.get_int("int")
+    env.get_int_list("list")
+    env.get_int("int")
+    env.get_duration("duration")
+
+    info = env.cache_info()
+    assert info.currsize == 2
+    assert info.maxsize == 2
+
+    # the list was the least recently used entry
+    env.get_int("int")
+    env.get_int_list("list")
+    info = env.cache_info()
+    assert info.hits == 2
+    assert info.misses == 4
+
+
+def test_returned_lists_are_copies(layer):
+    env = layer.cached()
+    result = env.get_int_list("list")
+    assert result is not None
+    result.append(4)
+    assert env.get_int_list("list") == [1, 2, 3]
+
+
+def test_list_default(layer):
+    env = layer.cached()
+    assert env.get_string_list("missing", default=["a"]) == ["a"]
+    assert env.get_string_list("missing", default=["a"]) == ["a"]
+    assert env.cache_info().hits == 1
+
+
+def test_errors_not_cached(layer):
+    env = layer.cached()
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            env.get_int("invalid-int")
+
+    assert env.cache_info().currsize == 0
+
+
+def test_duration(layer):
+    env = layer.cached()
+    assert env.get_duration("duration") == timedelta(seconds=5)
+    assert env.get_duration("duration") == timedelta(seconds=5)
+    assert env.cache_info().hits == 1
+
+
+def test_cleared_on_change(layer, values):
+    env = layer.cached()
+    assert env.get_int("int") == 42
+
+    values["INT"] = "43"
+    layer._notify_changed()
+
+    assert env.cache_info().currsize == 0
+    assert env.get_int("int") == 43
+
+
+def test_cleared_on_change_of_compiled(layer, values):
+    env = layer.compile().cached()
+    assert env.get_int("int") == 42
+
+    values["INT"] = "43"
+    layer._notify_changed()
+
+    assert env.get_int("int") == 43
+
+
+def test_cache_clear(layer):
+    env = layer.cached()
+    env.get_int("int")
+    env.cache_clear()
+    assert env.cache_info().currsize == 0
+
+
+def test_invalid_maxsize():
+    with pytest.raises(ValueError):
+        Env.load_from_dict({}).cached(maxsize=0)
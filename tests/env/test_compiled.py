@@ -0,0 +1,132 @@
+from datetime import date, datetime, time, timedelta
+
+import pytest
+
+from bs_config import Env
+from bs_config._implementation.direnv import DirenvEnv
+
+
+@pytest.fixture
+def env(example_file_loader) -> Env:
+    toml_env = Env.load(
+        include_env=False,
+        toml_configs=[example_file_loader("example.toml")],
+    )
+    return DirenvEnv(
+        toml_env,
+        {
+            "TOP__STRING": "from-env",
+            "TOP__STRING_BLANK": "  ",
+            "TOP__INT": "  ",
+            "TOP__LIST_INTS": "4,5",
+            "OTHER": "value",
+            "lower": "unreachable",
+        },
+    )
+
+
+@pytest.fixture
+def compiled(env) -> Env:
+    return env.compile()
+
+
+def test_compile_idempotent(compiled):
+    assert compiled.compile() is compiled
+
+
+def test_load_compiled(example_file_loader):
+    env = Env.load(
+        include_env=False,
+        toml_configs=[example_file_loader("example.toml")],
+        compiled=True,
+    )
+    assert env.get_string("top.string") == "foo"
+
+
+@pytest.mark.parametrize(
+    "key",
+    [
+        "top.string",
+        "top.string-blank",
+        "top.string-whitespace",
+        "top.float",
+        "other",
+        "lower",
+        "missing",
+        "top.missing",
+        "top.nested.foo",
+        "does-this",
+    ],
+)
+def test_get_string_same_as_layered(env, compiled, key):
+    assert compiled.get_string(key) == env.get_string(key)
+
+
+def test_precedence(compiled):
+    assert compiled.get_string("top.string") == "from-env"
+    assert compiled.get_string("top.string-whitespace") == "foo"
+    assert compiled.get_int("top.int") == 123
+    assert compiled.get_int_list("top.list-ints") == [4, 5]
+
+
+def test_typed_values(compiled):
+    assert compiled.get_bool("top.bool", default=False) is True
+    assert compiled.get_string_list("top.list-strings") == ["foo", "bar"]
+    assert compiled.get_date("top.date") == date(1979, 5, 27)
+    assert compiled.get_time("top.time") == time(6, 32)
+    assert isinstance(
+        compiled.get_datetime("top.datetime-naive", is_naive=True), datetime
+    )
+    assert compiled.get_duration("top.duration") == timedelta(
+        weeks=1,
+        days=2,
+        hours=3,
+        minutes=4,
+        seconds=5,
+        milliseconds=6,
+        microseconds=107,
+    )
+
+
+def test_underscore_key_resolved_on_demand(compiled):
+    assert compiled.get_string("top.list_ints") == "4,5"
+
+
+def test_unindexed_keys_bounded(compiled):
+    (before,) = [u for u in compiled.memory_report() if u.name == "index"]
+    for i in range(5000):
+        assert compiled.get_string(f"missing-{i}") is None
+    assert compiled.get_string("top.list_ints") == "4,5"
+
+    (after,) = [u for u in compiled.memory_report() if u.name == "index"]
+    assert after.keys <= before.keys + 1024
+    assert after.values == before.values + 1
+
+
+def test_converted_by_source_layer(compiled):
+    with pytest.raises(ValueError):
+        compiled.get_int("top.float")
+
+
+def test_nested_in_scalar_raises(compiled):
+    with pytest.raises(ValueError):
+        compiled.get_string("top.string-whitespace.invalid")
+
+
+def test_table_as_value_raises(compiled):
+    with pytest.raises(ValueError):
+        compiled.get_string("top.nested")
+
+
+def test_missing_required(compiled):
+    with pytest.raises(ValueError, match="missing"):
+        compiled.get_string("missing", required=True)
+
+
+def test_default(compiled):
+    assert compiled.get_int("missing", default=42) == 42
+
+
+def test_scoped(compiled):
+    scoped = compiled / "top" / "nested"
+    assert scoped.get_string("foo") == "nested"
@@ -0,0 +1,56 @@
+import pytest
+
+from bs_config import Env
+from bs_config._implementation.dotenv import parse_dotenv
+
+
+@pytest.mark.parametrize(
+    "text,expected",
+    [
+        ("A=1\nB=2", {"A": "1", "B": "2"}),
+        ("export A=1\n  B = 2  \n", {"A": "1", "B": "2"}),
+        ("# comment\n\n  # indented\nA=1", {"A": "1"}),
+        ("A=1 # comment\nB=x#y", {"A": "1", "B": "x#y"}),
+        ("A=\nB", {"A": ""}),
+        ("A=a b  c  ", {"A": "a b  c"}),
+        ("A==b\nB=c=d", {"A": "=b", "B": "c=d"}),
+        ("A=1\nA=2", {"A": "2"}),
+        ("A=1\r\nB=2\r\n", {"A": "1", "B": "2"}),
+        ("A='a # b'", {"A": "a # b"}),
+        ("A='a\\'b\\\\c\\n'", {"A": "a'b\\c\\n"}),
+        ('A="a\\tb\\"c\\\\d"', {"A": 'a\tb"c\\d'}),
+        ('A="multi\nline" # comment\nB=after', {"A": "multi\nline", "B": "after"}),
+        ("A='multi\nline'\nB=after", {"A": "multi\nline", "B": "after"}),
+        ("A=${B}", {"A": "${B}"}),
+        ('A="C:\\\\"\nB="x"', {"A": "C:\\", "B": "x"}),
+        ("A='C:\\\\'\nB='x'", {"A": "C:\\", "B": "x"}),
+        ('A="a\\\\\\"b"', {"A": 'a\\"b'}),
+    ],
+)
+def test_parse(text, expected):
+    assert parse_dotenv(text) == expected
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "invalid line\nB=2",
+        'A="unterminated\nB=2',
+        'A="value" trailing\nB=2',
+    ],
+)
+def test_invalid_statement_skipped(text, caplog):
+    assert parse_dotenv(text) == {"B": "2"}
+    assert "line 1" in caplog.text
+
+
+def test_line_number_after_multiline_value(caplog):
+    parse_dotenv('A="a\nb"\ninvalid line')
+    assert "line 3" in caplog.text
+
+
+def test_load(tmp_path):
+    path = tmp_path / "test.env"
+    path.write_bytes(b"\xef\xbb\xbfVALUE='test'\n")
+    env = Env.load(include_env=False, additional_dotenvs=[str(tmp_path / "test")])
+    assert env.get_string("value") == "test"
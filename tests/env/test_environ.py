@@ -0,0 +1,145 @@
+import asyncio
+import os
+
+import pytest
+
+from bs_config import Env
+from bs_config._implementation.direnv import DirenvEnv
+from bs_config._implementation.prefixed import PrefixedView
+
+
+@pytest.fixture
+def toml_file(tmp_path):
+    path = tmp_path / "config.toml"
+    path.write_text('value = "toml"\n\n[nested]\nvalue = "toml"\n')
+    return path
+
+
+@pytest.mark.parametrize("compiled", [False, True])
+def test_snapshot(monkeypatch, compiled):
+    monkeypatch.setenv("BS_CONFIG_TEST", "a")
+    env = Env.load(compiled=compiled)
+    monkeypatch.setenv("BS_CONFIG_TEST", "b")
+    assert env.get_string("bs-config-test") == "a"
+
+
+@pytest.mark.parametrize("compiled", [False, True])
+def test_live(monkeypatch, compiled):
+    monkeypatch.setenv("BS_CONFIG_TEST", "a")
+    env = Env.load(env_mode="live", compiled=compiled)
+    assert env.get_string("bs-config-test") == "a"
+
+    monkeypatch.setenv("BS_CONFIG_TEST", "b")
+    assert env.get_string("bs-config-test") == "b"
+
+    monkeypatch.delenv("BS_CONFIG_TEST")
+    assert env.get_string("bs-config-test") is None
+
+
+def test_live_not_copied():
+    env = Env.load(env_mode="live")
+    assert isinstance(env, DirenvEnv)
+    assert env.volatile
+
+
+@pytest.mark.parametrize("compiled", [False, True])
+def test_live_precedence(monkeypatch, toml_file, compiled):
+    env = Env.load(toml_configs=[toml_file], env_mode="live", compiled=compiled)
+    assert env.get_string("value") == "toml"
+
+    monkeypatch.setenv("VALUE", "environ")
+    assert env.get_string("value") == "environ"
+    assert env.get_many({"value": (str,)}) == {"value": "environ"}
+
+    monkeypatch.delenv("VALUE")
+    assert env.get_string("value") == "toml"
+
+
+@pytest.mark.parametrize("compiled", [False, True])
+def test_live_scoped(monkeypatch, toml_file, compiled):
+    env = Env.load(toml_configs=[toml_file], env_mode="live", compiled=compiled)
+    scoped = env / "nested"
+    assert scoped.get_string("value") == "toml"
+
+    monkeypatch.setenv("NESTED__VALUE", "environ")
+    assert scoped.get_string("value") == "environ"
+
+
+def test_live_below_stable_layer(monkeypatch):
+    # A live layer with lower precedence than an indexed layer must not win
+    live = Env.load(env_mode="live")
+    env = DirenvEnv(live, {"BS_CONFIG_TEST": "stable"}).compile()
+    monkeypatch.setenv("BS_CONFIG_TEST", "live")
+    assert env.get_string("bs-config-test") == "stable"
+
+    monkeypatch.setenv("BS_CONFIG_OTHER", "live")
+    assert env.get_string("bs-config-other") == "live"
+
+
+def test_aload_live(monkeypatch):
+    env = asyncio.run(Env.aload(env_mode="live"))
+    monkeypatch.setenv("BS_CONFIG_TEST", "a")
+    assert env.get_string("bs-config-test") == "a"
+
+
+def test_invalid_mode():
+    with pytest.raises(ValueError):
+        Env.load(env_mode="invalid")  # type: ignore[arg-type]
+
+
+def test_prefixed_view(monkeypatch):
+    monkeypatch.setenv("BS_CONFIG_TEST__A", "a")
+    view = PrefixedView(os.environ, "BS_CONFIG_TEST__")
+    assert view["A"] == "a"
+    assert view.get("B") is None
+    assert "A" in view
+    assert list(view) == ["A"]
+    assert len(view) == 1
+
+    monkeypatch.setenv("BS_CONFIG_TEST__B", "b")
+    assert view.get("B") == "b"
+
+
+@pytest.mark.parametrize("env_mode", ["snapshot", "live"])
+def test_prefix(monkeypatch, env_mode):
+    monkeypatch.setenv("BSTEST_VALUE", "prefixed")
+    monkeypatch.setenv("BSTEST_NESTED__VALUE", "nested")
+    monkeypatch.setenv("BS_CONFIG_UNRELATED", "unrelated")
+    env = Env.load(env_mode=env_mode, env_prefix="BSTEST_")
+
+    assert env.get_string("value") == "prefixed"
+    assert (env / "nested").get_string("value") == "nested"
+    assert env.get_string("bs-config-unrelated") is None
+    assert env.get_string("bstest-value") is None
+
+
+def test_prefix_snapshot_only_copies_matching(monkeypatch):
+    monkeypatch.setenv("BSTEST_VALUE", "prefixed")
+    env = Env.load(env_prefix="BSTEST_")
+    assert list(env._keys()) == ["value"]  # type: ignore[attr-defined]
+
+
+def test_prefix_live_scoped(monkeypatch):
+    env = Env.load(env_mode="live", env_prefix="BSTEST_", compiled=True)
+    scoped = env / "nested"
+    monkeypatch.setenv("BSTEST_NESTED__VALUE", "nested")
+    assert scoped.get_string("value") == "nested"
+
+
+def test_prefix_dotenv(tmp_path):
+    path = tmp_path / "test.env"
+    path.write_text("BSTEST_VALUE=prefixed\nOTHER=other\n")
+    env = Env.load(
+        include_env=False,
+        additional_dotenvs=[str(tmp_path / "test")],
+        env_prefix="BSTEST_",
+    )
+    assert env.get_string("value") == "prefixed"
+    assert env.get_string("other") is None
+
+    with env.watch(interval=60) as watcher:
+        path.write_text("BSTEST_VALUE=changed\nOTHER=other\n")
+        watcher.check()
+
+    assert env.get_string("value") == "changed"
+    assert env.get_string("other") is None
@@ -0,0 +1,233 @@
+import threading
+from datetime import date, datetime, time, timedelta
+
+import pytest
+
+from bs_config import Env
+from bs_config._implementation.direnv import DirenvEnv
+
+
+@pytest.fixture
+def env(example_file_loader) -> Env:
+    toml_env = Env.load(
+        include_env=False,
+        toml_configs=[example_file_loader("example.toml")],
+    )
+    return DirenvEnv(
+        toml_env,
+        {
+            "TOP__STRING": "from-env",
+            "TOP__STRING_BLANK": "  ",
+            "TOP__INT": "  ",
+            "TOP__LIST_INTS": "4,5",
+            "OTHER": "value",
+        },
+    )
+
+
+@pytest.fixture
+def frozen(env) -> Env:
+    return env.freeze()
+
+
+def test_freeze_idempotent(frozen):
+    assert frozen.freeze() is frozen
+    assert frozen.compile() is frozen
+
+
+@pytest.mark.parametrize(
+    "key",
+    [
+        "top.string",
+        "top.string-blank",
+        "top.string-whitespace",
+        "top.float",
+        "other",
+        "missing",
+        "top.missing",
+        "top.nested.foo",
+        "does-this",
+        "top.list_ints",
+        "top.string_whitespace",
+    ],
+)
+def test_get_string_same_as_layered(env, frozen, key):
+    assert frozen.get_string(key) == env.get_string(key)
+
+
+def test_typed_values(frozen):
+    assert frozen.get_string("top.string") == "from-env"
+    assert frozen.get_int("top.int") == 123
+    assert frozen.get_int_list("top.list-ints") == [4, 5]
+    assert frozen.get_bool("top.bool", default=False) is True
+    assert frozen.get_string_list("top.list-strings") == ["foo", "bar"]
+    assert frozen.get_date("top.date") == date(1979, 5, 27)
+    assert frozen.get_time("top.time") == time(6, 32)
+    assert isinstance(
+        frozen.get_datetime("top.datetime-naive", is_naive=True), datetime
+    )
+    assert frozen.get_duration("top.duration") == timedelta(
+        weeks=1,
+        days=2,
+        hours=3,
+        minutes=4,
+        seconds=5,
+        milliseconds=6,
+        microseconds=107,
+    )
+
+
+def test_transform_not_shared(frozen):
+    assert frozen.get_string("top.string", transform=str.upper) == "FROM-ENV"
+    assert frozen.get_string("top.string") == "from-env"
+    assert frozen.get_string("top.string", transform=len) == 8
+
+
+def test_returned_lists_are_copies(frozen):
+    first = frozen.get_string_list("top.list-strings")
+    assert first is not None
+    first.append("baz")
+    assert frozen.get_string_list("top.list-strings") == ["foo", "bar"]
+
+
+def test_converted_on_access(frozen):
+    # Invalid values only fail when they are read
+    with pytest.raises(ValueError):
+        frozen.get_int("top.float")
+
+    with pytest.raises(ValueError):
+        frozen.get_string("top.nested")
+
+
+def test_transform_results_not_stored(frozen):
+    for _ in range(100):
+        assert frozen.get_string("top.string", transform=lambda v: v.upper()) == (
+            "FROM-ENV"
+        )
+        assert frozen.get_string_list(
+            "top.list-strings", transform=lambda v: v.upper()
+        ) == ["FOO", "BAR"]
+
+    [usage, *_] = frozen.memory_report()
+    assert usage.values == 2
+
+
+def test_non_canonical_keys(env, frozen):
+    assert frozen.get_int_list("top.list_ints") == [4, 5]
+    with pytest.warns(UserWarning, match="kebab-case"):
+        assert frozen.get_string("TOP.STRING") == "from-env"
+
+    with pytest.warns(UserWarning, match="kebab-case"):
+        assert env.get_string("TOP.STRING") == "from-env"
+
+
+def test_misses_not_stored(frozen):
+    for i in range(1000):
+        assert frozen.get_string(f"missing-{i}") is None
+        assert frozen.get_duration(f"missing-{i}") is None
+        assert frozen.get_string(f"top.list_ints{i}") is None
+
+    [usage, *_] = frozen.memory_report()
+    assert usage.values == 0
+
+
+@pytest.mark.parametrize("key", ["MyKey", "Table.Inner", "table.lower", "mykey"])
+def test_mixed_case_toml_keys_same_as_layered(tmp_path, key):
+    toml = tmp_path / "config.toml"
+    toml.write_text(
+        'MyKey = "upper"\n[Table]\nInner = "nested"\n[table]\nlower = "x"\n'
+    )
+    env = Env.load(include_env=False, toml_configs=[toml])
+    frozen = env.freeze()
+
+    if key == key.lower():
+        assert frozen.get_string(key) == env.get_string(key)
+    else:
+        with pytest.warns(UserWarning, match="kebab-case"):
+            expected = env.get_string(key)
+        with pytest.warns(UserWarning, match="kebab-case"):
+            assert frozen.get_string(key) == expected
+        assert expected is not None
+
+
+def test_default(frozen):
+    assert frozen.get_int("missing", default=42) == 42
+    assert frozen.get_int("missing", default=43) == 43
+    assert frozen.get_duration("missing", default=timedelta(1)) == timedelta(1)
+
+
+def test_missing_required(frozen):
+    with pytest.raises(ValueError, match="missing"):
+        frozen.get_string("missing", required=True)
+
+    with pytest.raises(ValueError, match="missing"):
+        frozen.get_duration("missing", required=True)
+
+
+def test_scoped(frozen):
+    scoped = frozen / "top" / "nested"
+    assert scoped.get_string("foo") == "nested"
+    assert (frozen / "top").get_duration("duration") == frozen.get_duration(
+        "top.duration"
+    )
+
+
+def test_unaffected_by_source_changes(tmp_path):
+    path = tmp_path / "config.toml"
+    path.write_text('value = "before"\n')
+    env = Env.load(include_env=False, toml_configs=[path])
+    frozen = env.freeze()
+
+    with env.watch(interval=60) as watcher:
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text('value = "after"\n')
+        tmp.replace(path)
+        watcher.check()
+
+    assert env.get_string("value") == "after"
+    assert frozen.get_string("value") == "before"
+
+
+def test_live_environ_snapshotted(monkeypatch):
+    monkeypatch.setenv("FROZEN_TEST_VALUE", "before")
+    frozen = Env.load(env_mode="live").freeze()
+
+    monkeypatch.setenv("FROZEN_TEST_VALUE", "after")
+    assert frozen.get_string("frozen-test-value") == "before"
+
+
+def test_fallback_flattened(tmp_path, example_file_loader):
+    path = tmp_path / "config.toml"
+    path.write_text('own = "value"\n')
+    fallback = DirenvEnv(
+        Env.load(
+            include_env=False,
+            toml_configs=[example_file_loader("example.toml")],
+        ),
+        {"OTHER": "value"},
+    )
+    frozen = Env.load(
+        include_env=False,
+        toml_configs=[path],
+        fallback=fallback,
+    ).freeze()
+
+    assert frozen.get_string("own") == "value"
+    assert frozen.get_string("other") == "value"
+    assert frozen.get_string("top.string") == "foo"
+
+
+def test_concurrent_reads(frozen):
+    results: list[int | None] = []
+
+    def read() -> None:
+        for _ in range(100):
+            results.append(frozen.get_int("top.int"))
+
+    threads = [threading.Thread(target=read) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == [123] * 400
@@ -0,0 +1,161 @@
+from datetime import timedelta
+
+import pytest
+
+from bs_config import Env
+
+
+@pytest.fixture
+def env(tmp_path, monkeypatch) -> Env:
+    toml = tmp_path / "config.toml"
+    toml.write_text('name = "toml"\nport = 80\n[db]\nhost = "db"\n')
+    dotenv = tmp_path / "local.env"
+    dotenv.write_text("PORT=8080\nTIMEOUT__SECONDS=5\n")
+    monkeypatch.setenv("NAME", "environ")
+    return Env.load(
+        toml_configs=[toml],
+        additional_dotenvs=[str(tmp_path / "local")],
+    )
+
+
+def test_counts_reads_per_source(env, tmp_path):
+    instrumented = env.instrumented()
+    assert instrumented.get_string("name") == "environ"
+    assert instrumented.get_int("port") == 8080
+    assert instrumented.get_int("port") == 8080
+    assert instrumented.get_int("missing", default=1) == 1
+
+    reads = instrumented.snapshot()["reads"]
+    assert reads == {
+        "name": {"count": 1, "sources": {"environ": 1}},
+        "port": {"count": 2, "sources": {str(tmp_path / "local.env"): 2}},
+        "missing": {"count": 1, "sources": {"default": 1}},
+    }
+
+
+def test_scoped_reads_use_full_key(env, tmp_path):
+    instrumented = env.instrumented()
+    assert (instrumented / "db").get_string("host") == "db"
+
+    reads = instrumented.snapshot()["reads"]
+    assert reads == {
+        "db.host": {"count": 1, "sources": {str(tmp_path / "config.toml"): 1}}
+    }
+
+
+def test_duration_is_a_single_read(env, tmp_path):
+    instrumented = env.instrumented()
+    assert instrumented.get_duration("timeout") == timedelta(seconds=5)
+
+    reads = instrumented.snapshot()["reads"]
+    assert reads == {
+        "timeout": {"count": 1, "sources": {str(tmp_path / "local.env"): 1}}
+    }
+
+
+def test_latency_histogram(env):
+    instrumented = env.instrumented()
+    for _ in range(10):
+        instrumented.get_string("name")
+
+    latency = instrumented.snapshot()["latency"]
+    assert latency["count"] == 10
+    assert sum(latency["buckets"]) == 10
+    assert len(latency["buckets"]) == len(latency["bounds"]) + 1
+    assert latency["sum"] > 0
+
+
+def test_failed_conversion_is_recorded(env, monkeypatch):
+    monkeypatch.setenv("PORT", "abc")
+    instrumented = Env.load().instrumented()
+    with pytest.raises(ValueError):
+        instrumented.get_int("port")
+
+    assert instrumented.snapshot()["reads"]["port"]["sources"] == {"environ": 1}
+
+
+def test_fallback_source(env, tmp_path):
+    toml = tmp_path / "other.toml"
+    toml.write_text('other = "value"\n')
+    instrumented = Env.load(
+        include_env=False,
+        toml_configs=[toml],
+        fallback=env.compile(),
+    ).instrumented()
+    assert instrumented.get_string("name") == "environ"
+    assert instrumented.get_string("other") == "value"
+
+    reads = instrumented.snapshot()["reads"]
+    assert reads["name"]["sources"] == {"fallback": 1}
+    assert reads["other"]["sources"] == {str(toml): 1}
+
+
+def test_reset(env):
+    instrumented = env.instrumented()
+    instrumented.get_string("name")
+    instrumented.reset()
+
+    snapshot = instrumented.snapshot()
+    assert snapshot["reads"] == {}
+    assert snapshot["latency"]["count"] == 0
+
+
+def test_compiled(env, tmp_path):
+    instrumented = env.compile().instrumented()
+    assert instrumented.get_int("port") == 8080
+    assert instrumented.get_string("db.host") == "db"
+
+    reads = instrumented.snapshot()["reads"]
+    assert reads["port"]["sources"] == {str(tmp_path / "local.env"): 1}
+    assert reads["db.host"]["sources"] == {str(tmp_path / "config.toml"): 1}
+
+
+@pytest.mark.parametrize(
+    "wrap",
+    [
+        lambda env: env.cached(),
+        lambda env: env.traced(),
+        lambda env: env.observe(lambda resolution: None),
+    ],
+    ids=["cached", "traced", "observed"],
+)
+def test_wrapped_sources(env, tmp_path, wrap):
+    instrumented = wrap(env).instrumented()
+    assert instrumented.get_string("name") == "environ"
+    assert (instrumented / "db").get_string("host") == "db"
+    assert instrumented.get_duration("timeout") == timedelta(seconds=5)
+    assert instrumented.get_int("missing", default=1) == 1
+
+    reads = instrumented.snapshot()["reads"]
+    assert reads == {
+        "name": {"count": 1, "sources": {"environ": 1}},
+        "db.host": {"count": 1, "sources": {str(tmp_path / "config.toml"): 1}},
+        "timeout": {"count": 1, "sources": {str(tmp_path / "local.env"): 1}},
+        "missing": {"count": 1, "sources": {"default": 1}},
+    }
+
+
+def test_scoped_wrapped_source(env, tmp_path):
+    instrumented = (env.cached() / "db").instrumented()
+    assert instrumented.get_string("host") == "db"
+
+    reads = instrumented.snapshot()["reads"]
+    assert reads == {
+        "host": {"count": 1, "sources": {str(tmp_path / "config.toml"): 1}}
+    }
+
+
+def test_reads_through_cache(env):
+    cached = env.cached()
+    instrumented = cached.instrumented()
+    assert instrumented.get_string("name") == "environ"
+    assert instrumented.get_string("name") == "environ"
+    assert cached.cache_info().hits == 1
+
+
+def test_unknown_source(env):
+    instrumented = env.freeze().instrumented()
+    assert instrumented.get_string("name") == "environ"
+
+    reads = instrumented.snapshot()["reads"]
+    assert reads == {"name": {"count": 1, "sources": {"unknown": 1}}}
@@ -0,0 +1,78 @@
+import pickle
+import warnings
+
+import pytest
+
+from bs_config import ConfigKey, Env
+
+
+@pytest.fixture
+def env() -> Env:
+    return Env.load_from_dict(
+        {
+            "NESTED__MY_INT": "42",
+            "NESTED__MY_LIST": "a,b",
+        }
+    )
+
+
+@pytest.fixture
+def toml_env(example_file_loader) -> Env:
+    return Env.load(
+        include_env=False,
+        toml_configs=[example_file_loader("example.toml")],
+    )
+
+
+def test_translation():
+    key = Env.key("nested.my-int")
+    assert isinstance(key, ConfigKey)
+    assert key == "nested.my-int"
+    assert key.parts == ("nested", "my-int")
+    assert key.variable_name == "NESTED__MY_INT"
+
+
+def test_key_of_key_is_same():
+    key = Env.key("nested.my-int")
+    assert ConfigKey(key) is key
+
+
+def test_empty_key():
+    with pytest.raises(ValueError):
+        Env.key("")
+
+
+def test_warns_once_on_creation(env):
+    with pytest.warns(UserWarning):
+        key = Env.key("Nested.My-Int")
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        assert env.get_int(key) == 42
+
+
+def test_direnv_lookup(env):
+    assert env.get_int(Env.key("nested.my-int")) == 42
+    assert env.get_string_list(Env.key("nested.my-list")) == ["a", "b"]
+
+
+def test_toml_lookup(toml_env):
+    assert toml_env.get_string(Env.key("top.nested.foo")) == "nested"
+    assert toml_env.get_int(Env.key("top.int")) == 123
+
+
+def test_compiled_lookup(toml_env):
+    compiled = toml_env.compile()
+    assert compiled.get_string(Env.key("top.nested.foo")) == "nested"
+
+
+def test_missing_required_message(env):
+    with pytest.raises(ValueError, match="nested.missing"):
+        env.get_int(Env.key("nested.missing"), required=True)
+
+
+def test_pickle():
+    key = Env.key("nested.my-int")
+    restored = pickle.loads(pickle.dumps(key))
+    assert restored == key
+    assert restored.variable_name == key.variable_name
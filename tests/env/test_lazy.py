@@ -0,0 +1,93 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from bs_config import Env, ParseCache, ParseCacheInfo
+from bs_config._implementation.toml import TomlEnv
+
+
+@pytest.fixture
+def toml_file(tmp_path):
+    path = tmp_path / "config.toml"
+    path.write_text('value = "toml"\n\n[nested]\nvalue = "nested"\n')
+    return path
+
+
+@pytest.fixture
+def parse(mocker):
+    return mocker.spy(TomlEnv, "_parse")
+
+
+def test_parsed_on_first_access(toml_file, parse):
+    env = Env.load(include_env=False, toml_configs=[toml_file], lazy=True)
+    parse.assert_not_called()
+
+    assert env.get_string("value") == "toml"
+    assert (env / "nested").get_string("value") == "nested"
+    assert env.get_string("missing") is None
+    parse.assert_called_once()
+
+
+def test_not_parsed_if_shadowed(toml_file, parse, monkeypatch):
+    monkeypatch.setenv("VALUE", "environ")
+    env = Env.load(toml_configs=[toml_file], lazy=True)
+    assert env.get_string("value") == "environ"
+    parse.assert_not_called()
+
+
+def test_aload(toml_file, parse):
+    env = asyncio.run(Env.aload(include_env=False, toml_configs=[toml_file], lazy=True))
+    parse.assert_not_called()
+    assert env.get_string("value") == "toml"
+
+
+def test_parsed_once_concurrently(toml_file, parse):
+    env = Env.load(include_env=False, toml_configs=[toml_file], lazy=True)
+    thread_count = 8
+    barrier = threading.Barrier(thread_count)
+
+    def _get(_: int) -> str | None:
+        barrier.wait()
+        return env.get_string("value")
+
+    with ThreadPoolExecutor(thread_count) as executor:
+        results = list(executor.map(_get, range(thread_count)))
+
+    assert results == ["toml"] * thread_count
+    parse.assert_called_once()
+
+
+def test_error_on_first_access(tmp_path):
+    path = tmp_path / "invalid.toml"
+    path.write_text("value = \n")
+    env = Env.load(include_env=False, toml_configs=[path], lazy=True)
+
+    with pytest.raises(ValueError):
+        env.get_string("value")
+
+    path.write_text('value = "fixed"\n')
+    assert env.get_string("value") == "fixed"
+
+
+def test_missing_file(tmp_path):
+    env = Env.load(
+        include_env=False,
+        toml_configs=[tmp_path / "missing.toml"],
+        lazy=True,
+    )
+    assert not isinstance(env, TomlEnv)
+
+
+def test_parse_cache(toml_file, tmp_path):
+    cache = ParseCache(tmp_path / "cache")
+    env = Env.load(
+        include_env=False,
+        toml_configs=[toml_file],
+        lazy=True,
+        parse_cache=cache,
+    )
+    assert cache.cache_info() == ParseCacheInfo(hits=0, misses=0)
+    assert env.get_string("value") == "toml"
+    assert cache.cache_info() == ParseCacheInfo(hits=0, misses=1)
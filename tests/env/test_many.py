@@ -0,0 +1,142 @@
+from datetime import UTC, date, datetime, time, timedelta
+
+import pytest
+
+from bs_config import Env, KeySpec
+from bs_config._implementation.direnv import DirenvEnv
+
+
+@pytest.fixture(params=["layered", "compiled", "cached"])
+def env(request, example_file_loader) -> Env:
+    toml_env = Env.load(
+        include_env=False,
+        toml_configs=[example_file_loader("example.toml")],
+    )
+    result: Env = DirenvEnv(
+        toml_env,
+        {
+            "STRING": "abc",
+            "INT": "42",
+            "BOOL": "yes",
+            "LIST": "a, b",
+            "INT_LIST": "1,2",
+            "DATETIME": "1970-01-01T00:00:00Z",
+            "DATE": "1970-01-01",
+            "TIME": "12:34",
+            "DURATION__MINUTES": "2",
+            "INVALID_INT": "abc",
+        },
+    )
+    if request.param == "compiled":
+        return result.compile()
+    if request.param == "cached":
+        return result.cached()
+    return result
+
+
+def test_all_types(env):
+    values = env.get_many(
+        {
+            "string": KeySpec(str),
+            "int": KeySpec(int),
+            "bool": KeySpec(bool),
+            "list": KeySpec(list[str]),
+            "int-list": KeySpec(list[int]),
+            "datetime": KeySpec(datetime),
+            "date": KeySpec(date),
+            "time": KeySpec(time),
+            "duration": KeySpec(timedelta),
+        }
+    )
+    assert values == {
+        "string": "abc",
+        "int": 42,
+        "bool": True,
+        "list": ["a", "b"],
+        "int-list": [1, 2],
+        "datetime": datetime(1970, 1, 1, tzinfo=UTC),
+        "date": date(1970, 1, 1),
+        "time": time(12, 34),
+        "duration": timedelta(minutes=2),
+    }
+
+
+def test_from_toml_layer(env):
+    values = env.get_many(
+        {
+            "top.int": KeySpec(int),
+            "top.datetime-naive": KeySpec(datetime, is_naive=True),
+            "top.duration": KeySpec(timedelta),
+            "top.float": KeySpec(str, transform=float),
+        }
+    )
+    assert values["top.int"] == 123
+    assert values["top.datetime-naive"] == datetime(1979, 5, 27, 7, 32)
+    assert values["top.duration"].days == 9
+    assert values["top.float"] == 13.4
+
+
+def test_plain_tuples(env):
+    values = env.get_many(
+        {
+            "int": (int, None, True),
+            "missing": (list[int], [1]),
+        }
+    )
+    assert values == {"int": 42, "missing": [1]}
+
+
+def test_defaults(env):
+    values = env.get_many(
+        {
+            "missing-string": KeySpec(str),
+            "missing-int": KeySpec(int, default=1),
+            "missing-bool": KeySpec(bool),
+            "missing-duration": KeySpec(timedelta, default=timedelta(seconds=1)),
+        }
+    )
+    assert values == {
+        "missing-string": None,
+        "missing-int": 1,
+        "missing-bool": False,
+        "missing-duration": timedelta(seconds=1),
+    }
+
+
+def test_errors_collected(env):
+    with pytest.raises(ValueError) as exc_info:
+        env.get_many(
+            {
+                "int": KeySpec(int),
+                "invalid-int": KeySpec(int),
+                "missing": KeySpec(str, required=True),
+                "missing-duration": KeySpec(timedelta, required=True),
+                "top.string.nested": KeySpec(str),
+            }
+        )
+
+    message = str(exc_info.value)
+    assert "4 config values" in message
+    for key in ["invalid-int", "missing", "missing-duration", "top.string.nested"]:
+        assert f"- {key}:" in message
+
+
+def test_unsupported_type(env):
+    with pytest.raises(ValueError):
+        env.get_many({"int": KeySpec(float)})
+
+
+def test_required_bool(env):
+    with pytest.raises(ValueError):
+        env.get_many({"bool": KeySpec(bool, required=True)})
+
+
+def test_scoped(env):
+    scoped = env / "top"
+    values = scoped.get_many({"int": KeySpec(int), "nested.foo": KeySpec(str)})
+    assert values == {"int": 123, "nested.foo": "nested"}
+
+
+def test_precompiled_keys(env):
+    key = Env.key("int")
+    assert env.get_many({key: KeySpec(int)}) == {key: 42}
@@ -0,0 +1,126 @@
+import pytest
+
+from bs_config import Env, MemoryUsage
+from bs_config._implementation.memory import Sizer
+
+
+@pytest.fixture
+def toml(tmp_path):
+    path = tmp_path / "config.toml"
+    path.write_text(
+        """
+name = "app"
+ports = [80, 443]
+
+[db]
+host = "localhost"
+port = 5432
+"""
+    )
+    return path
+
+
+@pytest.fixture
+def env(toml) -> Env:
+    return Env.load(include_env=False, toml_configs=[toml], fallback=_dotenv())
+
+
+def _dotenv() -> Env:
+    return Env.load_from_dict({"NAME": "other", "LEVEL": "debug"})
+
+
+def _by_name(report: list[MemoryUsage]) -> dict[str, MemoryUsage]:
+    return {usage.name: usage for usage in report}
+
+
+def test_layers(env, toml):
+    report = env.memory_report()
+
+    assert [usage.name for usage in report] == [str(toml), "DirenvEnv"]
+    toml_usage, direnv_usage = report
+    assert toml_usage.kind == "TomlEnv"
+    # name, ports, db, db.host, db.port
+    assert toml_usage.keys == 5
+    assert toml_usage.values == 4
+    assert toml_usage.retained_bytes > 0
+    assert toml_usage.scope is None
+    assert direnv_usage.kind == "DirenvEnv"
+    assert (direnv_usage.keys, direnv_usage.values) == (2, 2)
+    assert direnv_usage.retained_bytes > 0
+
+
+def test_wrappers(env):
+    wrapped = env.compile().cached()
+    wrapped.get_string("name")
+
+    report = _by_name(wrapped.memory_report())
+    assert list(report)[:2] == ["cache", "index"]
+    assert report["cache"].keys == 1
+    assert report["index"].kind == "CompiledEnv"
+    assert report["index"].retained_bytes > 0
+
+
+def test_instrumented_and_traced(env):
+    instrumented = env.instrumented()
+    instrumented.get_string("name")
+    assert _by_name(instrumented.memory_report())["metrics"].keys == 1
+
+    traced = env.traced()
+    traced.get_string("name")
+    traced.get_int("db.port")
+    assert _by_name(traced.memory_report())["trace"].keys == 2
+
+
+def test_frozen(env):
+    frozen = env.freeze()
+    frozen.get_string("name")
+
+    (usage,) = frozen.memory_report()
+    assert (usage.name, usage.kind) == ("frozen", "FrozenEnv")
+    assert usage.values == 1
+
+
+def test_snapshot(tmp_path, env):
+    artifact = tmp_path / "config.bin"
+    env.save_artifact(artifact)
+
+    (usage,) = Env.load(include_env=False, artifact=artifact).memory_report()
+    assert (usage.name, usage.kind) == ("snapshot", "SnapshotEnv")
+    assert usage.retained_bytes == artifact.stat().st_size
+
+
+def test_scopes(env):
+    (env / "db").get_string("host")
+
+    scoped = [usage for usage in env.memory_report() if usage.scope == "db"]
+    assert [usage.kind for usage in scoped] == ["TomlEnv", "DirenvEnv"]
+    # The scoped TOML values are part of the unscoped tree, which was counted already
+    assert scoped[0].retained_bytes == 0
+
+
+def test_shared_values_counted_once(toml):
+    compiled = Env.load(include_env=False, toml_configs=[toml]).compile()
+    index = compiled._CompiledEnv__tables  # type: ignore[attr-defined]
+
+    report = _by_name(compiled.memory_report())
+    # The index references the values of the TOML layer, which are counted there
+    assert report["index"].retained_bytes < Sizer().size(index)
+
+
+def test_live_environ_not_retained(monkeypatch):
+    monkeypatch.setenv("MEMORY_TEST", "value")
+    (usage,) = Env.load(env_mode="live").memory_report()
+
+    assert usage.name == "environ"
+    assert usage.keys > 0
+    assert usage.retained_bytes == 0
+
+
+def test_lazy_not_parsed(toml):
+    env = Env.load(include_env=False, toml_configs=[toml], lazy=True)
+    (usage,) = env.memory_report()
+
+    assert (usage.keys, usage.values, usage.retained_bytes) == (0, 0, 0)
+    assert env.get_string("name") == "app"
+    (usage,) = env.memory_report()
+    assert usage.keys == 5
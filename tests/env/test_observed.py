@@ -0,0 +1,106 @@
+import logging
+from datetime import timedelta
+
+import pytest
+
+from bs_config import Env, Resolution
+
+
+@pytest.fixture
+def env(tmp_path, monkeypatch) -> Env:
+    toml = tmp_path / "config.toml"
+    toml.write_text('port = 80\nsecret = "toml"\n[timeout]\nseconds = 5\n')
+    monkeypatch.setenv("PORT", "8080")
+    monkeypatch.setenv("INVALID", "abc")
+    return Env.load(toml_configs=[toml])
+
+
+def test_resolution(env):
+    resolutions: list[Resolution] = []
+    observed = env.observe(resolutions.append)
+    assert observed.get_int("port") == 8080
+    assert observed.get_string("missing", default="x") == "x"
+
+    first, second = resolutions
+    assert first.key == "port"
+    assert first.accessor == "get_int"
+    assert first.result == 8080
+    assert first.source == "environ"
+    assert not first.used_default
+    assert first.elapsed > 0
+    assert first.error is None
+
+    assert second.result == "x"
+    assert second.source == "default"
+    assert second.used_default
+
+
+def test_scoped_and_duration(env, tmp_path):
+    resolutions: list[Resolution] = []
+    observed = env.observe(resolutions.append)
+    assert (observed / "timeout").get_int("seconds") == 5
+    assert observed.get_duration("timeout") == timedelta(seconds=5)
+
+    assert [(r.key, r.accessor, r.source) for r in resolutions] == [
+        ("timeout.seconds", "get_int", str(tmp_path / "config.toml")),
+        ("timeout", "get_duration", str(tmp_path / "config.toml")),
+    ]
+
+
+def test_error(env):
+    resolutions: list[Resolution] = []
+    observed = env.observe(resolutions.append)
+    with pytest.raises(ValueError):
+        observed.get_int("invalid")
+
+    (resolution,) = resolutions
+    assert resolution.source == "environ"
+    assert resolution.result is None
+    assert isinstance(resolution.error, ValueError)
+
+
+def test_sample_rate(env, monkeypatch):
+    sampled: list[Resolution] = []
+    every: list[Resolution] = []
+    observed = env.observe(sampled.append, sample_rate=0.5)
+    assert observed.observe(every.append) is observed
+
+    monkeypatch.setattr(
+        "bs_config._implementation.observed.random", iter([0.4, 0.6] * 5).__next__
+    )
+    for _ in range(10):
+        assert observed.get_int("port") == 8080
+
+    assert len(sampled) == 5
+    assert len(every) == 10
+
+
+@pytest.mark.parametrize("sample_rate", [0, -1, 1.5])
+def test_invalid_sample_rate(env, sample_rate):
+    with pytest.raises(ValueError):
+        env.observe(lambda _: None, sample_rate=sample_rate)
+
+
+def test_remove_observer(env):
+    resolutions: list[Resolution] = []
+    observed = env.observe(resolutions.append)
+    scoped = observed / "timeout"
+    observed.remove_observer(resolutions.append)
+
+    assert observed.get_int("port") == 8080
+    assert scoped.get_int("seconds") == 5
+    assert resolutions == []
+
+    with pytest.raises(ValueError):
+        observed.remove_observer(resolutions.append)
+
+
+def test_failing_observer(env, caplog):
+    def _fail(_: Resolution) -> None:
+        raise RuntimeError("broken")
+
+    observed = env.observe(_fail)
+    with caplog.at_level(logging.ERROR):
+        assert observed.get_int("port") == 8080
+
+    assert "failed" in caplog.text
@@ -0,0 +1,98 @@
+import asyncio
+import os
+
+import pytest
+
+from bs_config import Env, ParseCache, ParseCacheInfo
+from bs_config._implementation.toml import TomlEnv
+
+
+@pytest.fixture
+def cache(tmp_path) -> ParseCache:
+    return ParseCache(tmp_path / "cache")
+
+
+@pytest.fixture
+def toml_file(tmp_path):
+    path = tmp_path / "config.toml"
+    path.write_text('value = "a"\nfloat = 1.5\ndate = 2020-01-01\n')
+    return path
+
+
+def _load(toml_file, cache) -> Env:
+    return Env.load(include_env=False, toml_configs=[toml_file], parse_cache=cache)
+
+
+def test_hit(toml_file, cache, mocker):
+    env = _load(toml_file, cache)
+    assert cache.cache_info() == ParseCacheInfo(hits=0, misses=1)
+
+    parse = mocker.spy(TomlEnv, "_parse")
+    cached_env = _load(toml_file, cache)
+    parse.assert_not_called()
+    assert cache.cache_info() == ParseCacheInfo(hits=1, misses=1)
+
+    for key in ["value", "float"]:
+        assert cached_env.get_string(key) == env.get_string(key)
+    assert cached_env.get_date("date") == env.get_date("date")
+
+
+def test_shared_between_instances(toml_file, cache):
+    _load(toml_file, cache)
+    other = ParseCache(cache.directory)
+    _load(toml_file, other)
+    assert other.cache_info() == ParseCacheInfo(hits=1, misses=0)
+
+
+def test_stale_content(toml_file, cache):
+    _load(toml_file, cache)
+    stat = toml_file.stat()
+    # Same size and modification time, only the content hash differs
+    toml_file.write_text('value = "b"\nfloat = 1.5\ndate = 2020-01-01\n')
+    os.utime(toml_file, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+    env = _load(toml_file, cache)
+    assert env.get_string("value") == "b"
+    assert cache.cache_info() == ParseCacheInfo(hits=0, misses=2)
+
+    _load(toml_file, cache)
+    assert cache.cache_info() == ParseCacheInfo(hits=1, misses=2)
+
+
+def test_corrupt_entry(toml_file, cache):
+    _load(toml_file, cache)
+    for entry in cache.directory.iterdir():
+        entry.write_bytes(b"garbage")
+
+    env = _load(toml_file, cache)
+    assert env.get_string("value") == "a"
+    assert cache.cache_info().misses == 2
+
+
+def test_missing_file(tmp_path, cache):
+    env = _load(tmp_path / "missing.toml", cache)
+    assert env.get_string("value") is None
+    assert cache.cache_info() == ParseCacheInfo(hits=0, misses=0)
+
+
+def test_dotenv(tmp_path, cache):
+    path = tmp_path / "test.env"
+    path.write_text("VALUE=a\n")
+    for _ in range(2):
+        env = Env.load(
+            include_env=False,
+            additional_dotenvs=[str(tmp_path / "test")],
+            parse_cache=cache,
+        )
+        assert env.get_string("value") == "a"
+
+    assert cache.cache_info() == ParseCacheInfo(hits=1, misses=1)
+
+
+def test_aload(toml_file, cache):
+    _load(toml_file, cache)
+    env = asyncio.run(
+        Env.aload(include_env=False, toml_configs=[toml_file], parse_cache=cache)
+    )
+    assert env.get_string("value") == "a"
+    assert cache.cache_info().hits == 1
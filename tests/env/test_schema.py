@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+
+import pytest
+
+from bs_config import Env, compile_schema
+
+
+@dataclass(frozen=True, slots=True)
+class DatabaseSettings:
+    host: str
+    port: int = 5432
+
+
+@dataclass(frozen=True, slots=True)
+class Settings:
+    database: DatabaseSettings
+    name: str
+    debug: bool = False
+    timeout: timedelta | None = None
+    tags: list[str] = field(default_factory=list)
+    ids: list[int] | None = None
+    ratio: float = field(default=1.0, metadata={"transform": float})
+    started_at: datetime | None = field(default=None, metadata={"is_naive": True})
+    custom: str | None = field(default=None, metadata={"key": "other-name"})
+
+
+@pytest.fixture
+def env() -> Env:
+    return Env.load_from_dict(
+        {
+            "DATABASE__HOST": "localhost",
+            "NAME": "app",
+            "DEBUG": "true",
+            "TIMEOUT__SECONDS": "30",
+            "IDS": "1,2",
+            "RATIO": "0.5",
+            "STARTED_AT": "2020-01-01T00:00:00",
+            "OTHER_NAME": "custom",
+        }
+    )
+
+
+def test_resolve(env):
+    settings = compile_schema(Settings)(env)
+    assert settings == Settings(
+        database=DatabaseSettings(host="localhost"),
+        name="app",
+        debug=True,
+        timeout=timedelta(seconds=30),
+        tags=[],
+        ids=[1, 2],
+        ratio=0.5,
+        started_at=datetime(2020, 1, 1),
+        custom="custom",
+    )
+
+
+def test_resolve_compiled(env):
+    settings = compile_schema(Settings)(env.compile())
+    assert settings.database.host == "localhost"
+
+
+def test_default_factory_creates_new_instances():
+    env = Env.load_from_dict({"DATABASE__HOST": "h", "NAME": "n"})
+    resolve = compile_schema(Settings)
+    assert resolve(env).tags is not resolve(env).tags
+
+
+def test_missing_required_reported_together():
+    resolve = compile_schema(Settings)
+    with pytest.raises(ValueError) as exc_info:
+        resolve(Env.load_from_dict({}))
+
+    message = str(exc_info.value)
+    assert "database.host" in message
+    assert "name" in message
+
+
+def test_spec_keys_precompiled():
+    spec = compile_schema(Settings).spec
+    assert "database.port" in spec
+    key = next(iter(spec))
+    assert hasattr(key, "variable_name")
+
+
+def test_resolve_uses_precompiled_lookups(env, monkeypatch):
+    import bs_config._implementation.many as many
+
+    resolve = compile_schema(Settings)
+
+    def _fail(*args, **kwargs):
+        raise AssertionError("spec is normalized again")
+
+    monkeypatch.setattr(many, "normalize_spec", _fail)
+    monkeypatch.setattr(Env, "get_many", _fail)
+    assert resolve(env).timeout == timedelta(seconds=30)
+
+
+def test_not_a_dataclass():
+    with pytest.raises(ValueError):
+        compile_schema(int)
+
+
+def test_bool_without_default():
+    @dataclass
+    class Invalid:
+        flag: bool
+
+    with pytest.raises(ValueError):
+        compile_schema(Invalid)
+
+
+def test_unsupported_type():
+    @dataclass
+    class Invalid:
+        value: float
+
+    with pytest.raises(ValueError):
+        compile_schema(Invalid)
+
+
+def test_unsupported_union():
+    @dataclass
+    class Invalid:
+        value: int | str
+
+    with pytest.raises(ValueError):
+        compile_schema(Invalid)
@@ -2,6 +2,7 @@ from datetime import UTC, date, datetime, time
 
 import pytest
 
+from bs_config._implementation.layer import LayerEnv
 from bs_config.env import Env
 
 
@@ -108,3 +109,68 @@ def test_get_scoped_date():
     scoped = env / "a"
     value = scoped.get_date("b")
     assert value == date(1970, 1, 1)
+
+
+def test_scope_is_cached(env):
+    assert env / "alpha" is env / "alpha"
+    assert env / "alpha" / "beta" is env / "alpha" / "beta"
+
+
+def test_nested_scopes_are_collapsed(env):
+    nested = env / "alpha" / "beta"
+    # a single layer with the default fallback, no wrappers
+    assert isinstance(nested, LayerEnv)
+    assert not isinstance(nested.parent, LayerEnv)
+
+
+def test_scoped_missing_required_message(env):
+    scoped = env / "alpha" / "beta"
+    with pytest.raises(ValueError, match="alpha.beta.missing"):
+        scoped.get_string("missing", required=True)
+
+
+def test_scoped_invalid_value_message():
+    env = Env.load_from_dict({"A__B__C": "1970-13-01"})
+    scoped = env / "a" / "b"
+    with pytest.raises(ValueError, match="a.b.c"):
+        scoped.get_date("c")
+
+
+def test_dotted_scope(env):
+    scoped = env / "alpha.beta"
+    assert scoped.get_string("gamma") == "def"
+
+
+def test_scoped_toml(example_file_loader):
+    env = Env.load(
+        include_env=False,
+        toml_configs=[example_file_loader("example.toml")],
+    )
+    scoped = env / "top" / "nested"
+    assert isinstance(scoped, LayerEnv)
+    assert scoped.get_string("foo") == "nested"
+    assert scoped.get_string("missing") is None
+    assert (env / "missing" / "scope").get_string("foo") is None
+
+
+def test_scoped_toml_scalar(example_file_loader):
+    env = Env.load(
+        include_env=False,
+        toml_configs=[example_file_loader("example.toml")],
+    )
+    scoped = env / "top" / "string" / "nested"
+    with pytest.raises(ValueError):
+        scoped.get_string("foo")
+
+
+def test_scoped_compiled(env):
+    compiled = env.compile()
+    assert (compiled / "alpha" / "beta").get_string("gamma") == "def"
+    assert (compiled / "alpha").get_string("beta.gamma") == "def"
+
+
+def test_scoped_wrapper_collapsed(env):
+    cached = env.cached()
+    scoped = cached / "alpha" / "beta"
+    assert scoped is cached / "alpha.beta"
+    assert scoped.get_string("gamma") == "def"
@@ -0,0 +1,167 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, time, timedelta, timezone
+from multiprocessing.shared_memory import SharedMemory
+
+import pytest
+
+from bs_config import Env
+from bs_config._implementation.direnv import DirenvEnv
+
+
+@pytest.fixture
+def env(example_file_loader) -> Env:
+    toml_env = Env.load(
+        include_env=False,
+        toml_configs=[example_file_loader("example.toml")],
+    )
+    return DirenvEnv(
+        toml_env,
+        {
+            "TOP__STRING": "from-env",
+            "TOP__STRING_BLANK": "  ",
+            "TOP__INT": "  ",
+            "TOP__LIST_INTS": "4,5",
+            "OTHER": "value",
+        },
+    )
+
+
+@pytest.fixture
+def attached(env):
+    with env.share() as shared:
+        yield Env.attach(shared.name)
+
+
+@pytest.mark.parametrize(
+    "key",
+    [
+        "top.string",
+        "top.string-blank",
+        "top.string-whitespace",
+        "other",
+        "missing",
+        "top.missing",
+        "top.nested.foo",
+        "does-this",
+        "top.list_ints",
+        "top.string_whitespace",
+    ],
+)
+def test_get_string_same_as_layered(env, attached, key):
+    assert attached.get_string(key) == env.get_string(key)
+
+
+def test_mixed_case_toml_keys(tmp_path):
+    toml = tmp_path / "config.toml"
+    toml.write_text('MyKey = "upper"\n')
+    with Env.load(include_env=False, toml_configs=[toml]).share() as shared:
+        attached = Env.attach(shared.name)
+        with pytest.warns(UserWarning, match="kebab-case"):
+            assert attached.get_string("MyKey") == "upper"
+
+
+def test_typed_values(attached):
+    assert attached.get_string("top.string") == "from-env"
+    assert attached.get_int("top.int") == 123
+    assert attached.get_int_list("top.list-ints") == [4, 5]
+    assert attached.get_bool("top.bool", default=False) is True
+    assert attached.get_string_list("top.list-strings") == ["foo", "bar"]
+    assert attached.get_date("top.date") == date(1979, 5, 27)
+    assert attached.get_time("top.time") == time(6, 32)
+    assert attached.get_datetime("top.datetime-naive", is_naive=True) == datetime(
+        1979, 5, 27, 7, 32
+    )
+    assert attached.get_datetime("top.datetime-offset") == datetime(
+        1979, 5, 27, 7, 32, tzinfo=timezone(timedelta(hours=1))
+    )
+    assert attached.get_duration("top.duration") == timedelta(
+        weeks=1,
+        days=2,
+        hours=3,
+        minutes=4,
+        seconds=5,
+        milliseconds=6,
+        microseconds=107,
+    )
+
+
+def test_converted_like_source(attached):
+    with pytest.raises(ValueError, match="top.float"):
+        attached.get_int("top.float")
+
+    with pytest.raises(ValueError):
+        attached.get_string("top.nested")
+
+    with pytest.raises(ValueError):
+        attached.get_int_list("top.list-mix")
+
+
+def test_scoped(attached):
+    scoped = attached / "top" / "nested"
+    assert scoped.get_string("foo") == "nested"
+
+
+def test_scoped_errors_use_full_key(env):
+    with (env / "top").share() as shared:
+        attached = Env.attach(shared.name)
+
+    with pytest.raises(ValueError, match="top.float"):
+        attached.get_int("float")
+
+
+def test_default_and_fallback(env):
+    fallback = Env.load_from_dict({"FALLBACK": "value"})
+    with env.share() as shared:
+        attached = Env.attach(shared.name, fallback=fallback)
+
+    assert attached.get_int("missing", default=42) == 42
+    assert attached.get_string("fallback") == "value"
+    with pytest.raises(ValueError, match="missing"):
+        attached.get_string("missing", required=True)
+
+
+def test_usable_after_close(env):
+    shared = env.share()
+    attached = Env.attach(shared.name)
+    shared.close()
+    shared.close()
+
+    assert attached.get_string("top.string") == "from-env"
+    with pytest.raises(FileNotFoundError):
+        Env.attach(shared.name)
+
+
+def test_attach_invalid_block():
+    memory = SharedMemory(create=True, size=64)
+    try:
+        with pytest.raises(ValueError, match="snapshot"):
+            Env.attach(memory.name)
+    finally:
+        memory.close()
+        memory.unlink()
+
+
+def test_share_non_layer_fallback(env):
+    with env.share() as shared:
+        attached = Env.attach(shared.name)
+
+    with pytest.raises(ValueError):
+        Env.load(
+            include_env=False,
+            toml_configs=[],
+            fallback=attached,
+        ).share()
+
+
+def _read_in_worker(name: str) -> str | None:
+    return Env.attach(name).get_string("top.string")
+
+
+def test_attach_in_worker(env):
+    context = multiprocessing.get_context("spawn")
+    with (
+        env.share() as shared,
+        ProcessPoolExecutor(max_workers=1, mp_context=context) as executor,
+    ):
+        assert executor.submit(_read_in_worker, shared.name).result() == "from-env"
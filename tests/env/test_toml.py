@@ -4,6 +4,8 @@ from pathlib import Path
 import pytest
 
 from bs_config import Env
+from bs_config._implementation.default import DefaultEnv
+from bs_config._implementation.toml import TomlEnv
 
 
 @pytest.fixture
@@ -229,3 +231,28 @@ def test_get_duration(example_env):
         milliseconds=6,
         microseconds=107,
     )
+
+
+def test_parsed_document_compact():
+    values = TomlEnv._parse(
+        Path("config.toml"),
+        b'list = ["a", "b"]\n[first]\nname = "same"\n[second]\nname = "same"\n',
+    )
+
+    assert values["list"] == ("a", "b")
+    assert values["first"]["name"] is values["second"]["name"]
+    first_key = next(iter(values["first"]))
+    second_key = next(iter(values["second"]))
+    assert first_key is second_key
+
+
+def test_lists_from_dicts_and_parsed_documents(example_file_loader):
+    parsed = Env.load(toml_configs=[example_file_loader("example.toml")])
+    from_dict = TomlEnv(
+        DefaultEnv(),
+        {"top": {"list-strings": ["foo", "bar"], "list-ints": [1, 2, 3]}},
+    )
+
+    for env in (parsed, from_dict):
+        assert env.get_string_list("top.list-strings") == ["foo", "bar"]
+        assert env.get_int_list("top.list-ints") == [1, 2, 3]
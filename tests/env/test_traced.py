@@ -0,0 +1,130 @@
+import pytest
+
+from bs_config import Env
+
+
+@pytest.fixture
+def toml(tmp_path):
+    path = tmp_path / "config.toml"
+    path.write_text(
+        """
+name = "app"
+stale = 1
+
+[db]
+host = "localhost"
+port = 5432
+
+[timeout]
+seconds = 5
+
+[old]
+a = 1
+
+[old.nested]
+b = 2
+"""
+    )
+    return path
+
+
+@pytest.fixture
+def dotenv(tmp_path):
+    path = tmp_path / "local.env"
+    path.write_text("APP_PORT=80\nAPP_UNUSED=1\nAPP_DB__USER=admin\nOTHER=1\n")
+    return path
+
+
+@pytest.fixture
+def env(toml, dotenv) -> Env:
+    return Env.load(
+        include_env=False,
+        toml_configs=[toml],
+        additional_dotenvs=[str(dotenv.with_suffix(""))],
+        env_prefix="APP_",
+    )
+
+
+def _read(traced: Env) -> None:
+    assert traced.get_string("name") == "app"
+    assert (traced / "db").get_string("host") == "localhost"
+    assert traced.get_string("db.user") == "admin"
+    assert traced.get_int("port") == 80
+    assert traced.get_duration("timeout") is not None
+
+
+def test_accessed_keys(env):
+    traced = env.traced()
+    _read(traced)
+    assert traced.accessed_keys() == {"name", "db.host", "db.user", "port", "timeout"}
+
+
+def test_unused_keys(env, toml, dotenv):
+    traced = env.traced()
+    _read(traced)
+    assert traced.unused_keys() == {
+        str(toml): ["stale", "db.port", "old"],
+        str(dotenv): ["unused"],
+    }
+
+
+def test_trim(env, toml, dotenv):
+    traced = env.traced()
+    _read(traced)
+    compiled = env.compile()
+
+    removed = traced.trim()
+    assert removed == {
+        str(toml): ["stale", "db.port", "old"],
+        str(dotenv): ["unused"],
+    }
+    assert traced.unused_keys() == {str(toml): [], str(dotenv): []}
+
+    _read(traced)
+    assert env.get_int("stale") is None
+    assert env.get_int("db.port") is None
+    assert env.get_int("unused") is None
+    assert compiled.get_int("stale") is None
+    assert compiled.get_string("db.host") == "localhost"
+
+
+def test_trim_updates_scopes(env):
+    traced = env.traced()
+    db = env / "db"
+    assert traced.get_string("db.host") == "localhost"
+
+    traced.trim()
+    assert db.get_string("host") == "localhost"
+    assert db.get_int("port") is None
+
+
+def test_trim_keeps_non_canonical_keys(tmp_path):
+    toml = tmp_path / "literal.toml"
+    toml.write_text("snake_case = 1\nstale = 2\n")
+    toml_env = Env.load(include_env=False, toml_configs=[toml])
+    env = Env.load_from_dict({"MY_KEY": "v", "OTHER": "1"})
+    traced = env.traced()
+    traced_toml = toml_env.traced()
+    assert traced.get_string("my_key") == "v"
+    assert traced_toml.get_int("snake_case") == 1
+
+    assert "my-key" in traced.accessed_keys()
+    assert traced.trim() == {"DirenvEnv": ["other"]}
+    assert env.get_string("my_key") == "v"
+    assert traced_toml.trim() == {str(toml): ["stale"]}
+    assert toml_env.get_int("snake_case") == 1
+
+
+def test_trim_skips_live_environ(monkeypatch):
+    monkeypatch.setenv("TRACE_TEST_VALUE", "1")
+    env = Env.load(env_mode="live")
+    traced = env.traced()
+    assert traced.trim() == {}
+    assert env.get_int("trace-test-value") == 1
+
+
+def test_trim_skips_unparsed_lazy_config(toml):
+    env = Env.load(include_env=False, toml_configs=[toml], lazy=True)
+    traced = env.traced()
+    assert traced.trim() == {}
+    assert env.get_int("stale") == 1
@@ -0,0 +1,221 @@
+import asyncio
+import json
+import logging
+from datetime import datetime, timedelta
+
+import pytest
+
+from bs_config import Env
+from bs_config._implementation.cached import CachedEnv
+
+
+@pytest.fixture
+def toml(tmp_path):
+    path = tmp_path / "config.toml"
+    path.write_text(
+        'name = "app"\ninvalid = "abc"\nunused = 1\n[timeout]\nseconds = 5\n'
+    )
+    return path
+
+
+@pytest.fixture
+def dotenv(tmp_path):
+    path = tmp_path / "local.env"
+    path.write_text("PORT=80\n")
+    return str(path.with_suffix(""))
+
+
+@pytest.fixture
+def manifest(tmp_path, toml, dotenv):
+    traced = Env.load(
+        include_env=False,
+        toml_configs=[toml],
+        additional_dotenvs=[dotenv],
+    ).traced()
+    traced.get_string("name")
+    traced.get_int("port")
+    traced.get_string("port")
+    traced.get_duration("timeout")
+    with pytest.raises(ValueError):
+        traced.get_int("invalid")
+
+    path = tmp_path / "manifest.json"
+    traced.save_manifest(path)
+    return path
+
+
+def test_manifest_content(manifest):
+    assert json.loads(manifest.read_text()) == {
+        "version": 2,
+        "reads": [
+            ["invalid", "get_int"],
+            ["name", "get_string"],
+            ["port", "get_int"],
+            ["port", "get_string"],
+            ["timeout", "get_duration"],
+        ],
+    }
+
+
+def test_load_parses_lazy_configs(manifest, toml):
+    env = Env.load(
+        include_env=False,
+        toml_configs=[toml],
+        lazy=True,
+        warm_up_manifest=manifest,
+    )
+    toml.unlink()
+    assert env.get_string("name") == "app"
+    assert env.get_int("unused") == 1
+
+
+def test_warm_up_fills_cache(manifest, toml, dotenv):
+    env = Env.load(
+        include_env=False,
+        toml_configs=[toml],
+        additional_dotenvs=[dotenv],
+    ).cached()
+    assert env.warm_up(manifest) == 4
+    before = env.cache_info()
+
+    assert env.get_int("port") == 80
+    assert env.get_string("port") == "80"
+    assert env.get_duration("timeout") == timedelta(seconds=5)
+    info = env.cache_info()
+    assert info.hits == before.hits + 3
+    assert info.misses == before.misses
+
+
+def test_warm_up_ignores_defaults(tmp_path, toml, dotenv):
+    traced = Env.load(
+        include_env=False,
+        toml_configs=[toml],
+        additional_dotenvs=[dotenv],
+    ).traced()
+    traced.get_int("port", default=8080)
+    traced.get_bool("debug", default=True)
+    manifest = tmp_path / "manifest.json"
+    traced.save_manifest(manifest)
+
+    env = Env.load(
+        include_env=False,
+        toml_configs=[toml],
+        additional_dotenvs=[dotenv],
+    ).cached()
+    assert env.warm_up(manifest) == 2
+    misses = env.cache_info().misses
+
+    assert env.get_int("port", default=8080) == 80
+    assert env.get_bool("debug", default=True) is True
+    info = env.cache_info()
+    assert info.hits == 2
+    assert info.misses == misses
+
+
+def test_naive_datetime(tmp_path, caplog):
+    toml = tmp_path / "config.toml"
+    toml.write_text("started = 2024-01-02T03:04:05\n")
+    traced = Env.load(include_env=False, toml_configs=[toml]).traced()
+    traced.get_datetime("started", is_naive=True)
+    manifest = tmp_path / "manifest.json"
+    traced.save_manifest(manifest)
+    assert json.loads(manifest.read_text())["reads"] == [
+        ["started", "get_datetime", {"is_naive": True}]
+    ]
+
+    env = Env.load(include_env=False, toml_configs=[toml]).cached()
+    with caplog.at_level(logging.WARNING):
+        assert env.warm_up(manifest) == 1
+
+    assert not caplog.records
+    misses = env.cache_info().misses
+    assert env.get_datetime("started", is_naive=True) == datetime(2024, 1, 2, 3, 4, 5)
+    assert env.cache_info().misses == misses
+
+
+def test_transformed_reads_are_skipped(tmp_path, toml):
+    traced = Env.load(include_env=False, toml_configs=[toml]).traced()
+    traced.get_string("name", transform=str.upper)
+    traced.get_string_list("names", transform=str.upper)
+    traced.get_int("unused")
+    manifest = tmp_path / "manifest.json"
+    traced.save_manifest(manifest)
+
+    assert json.loads(manifest.read_text())["reads"] == [["unused", "get_int"]]
+    assert traced.accessed_keys() == {"name", "names", "unused"}
+
+
+def test_load_keeps_warmed_up_values(manifest, toml, dotenv):
+    env = Env.load(
+        include_env=False,
+        toml_configs=[toml],
+        additional_dotenvs=[dotenv],
+        warm_up_manifest=manifest,
+    )
+    assert isinstance(env, CachedEnv)
+    misses = env.cache_info().misses
+
+    assert env.get_int("port", default=8080) == 80
+    assert env.get_string("name") == "app"
+    assert env.get_duration("timeout") == timedelta(seconds=5)
+    assert env.cache_info().misses == misses
+
+
+def test_load_live_is_not_cached(manifest, toml):
+    env = Env.load(
+        toml_configs=[toml],
+        env_mode="live",
+        warm_up_manifest=manifest,
+    )
+    assert not isinstance(env, CachedEnv)
+    assert env.get_string("name") == "app"
+
+
+def test_invalid_values_are_logged(manifest, toml, caplog):
+    env = Env.load(include_env=False, toml_configs=[toml])
+    with caplog.at_level(logging.WARNING):
+        assert env.warm_up(manifest) == 4
+
+    assert "invalid" in caplog.text
+    with pytest.raises(ValueError):
+        env.get_int("invalid")
+
+
+def test_missing_manifest(tmp_path, toml):
+    env = Env.load(
+        include_env=False,
+        toml_configs=[toml],
+        warm_up_manifest=tmp_path / "missing.json",
+    )
+    assert env.warm_up(tmp_path / "missing.json") == 0
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        {"version": 1, "reads": []},
+        {"version": 2, "reads": [["key", "get_unknown"]]},
+        {"version": 2, "reads": [["key"]]},
+        {"version": 2, "reads": [["key", "get_datetime", {"unknown": True}]]},
+        {"version": 2, "reads": [["key", "get_datetime", {"is_naive": 1}]]},
+        [],
+    ],
+)
+def test_invalid_manifest(tmp_path, content):
+    path = tmp_path / "manifest.json"
+    path.write_text(json.dumps(content))
+    with pytest.raises(ValueError):
+        Env.load(include_env=False, warm_up_manifest=path)
+
+
+def test_aload(manifest, toml):
+    env = asyncio.run(
+        Env.aload(
+            include_env=False,
+            toml_configs=[toml],
+            lazy=True,
+            warm_up_manifest=manifest,
+        )
+    )
+    toml.unlink()
+    assert env.get_string("name") == "app"
@@ -0,0 +1,116 @@
+import time
+from pathlib import Path
+
+import pytest
+
+from bs_config import Env
+from bs_config._implementation.direnv import DirenvEnv
+from bs_config._implementation.watch import _Inotify
+
+
+@pytest.fixture
+def toml_file(tmp_path) -> Path:
+    path = tmp_path / "config.toml"
+    path.write_text('value = "a"\n\n[nested]\nvalue = 1\n')
+    return path
+
+
+def _replace(path: Path, content: str) -> None:
+    # Write to a new file and rename it, like most editors and deployment tools do
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(content)
+    tmp.replace(path)
+
+
+def test_reload_on_check(toml_file, monkeypatch):
+    # Without inotify and with a long interval, the background thread only wakes up
+    # when the watcher is stopped, so all reloads happen in check()
+    monkeypatch.setattr(_Inotify, "create", staticmethod(lambda: None))
+    env = Env.load(include_env=False, toml_configs=[toml_file])
+    with env.watch(interval=3600) as watcher:
+        assert not watcher.uses_inotify
+        assert watcher.check() == []
+        _replace(toml_file, 'value = "b"\n')
+        assert watcher.check() == [toml_file]
+        assert env.get_string("value") == "b"
+        assert watcher.check() == []
+
+
+def test_reload_in_background(toml_file):
+    env = Env.load(include_env=False, toml_configs=[toml_file])
+    with env.watch(interval=0.01):
+        _replace(toml_file, 'value = "b"\n')
+        deadline = time.monotonic() + 5
+        while env.get_string("value") != "b" and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    assert env.get_string("value") == "b"
+
+
+def test_scopes_are_updated(toml_file):
+    env = Env.load(include_env=False, toml_configs=[toml_file])
+    scoped = env / "nested"
+    assert scoped.get_int("value") == 1
+
+    with env.watch(interval=60) as watcher:
+        _replace(toml_file, "[nested]\nvalue = 2\n")
+        watcher.check()
+
+    assert scoped.get_int("value") == 2
+
+
+def test_compiled_and_cached_are_updated(toml_file):
+    env = Env.load(include_env=False, toml_configs=[toml_file], compiled=True)
+    cached = env.cached()
+    assert cached.get_string("value") == "a"
+    assert (cached / "nested").get_int("value") == 1
+
+    with cached.watch(interval=60) as watcher:
+        _replace(toml_file, 'value = "b"\n[nested]\nvalue = 2\n')
+        watcher.check()
+
+    assert cached.get_string("value") == "b"
+    assert (cached / "nested").get_int("value") == 2
+    assert (env / "nested").get_int("value") == 2
+
+
+def test_invalid_file_keeps_values(toml_file):
+    env = Env.load(include_env=False, toml_configs=[toml_file])
+    with env.watch(interval=60) as watcher:
+        _replace(toml_file, "value = \n")
+        watcher.check()
+        assert env.get_string("value") == "a"
+
+        _replace(toml_file, 'value = "c"\n')
+        watcher.check()
+
+    assert env.get_string("value") == "c"
+
+
+def test_deleted_file(toml_file):
+    env = Env.load(include_env=False, toml_configs=[toml_file])
+    with env.watch(interval=60) as watcher:
+        toml_file.unlink()
+        watcher.check()
+
+    assert env.get_string("value") is None
+
+
+def test_dotenv(tmp_path):
+    path = tmp_path / "test.env"
+    path.write_text("VALUE=a\n")
+    env = DirenvEnv.load_dotenv(Env.load_from_dict({}), path)
+    assert env is not None
+
+    with env.watch(interval=60) as watcher:
+        _replace(path, "VALUE=b\n")
+        watcher.check()
+
+    assert env.get_string("value") == "b"
+
+
+def test_stop_twice(toml_file):
+    env = Env.load(include_env=False, toml_configs=[toml_file])
+    watcher = env.watch()
+    watcher.stop()
+    watcher.stop()
@@ -0,0 +1,82 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+# Modules that are expensive to import and only needed for specific features
+_HEAVY_MODULES = {
+    "asyncio",
+    "dataclasses",
+    "hashlib",
+    "logging",
+    "pickle",
+    "tempfile",
+    "tomllib",
+}
+
+# Modules that every way of loading config needs (e.g. through pathlib), but that
+# "import bs_config" alone must not import
+_STARTUP_MODULES = {
+    "collections",
+    "typing",
+}
+
+
+def _imported_modules(statement: str) -> set[str]:
+    code = (
+        "import sys\n"
+        "before = set(sys.modules)\n"
+        f"{statement}\n"
+        "print('\\n'.join(set(sys.modules) - before))\n"
+    )
+    # Without site, so .pth files of the environment can't import modules up front.
+    # The package (and editable installs) stay importable through the current path.
+    result = subprocess.run(
+        [sys.executable, "-S", "-c", code],
+        check=True,
+        capture_output=True,
+        env={**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)},
+        text=True,
+    )
+    return set(result.stdout.split())
+
+
+def _top_level(modules: set[str]) -> set[str]:
+    return {module.split(".")[0] for module in modules}
+
+
+def test_import_package():
+    modules = _imported_modules("import bs_config")
+    assert {m for m in modules if m.startswith("bs_config")} == {
+        "bs_config",
+        "bs_config.env",
+    }
+    assert not _top_level(modules) & (_HEAVY_MODULES | _STARTUP_MODULES)
+
+
+@pytest.mark.parametrize(
+    "statement",
+    [
+        "bs_config.Env.load()",
+        "bs_config.Env.load(env_mode='live', compiled=True)",
+        "bs_config.Env.load(toml_configs=[__import__('pathlib').Path('x.toml')], lazy=True)",
+        "bs_config.Env.load_from_dict({'A': 'b'}).get_string('a')",
+    ],
+)
+def test_load_without_parsing(statement):
+    modules = _imported_modules(f"import bs_config\n{statement}")
+    assert not _top_level(modules) & _HEAVY_MODULES
+
+
+def test_lazy_exports():
+    modules = _imported_modules("from bs_config import ParseCache, compile_schema")
+    assert "bs_config.parse_cache" in modules
+    assert "bs_config.schema" in modules
+
+
+def test_unknown_attribute():
+    import bs_config
+
+    with pytest.raises(AttributeError):
+        bs_config.Missing  # type: ignore[attr-defined]